@@ -0,0 +1,107 @@
+"""Benchmark: monitoring cycle and handler latency on asyncio vs uvloop.
+
+A local aiohttp server stands in for vLLM. Each cycle runs HTTP checks
+against it while simulated handlers go through UpdateProcessor.
+
+Run with: python -m benchmarks.bench_loop
+"""
+import asyncio
+import statistics
+import time
+
+from aiohttp import web
+
+from bot.checks.http_check import HTTPHealthCheck
+from bot.formatters import telegram
+from bot.tasks.base import TaskHealthReport
+from bot.transport.processor import UpdateProcessor
+
+N_CHECKS = 20
+N_CYCLES = 10
+N_UPDATES = 500
+N_CHATS = 50
+
+
+async def _stub(request: web.Request) -> web.Response:
+    return web.json_response({"data": [{"id": "model"}]})
+
+
+def _percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+
+async def _scenario() -> dict[str, float]:
+    app = web.Application()
+    app.router.add_get("/v1/models", _stub)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    checks = [
+        HTTPHealthCheck(name=f"vLLM {i}", url=f"http://127.0.0.1:{port}/v1/models")
+        for i in range(N_CHECKS)
+    ]
+
+    cycle_times: list[float] = []
+    last_report: dict[str, TaskHealthReport] = {}
+
+    async def cycles():
+        for _ in range(N_CYCLES):
+            start = time.perf_counter()
+            results = await asyncio.gather(*(c.execute() for c in checks))
+            last_report["bench"] = TaskHealthReport(
+                task_name="bench", task_display_name="Bench", is_healthy=True, checks=list(results),
+            )
+            cycle_times.append(time.perf_counter() - start)
+
+    processor = UpdateProcessor(concurrency=8, max_pending=N_UPDATES * 2)
+    latencies: list[float] = []
+
+    async def handle(submitted: float):
+        telegram.clear_render_cache()
+        if last_report:
+            telegram.render_status_pages(last_report)
+        await asyncio.sleep(0)
+        latencies.append(time.perf_counter() - submitted)
+
+    async def updates():
+        for i in range(N_UPDATES):
+            submitted = time.perf_counter()
+            processor.submit(i % N_CHATS, lambda s=submitted: handle(s))
+            if i % N_CHATS == 0:
+                await asyncio.sleep(0.001)
+        await processor.stop(timeout=30)
+
+    await asyncio.gather(cycles(), updates())
+    await runner.cleanup()
+    return {
+        "cycle_mean_ms": statistics.mean(cycle_times) * 1000,
+        "handler_p50_ms": _percentile(latencies, 0.5) * 1000,
+        "handler_p99_ms": _percentile(latencies, 0.99) * 1000,
+    }
+
+
+def main():
+    loops = {"asyncio": asyncio.DefaultEventLoopPolicy}
+    try:
+        import uvloop
+
+        loops["uvloop"] = uvloop.EventLoopPolicy
+    except ImportError:
+        print("uvloop not installed, benchmarking asyncio only")
+
+    print(f"{N_CHECKS} HTTP checks x {N_CYCLES} cycles, {N_UPDATES} updates over {N_CHATS} chats")
+    for name, policy in loops.items():
+        asyncio.set_event_loop_policy(policy())
+        stats = asyncio.run(_scenario())
+        print(
+            f"  {name:<8} cycle {stats['cycle_mean_ms']:7.1f}ms  handler p50 "
+            f"{stats['handler_p50_ms']:6.2f}ms  p99 {stats['handler_p99_ms']:6.2f}ms"
+        )
+    asyncio.set_event_loop_policy(None)
+
+
+if __name__ == "__main__":
+    main()
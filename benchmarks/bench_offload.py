@@ -0,0 +1,150 @@
+"""Benchmark: handler latency during heavy check cycles, in-process vs worker.
+
+Each cycle runs checks that parse a large nvidia-smi style CSV (CPU-bound)
+and writes their health logs to SQLite. Meanwhile a simulated handler runs
+every few milliseconds on the bot's event loop; its delay is the latency a
+Telegram command would see. The same pipeline runs once on the bot's loop
+(NotificationEngine) and once in a worker process (MonitorWorker).
+
+Run with: python -m benchmarks.bench_offload
+"""
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from aiogram import Bot
+
+from bot.checks.base import BaseHealthCheck, CheckStatus, HealthCheckResult
+from bot.config import Settings
+from bot.db.engine import create_engine, create_session_factory, init_db
+from bot.formatters import telegram
+from bot.notifications.engine import NotificationEngine
+from bot.tasks.base import TaskHealthReport
+from bot.tasks.composite import CompositeTask
+from bot.tasks.registry import TaskRegistry
+from bot.worker.supervisor import MonitorWorker
+
+N_CHECKS = 8
+CSV_ROWS = 20000
+DURATION = 6.0
+HANDLER_PERIOD = 0.005
+
+_CSV = "\n".join(
+    f"{i % 8}, NVIDIA GB10, {i % 100}, {i % 4096}, 131072, {40 + i % 40}" for i in range(CSV_ROWS)
+)
+
+
+class _ParseCheck(BaseHealthCheck):
+    """Stands in for nvidia-smi parsing: pure CPU work on the event loop."""
+
+    def __init__(self, name: str):
+        self._name = name
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    async def execute(self) -> HealthCheckResult:
+        start = time.perf_counter()
+        util = [int(line.split(",")[2]) for line in _CSV.splitlines()]
+        return HealthCheckResult(
+            name=self._name,
+            status=CheckStatus.OK,
+            message=f"avg util {sum(util) / len(util):.0f}%",
+            response_time_ms=(time.perf_counter() - start) * 1000,
+        )
+
+
+def _build(settings: Settings, registry: TaskRegistry):
+    checks = [_ParseCheck(f"GPU {i}") for i in range(N_CHECKS)]
+    registry.register(CompositeTask("gpu", "GPU", "", checks))
+    return None
+
+
+def _percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+
+async def _handler_latencies(duration: float) -> list[float]:
+    """Updates arrive every HANDLER_PERIOD whether or not the loop keeps up;
+    latency runs from the arrival time to the end of a small render."""
+    report = {"gpu": _sample_report()}
+    latencies = []
+    start = time.perf_counter()
+    for k in range(int(duration / HANDLER_PERIOD)):
+        arrival = start + k * HANDLER_PERIOD
+        await asyncio.sleep(max(arrival - time.perf_counter(), 0))
+        telegram.clear_render_cache()
+        telegram.render_status_pages(report)
+        latencies.append(time.perf_counter() - arrival)
+    return latencies
+
+
+def _sample_report() -> TaskHealthReport:
+    return TaskHealthReport(
+        task_name="gpu",
+        task_display_name="GPU",
+        is_healthy=True,
+        checks=[HealthCheckResult(f"GPU {i}", CheckStatus.OK, "ok") for i in range(N_CHECKS)],
+    )
+
+
+async def _scenario(offload: bool, db_dir: Path) -> dict[str, float]:
+    url = f"sqlite+aiosqlite:///{db_dir / ('worker.db' if offload else 'inline.db')}"
+    db = create_engine(url)
+    await init_db(db)
+    settings = Settings(
+        telegram_bot_token="1:bench",
+        initial_admin_id=1,
+        database_url=url,
+        health_check_interval=1,
+        check_interval_min=1,
+        check_interval_max=1,
+    )
+    bot = Bot(settings.telegram_bot_token)
+    if offload:
+        monitor = MonitorWorker(settings, build=_build)
+    else:
+        registry = TaskRegistry()
+        _build(settings, registry)
+        monitor = NotificationEngine(bot, registry, create_session_factory(db), settings)
+    # Measure steady state, not the worker's start-up imports
+    first_report = asyncio.Event()
+    monitor.on_report.append(lambda report: first_report.set())
+    await monitor.start()
+    await first_report.wait()
+
+    latencies = await _handler_latencies(DURATION)
+    await monitor.stop()
+    await bot.session.close()
+    await db.dispose()
+    return {
+        "p50_ms": _percentile(latencies, 0.5) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+        "max_ms": max(latencies) * 1000,
+    }
+
+
+async def _main():
+    print(
+        f"{N_CHECKS} checks x {CSV_ROWS} CSV rows per cycle (1s), "
+        f"handler every {HANDLER_PERIOD * 1000:.0f}ms for {DURATION:.0f}s"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for offload in (False, True):
+            stats = await _scenario(offload, Path(tmp))
+            label = "worker" if offload else "in-process"
+            print(
+                f"  {label:<11} handler delay p50 {stats['p50_ms']:6.2f}ms  "
+                f"p99 {stats['p99_ms']:7.2f}ms  max {stats['max_ms']:7.2f}ms"
+            )
+
+
+def main():
+    asyncio.run(_main())
+
+
+if __name__ == "__main__":
+    main()
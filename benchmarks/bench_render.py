@@ -0,0 +1,96 @@
+"""Microbenchmark: cached vs uncached rendering on the /status handler path.
+
+Each call renders reports freshly built as by run_all_checks(), including
+building them, so the numbers are what a handler sees.
+
+Run with: python -m benchmarks.bench_render
+"""
+import timeit
+
+from bot.checks.base import CheckStatus, HealthCheckResult
+from bot.formatters import telegram
+from bot.handlers import keyboards
+from bot.tasks.base import TaskHealthReport
+from bot.tasks.registry import TaskRegistry
+
+N_TASKS = 10
+N_CHECKS = 5
+NUMBER = 5000
+
+
+class _Task:
+    def __init__(self, name: str):
+        self.name = name
+        self.display_name = f"Task {name}"
+        self.description = ""
+
+
+def _reports(run: int, jitter: bool) -> dict[str, TaskHealthReport]:
+    """Reports as a fresh run_all_checks() returns them: new objects, a new
+    timestamp and, with ``jitter``, a response time shown differently each run."""
+    reports = {}
+    for t in range(N_TASKS):
+        name = f"task{t}"
+        reports[name] = TaskHealthReport(
+            task_name=name,
+            task_display_name=f"Task {name}",
+            is_healthy=True,
+            checks=[
+                HealthCheckResult(
+                    name=f"check{c}", status=CheckStatus.OK,
+                    message=f"200 OK ({c * 10}ms)",
+                    response_time_ms=c * 10.0 + (run if jitter and c == 0 else 0.3),
+                )
+                for c in range(N_CHECKS)
+            ],
+        )
+    return reports
+
+
+def _registry() -> TaskRegistry:
+    registry = TaskRegistry()
+    for t in range(N_TASKS):
+        registry.register(_Task(f"task{t}"))
+    return registry
+
+
+def _uncached_keyboard(registry: TaskRegistry):
+    rows = keyboards._task_rows(registry)
+    rows.append([keyboards.InlineKeyboardButton(text="Refresh", callback_data="status:refresh")])
+    return keyboards.InlineKeyboardMarkup(inline_keyboard=rows)
+
+
+def _handler_path(registry: TaskRegistry, jitter: bool, cached: bool):
+    """/status after its checks ran: render pages and build the keyboard."""
+    run = 0
+
+    def call():
+        nonlocal run
+        run += 1
+        reports = _reports(run, jitter)
+        if cached:
+            telegram.render_status_pages(reports)
+            keyboards.status_keyboard(registry)
+        else:
+            tuple(telegram.chunk_blocks(telegram._status_blocks(reports, telegram.MESSAGE_LIMIT)))
+            _uncached_keyboard(registry)
+
+    return call
+
+
+def main():
+    registry = _registry()
+    timeit.timeit(_handler_path(registry, False, cached=False), number=NUMBER // 10)  # warm-up
+    print(f"{N_TASKS} tasks x {N_CHECKS} checks, fresh reports per call, {NUMBER} iterations")
+    for label, jitter in (("same content", False), ("changing ms", True)):
+        telegram.clear_render_cache()
+        uncached = timeit.timeit(_handler_path(registry, jitter, cached=False), number=NUMBER)
+        cached = timeit.timeit(_handler_path(registry, jitter, cached=True), number=NUMBER)
+        print(
+            f"  {label:<13} uncached {uncached / NUMBER * 1e6:7.1f} us/call  "
+            f"cached {cached / NUMBER * 1e6:7.1f} us/call  ({uncached / cached:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark: memory held by one million check results, legacy vs compact model.
+
+The legacy classes below are the dataclasses HealthCheckResult and
+TaskHealthReport used to be: a details dict per result, an ISO timestamp
+string and an eagerly built summary per report. Check names are built fresh
+for every result, as decoding agent pushes and worker frames does.
+
+Run with: python -m benchmarks.bench_results
+"""
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from bot.checks.base import CheckStatus, HealthCheckResult
+from bot.tasks.base import TaskHealthReport
+
+N_RESULTS = 1_000_000
+CHECKS_PER_REPORT = 8
+
+
+@dataclass
+class _LegacyResult:
+    name: str
+    status: CheckStatus
+    message: str
+    response_time_ms: float = 0.0
+    details: dict = field(default_factory=dict)
+
+
+@dataclass
+class _LegacyReport:
+    task_name: str
+    task_display_name: str
+    is_healthy: bool
+    checks: list
+    timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    summary: str = ""
+
+    def __post_init__(self):
+        if not self.summary:
+            failed = [
+                c for c in self.checks if c.status not in (CheckStatus.OK, CheckStatus.UNKNOWN)
+            ]
+            if failed:
+                names = ", ".join(c.name for c in failed)
+                self.summary = f"{len(failed)} check(s) failed: {names}"
+            else:
+                self.summary = "All systems operational"
+
+
+def _build(result_cls, report_cls) -> list:
+    reports = []
+    for r in range(N_RESULTS // CHECKS_PER_REPORT):
+        checks = [
+            result_cls("".join(("GPU ", str(c))), CheckStatus.OK, "200 OK", float(c))
+            for c in range(CHECKS_PER_REPORT)
+        ]
+        reports.append(report_cls("".join(("task", str(r % 10))), "Task", True, checks))
+    return reports
+
+
+def _measure(result_cls, report_cls) -> tuple[int, float]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    reports = _build(result_cls, report_cls)
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del reports
+    return size, elapsed
+
+
+def main():
+    print(f"{N_RESULTS:,} results in reports of {CHECKS_PER_REPORT}")
+    legacy, legacy_time = _measure(_LegacyResult, _LegacyReport)
+    compact, compact_time = _measure(HealthCheckResult, TaskHealthReport)
+    for label, size, elapsed in (
+        ("legacy", legacy, legacy_time),
+        ("compact", compact, compact_time),
+    ):
+        print(
+            f"  {label:<8} {size / 2**20:7.1f} MiB  "
+            f"{size / N_RESULTS:5.0f} B/result  built in {elapsed:.2f}s"
+        )
+    print(f"  saved    {(legacy - compact) / 2**20:7.1f} MiB per million results "
+          f"({1 - compact / legacy:.0%})")
+
+
+if __name__ == "__main__":
+    main()
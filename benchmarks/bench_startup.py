@@ -0,0 +1,62 @@
+"""Startup benchmark: cold import, schema setup and Telegram startup calls.
+
+Telegram calls are simulated with a fixed latency; compares running the
+startup steps in sequence (old path) with running them concurrently.
+
+Run with: python -m benchmarks.bench_startup
+"""
+import asyncio
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from bot.db.engine import create_engine, init_db
+
+TELEGRAM_LATENCY = 0.15
+
+
+class _FakeBot:
+    async def set_my_commands(self, commands):
+        await asyncio.sleep(TELEGRAM_LATENCY)
+
+    async def get_me(self):
+        await asyncio.sleep(TELEGRAM_LATENCY)
+
+
+def _cold_import() -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import bot.__main__"], check=True)
+    return time.perf_counter() - start
+
+
+async def _startup(db_url: str, concurrent: bool) -> float:
+    engine = create_engine(db_url)
+    bot = _FakeBot()
+    start = time.perf_counter()
+    if concurrent:
+        await asyncio.gather(init_db(engine), bot.set_my_commands([]), bot.get_me())
+    else:
+        await init_db(engine)
+        await bot.set_my_commands([])
+        await bot.get_me()
+    elapsed = time.perf_counter() - start
+    await engine.dispose()
+    return elapsed
+
+
+def main():
+    print(f"cold import of bot.__main__:  {_cold_import():6.2f}s")
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite+aiosqlite:///{Path(tmp) / 'bot.db'}"
+        first = asyncio.run(_startup(url, concurrent=False))
+        sequential = asyncio.run(_startup(url, concurrent=False))
+        concurrent = asyncio.run(_startup(url, concurrent=True))
+    print(f"fresh DB, sequential:         {first * 1000:6.0f}ms")
+    print(f"current schema, sequential:   {sequential * 1000:6.0f}ms")
+    print(f"current schema, concurrent:   {concurrent * 1000:6.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
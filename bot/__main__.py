@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import signal
 from pathlib import Path
 
 from aiogram import Bot, Dispatcher
@@ -7,13 +8,46 @@ from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
 from aiogram.types import BotCommand
 
-from bot.config import get_settings
+from bot.checks import process
+from bot.config import Settings, get_settings
 from bot.db.engine import create_engine, create_session_factory, init_db
-from bot.handlers import gpu, health, menu, notifications, start, tasks, users
+from bot.handlers import (
+    gpu,
+    health,
+    history,
+    menu,
+    notifications,
+    perf,
+    reload,
+    start,
+    tasks,
+    uptime,
+    users,
+)
+from bot.metrics.instruments import (
+    PROCESS_OPEN_FDS,
+    PROCESS_RSS,
+    UPDATES_IN_FLIGHT,
+    UPDATES_PENDING,
+)
 from bot.middlewares.auth import AuthMiddleware, DatabaseMiddleware
+from bot.middlewares.instrumentation import InstrumentationMiddleware, TelegramTimingMiddleware
+from bot.middlewares.throttling import ThrottlingMiddleware
 from bot.notifications.engine import NotificationEngine
+from bot.notifications.uptime import UptimeTracker
+from bot.runtime import proc, startup
+from bot.runtime.loop import LoopLagMonitor, run_event_loop
 from bot.tasks.documentation import DocumentationPipelineTask
 from bot.tasks.registry import TaskRegistry
+from bot.transport.processor import UpdateProcessor, UpdateProcessorMiddleware
+
+
+BOT_COMMANDS = [
+    BotCommand(command="status", description="Статус сервера"),
+    BotCommand(command="check", description="Проверить задачу"),
+    BotCommand(command="gpu", description="Состояние GPU"),
+    BotCommand(command="help", description="Все команды"),
+]
 
 
 async def main():
@@ -22,22 +56,35 @@ async def main():
         format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
     )
     logger = logging.getLogger(__name__)
+    startup.mark("imports")
 
     settings = get_settings()
+    if settings.transport == "webhook" and not settings.webhook_secret:
+        # Without it anyone who finds the URL can post updates as any user
+        raise SystemExit("WEBHOOK_SECRET is required in webhook mode")
 
     # Ensure data directory exists for SQLite
     db_path = settings.database_url.replace("sqlite+aiosqlite:///", "")
     Path(db_path).parent.mkdir(parents=True, exist_ok=True)
 
-    # Database
+    # Database: schema setup runs in the background, concurrently with the
+    # first health cycle and the Telegram startup calls
     engine = create_engine(settings.database_url)
     session_factory = create_session_factory(engine)
-    await init_db(engine)
-    logger.info("Database initialized")
+    db_ready = asyncio.create_task(init_db(engine))
+
+    process.configure(settings.subprocess_concurrency, settings.subprocess_output_limit)
 
     # Task registry
     registry = TaskRegistry()
-    registry.register(DocumentationPipelineTask(settings))
+    reloader = None
+    if settings.tasks_config_path:
+        from bot.tasks.reload import ConfigReloader
+
+        reloader = ConfigReloader(settings.tasks_config_path, settings, registry)
+        reloader.load()
+    else:
+        registry.register(DocumentationPipelineTask(settings))
     logger.info("Registered %d task(s): %s", len(registry.all()), registry.names())
 
     # Bot & Dispatcher
@@ -45,49 +92,204 @@ async def main():
         token=settings.telegram_bot_token,
         default=DefaultBotProperties(parse_mode=ParseMode.HTML),
     )
+    bot.session.middleware(TelegramTimingMiddleware())
+
+    # First cycle starts as soon as checks are registered (or this instance
+    # is elected leader)
+    if settings.monitor_worker:
+        from bot.worker.supervisor import MonitorWorker
+
+        notification_engine = MonitorWorker(settings)
+    else:
+        notification_engine = NotificationEngine(
+            bot, registry, session_factory, settings,
+            UptimeTracker(
+                session_factory, settings.uptime_max_gap, settings.uptime_rebuild_interval
+            ),
+        )
+    leader = None
+    if settings.leader_election:
+        from bot.runtime.leader import LeaderElection
+
+        leader = LeaderElection(
+            session_factory,
+            on_elected=lambda: notification_engine.start(db_ready=db_ready, resume=True),
+            on_demoted=lambda flush: notification_engine.stop(flush=flush),
+            holder=settings.instance_name,
+            ttl=settings.leader_lease_ttl,
+            renew_interval=settings.leader_renew_interval,
+        )
+        await leader.start(db_ready)
+    else:
+        await notification_engine.start(db_ready=db_ready)
+    if reloader:
+        # The worker watches its own lock files; here only reloads are relayed
+        if not settings.monitor_worker:
+            reloader.on_change = notification_engine.check_changed
+        reloader.on_reload.append(notification_engine.config_reloaded)
+        if settings.tasks_config_watch:
+            await reloader.watch(settings.file_watch_poll_interval)
+
     dp = Dispatcher()
 
-    # Middlewares
+    # Middlewares (the processor goes first: it runs the rest of the chain
+    # in per-chat workers)
+    processor = UpdateProcessor(
+        concurrency=settings.update_concurrency,
+        max_pending=settings.update_max_pending,
+    )
+    dp.update.outer_middleware(UpdateProcessorMiddleware(processor))
+    UPDATES_PENDING.set_function(lambda: processor.pending)
+    UPDATES_IN_FLIGHT.set_function(lambda: processor.in_flight)
+    PROCESS_RSS.set_function(lambda: proc.rss_bytes() or 0)
+    PROCESS_OPEN_FDS.set_function(lambda: proc.open_fds() or 0)
     dp.update.outer_middleware(DatabaseMiddleware(session_factory))
     dp.update.outer_middleware(AuthMiddleware(settings))
+    dp.callback_query.outer_middleware(ThrottlingMiddleware(settings))
+    dp.message.middleware(InstrumentationMiddleware())
+    dp.callback_query.middleware(InstrumentationMiddleware())
+
+    async def alert_loop_stall(lag: float):
+        await bot.send_message(
+            settings.initial_admin_id,
+            f"\u26a0\ufe0f Event loop stalled for {lag * 1000:.0f}ms",
+        )
+
+    loop_monitor = LoopLagMonitor(
+        threshold=settings.loop_lag_threshold,
+        slow_callback=settings.slow_callback_seconds,
+        on_stall=alert_loop_stall,
+    )
 
-    # Inject task_registry into handler data
+    # Inject shared objects into handler data
     dp["task_registry"] = registry
+    dp["loop_monitor"] = loop_monitor
+    dp["config_reloader"] = reloader
+    dp["leader"] = leader
 
     # Routers
     dp.include_router(start.router)
     dp.include_router(users.router)
+    dp.include_router(perf.router)
+    dp.include_router(reload.router)
     dp.include_router(tasks.router)
     dp.include_router(health.router)
+    dp.include_router(history.router)
+    dp.include_router(uptime.router)
     dp.include_router(gpu.router)
     dp.include_router(notifications.router)
     dp.include_router(menu.router)
 
-    # Notification engine
-    notification_engine = NotificationEngine(bot, registry, session_factory, settings)
+    # Web server: webhook and internal endpoints
+    server = None
+    if settings.transport == "webhook" or settings.metrics_enabled or settings.agents_enabled:
+        from bot.transport.server import WebServer
+
+        server = WebServer(settings.web_host, settings.web_port, settings.web_unix_socket)
+    if settings.metrics_enabled:
+        from bot.metrics.core import make_metrics_view
+
+        server.add_route("GET", settings.metrics_path, make_metrics_view())
+    hub = None
+    if settings.agents_enabled:
+        from bot.agent.hub import AgentHub, is_loopback
+
+        if not settings.agent_token and not is_loopback(settings.web_host):
+            # Anyone who can reach the port could push results and alerts
+            raise SystemExit(
+                f"AGENT_TOKEN is required to accept agent pushes on {settings.web_host}"
+            )
+        hub = AgentHub(
+            registry,
+            token=settings.agent_token,
+            heartbeat_misses=settings.agent_heartbeat_misses,
+            on_update=lambda: notification_engine.wake(expedite=False),
+            forward=notification_engine.forward_batch if settings.monitor_worker else None,
+        )
+        server.add_route("POST", settings.agent_path, hub.handle)
 
     async def on_startup():
-        await notification_engine.start()
-        await bot.set_my_commands([
-            BotCommand(command="status", description="Статус сервера"),
-            BotCommand(command="check", description="Проверить задачу"),
-            BotCommand(command="gpu", description="Состояние GPU"),
-            BotCommand(command="help", description="Все команды"),
-        ])
-        me = await bot.get_me()
+        await loop_monitor.start()
+        if hub:
+            await hub.start()
+        if server:
+            await server.start()
+        created, _, me = await asyncio.gather(
+            db_ready, bot.set_my_commands(BOT_COMMANDS), bot.get_me()
+        )
+        logger.info("Database %s", "initialized" if created else "schema up to date")
         logger.info("Bot started: @%s", me.username)
+        startup.mark("ready")
 
     async def on_shutdown():
-        await notification_engine.stop()
+        if server:
+            await server.stop()
+        if hub:
+            await hub.stop()
+        await processor.stop()
+        if reloader:
+            await reloader.stop()
+        # Drain before dispose: the last cycle's results and alerts need the DB
+        if leader:
+            await leader.stop()
+        else:
+            await notification_engine.stop()
+        await loop_monitor.stop()
         await engine.dispose()
         logger.info("Bot stopped")
 
     dp.startup.register(on_startup)
     dp.shutdown.register(on_shutdown)
 
-    # Start polling
-    await dp.start_polling(bot)
+    if settings.transport == "webhook":
+        await _run_webhook(dp, bot, settings, server, processor)
+    else:
+        # Handlers already run concurrently in UpdateProcessor
+        await dp.start_polling(bot, handle_as_tasks=False)
+
+
+async def _run_webhook(
+    dp: Dispatcher, bot: Bot, settings: Settings, server, processor: UpdateProcessor
+):
+    from bot.transport.webhook import WebhookHandler
+
+    logger = logging.getLogger(__name__)
+
+    webhook = WebhookHandler(
+        dp,
+        bot,
+        secret=settings.webhook_secret,
+        workers=settings.webhook_workers,
+        queue_size=settings.webhook_queue_size,
+        processor=processor,
+    )
+    server.add_route("POST", settings.webhook_path, webhook.handle)
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    await webhook.start()
+    await dp.emit_startup(bot=bot)
+    if settings.webhook_base_url:
+        await bot.set_webhook(
+            url=settings.webhook_base_url.rstrip("/") + settings.webhook_path,
+            secret_token=settings.webhook_secret,
+            allowed_updates=dp.resolve_used_update_types(),
+        )
+        logger.info("Webhook registered at %s", settings.webhook_base_url)
+    else:
+        logger.warning("WEBHOOK_BASE_URL not set, accepting only locally posted updates")
+
+    try:
+        await stop_event.wait()
+    finally:
+        await server.stop()
+        await webhook.stop()
+        await dp.emit_shutdown(bot=bot)
+        await bot.session.close()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_event_loop(main, get_settings().event_loop)
@@ -0,0 +1,76 @@
+"""Remote agent: run checks on this node and push the results to the bot.
+
+    python -m bot.agent --config agent.yaml --tasks gpu --url http://bot:8080
+
+The bot needs AGENTS_ENABLED=true; see bot.agent.config for AGENT_* settings.
+"""
+import argparse
+import asyncio
+import logging
+import signal
+
+from bot.agent.client import Agent
+from bot.agent.config import AgentSettings
+from bot.checks import process
+from bot.notifications.schedule import AdaptiveScheduler
+from bot.tasks.loader import load_tasks
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m bot.agent", description="Run checks and push them to the bot."
+    )
+    parser.add_argument("--config", help="YAML task file (AGENT_TASKS_CONFIG_PATH)")
+    parser.add_argument("--tasks", help="comma-separated tasks to run (AGENT_TASKS)")
+    parser.add_argument("--node", help="node name reported to the bot (AGENT_NODE_NAME)")
+    parser.add_argument("--url", help="http://host:port or unix:/path (AGENT_BOT_URL)")
+    return parser.parse_args(argv)
+
+
+async def main(argv: list[str] | None = None):
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    args = parse_args(argv)
+    settings = AgentSettings()
+    config_path = args.config or settings.tasks_config_path
+    wanted = [t.strip() for t in (args.tasks or settings.tasks).split(",") if t.strip()]
+
+    process.configure(settings.subprocess_concurrency, settings.subprocess_output_limit)
+    tasks = load_tasks(config_path, settings)
+    if wanted:
+        unknown = set(wanted) - {task.name for task in tasks}
+        if unknown:
+            raise SystemExit(f"Unknown task(s) in {config_path}: {', '.join(sorted(unknown))}")
+        tasks = [task for task in tasks if task.name in wanted]
+
+    agent = Agent(
+        node=args.node or settings.node_name,
+        tasks=tasks,
+        url=args.url or settings.bot_url,
+        path=settings.push_path,
+        token=settings.token,
+        heartbeat_interval=settings.heartbeat_interval,
+        scheduler=AdaptiveScheduler(
+            base=settings.check_interval,
+            min_interval=settings.check_interval_min,
+            max_interval=settings.check_interval_max,
+        ),
+        outbox_size=settings.outbox_size,
+    )
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    await agent.start()
+    try:
+        await stop_event.wait()
+    finally:
+        await agent.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
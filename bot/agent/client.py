@@ -0,0 +1,210 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections import deque
+from dataclasses import replace
+from typing import Callable
+
+import aiohttp
+
+from bot.agent.protocol import TOKEN_HEADER, Batch, encode_batch
+from bot.checks import process
+from bot.checks.base import CheckStatus, HealthCheckResult
+from bot.checks.shared import shared_run
+from bot.notifications.schedule import AdaptiveScheduler
+from bot.tasks.base import BaseTask
+
+logger = logging.getLogger(__name__)
+
+
+class Agent:
+    """Runs checks on this node and pushes their results to the bot.
+
+    Checks keep their own adaptive intervals; fresh results are collected
+    into the next batch. A batch goes out every ``heartbeat_interval`` (an
+    empty one is the heartbeat) and right away when a check changes status.
+    Unacknowledged batches stay in the outbox and are resent in order; the
+    bot ignores sequence numbers it has already applied.
+    """
+
+    def __init__(
+        self,
+        node: str,
+        tasks: list[BaseTask],
+        url: str,
+        path: str = "/agent/push",
+        token: str = "",
+        heartbeat_interval: float = 30.0,
+        scheduler: AdaptiveScheduler | None = None,
+        outbox_size: int = 100,
+        timeout: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.node = node
+        self.tasks = tasks
+        self.url = url
+        self.path = path
+        self.token = token
+        self.heartbeat_interval = heartbeat_interval
+        self.scheduler = scheduler or AdaptiveScheduler(
+            base=60, min_interval=15, max_interval=300
+        )
+        self.timeout = timeout
+        self._clock = clock
+        # A new boot id tells the bot our sequence numbers start over
+        self.boot = uuid.uuid4().hex[:12]
+        self.seq = 0
+        self._pending: dict[str, HealthCheckResult] = {}
+        self._statuses: dict[str, CheckStatus] = {}
+        self._outbox: deque[bytes] = deque(maxlen=outbox_size)
+        self._last_push: float | None = None
+        self._session: aiohttp.ClientSession | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping = asyncio.Event()
+        self._wake = asyncio.Event()
+        self._unreachable = False
+
+    @property
+    def outbox_depth(self) -> int:
+        return len(self._outbox)
+
+    async def start(self):
+        self._session = self._make_session()
+        self._stopping.clear()
+        for task in self.tasks:
+            await task.start_watching(self.check_changed)
+        self._task = asyncio.create_task(self._loop())
+        logger.info(
+            "Agent %s pushing %d task(s) to %s (heartbeat %.0fs)",
+            self.node, len(self.tasks), self.url, self.heartbeat_interval,
+        )
+
+    async def stop(self):
+        self._stopping.set()
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for task in self.tasks:
+            await task.stop_watching()
+        await process.kill_all()
+        if self._session:
+            # Last chance for results collected since the previous batch
+            if self._pending:
+                await self.push()
+            await self._session.close()
+            self._session = None
+
+    def wake(self, expedite: bool = True):
+        if expedite:
+            self.scheduler.expedite()
+        self._wake.set()
+
+    def check_changed(self, key: str):
+        self.scheduler.discard(key)
+        self._wake.set()
+
+    async def run_once(self):
+        """Run due checks; push when a status changed or a heartbeat is due."""
+        changed = False
+        prefix = len(self.tasks) > 1
+        with shared_run():
+            for task in self.tasks:
+                report = await task.run_scheduled_checks(self.scheduler)
+                if report is None:
+                    continue
+                for result in report.checks:
+                    if result.details.get("reused"):
+                        continue
+                    if prefix:
+                        result = _prefixed(task.name, result)
+                    self._pending[result.name] = result
+                    if self._statuses.get(result.name) != result.status:
+                        self._statuses[result.name] = result.status
+                        changed = True
+        if changed or self._heartbeat_in() <= 0:
+            await self.push()
+
+    async def push(self) -> bool:
+        """Queue the pending results as the next batch and send the outbox."""
+        self.seq += 1
+        batch = Batch(
+            node=self.node,
+            boot=self.boot,
+            seq=self.seq,
+            heartbeat_interval=self.heartbeat_interval,
+            results=list(self._pending.values()),
+        )
+        self._pending = {}
+        if len(self._outbox) == self._outbox.maxlen:
+            logger.warning("Agent outbox full, dropping the oldest batch")
+        self._outbox.append(encode_batch(batch))
+        self._last_push = self._clock()
+        return await self._send_outbox()
+
+    async def _send_outbox(self) -> bool:
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers[TOKEN_HEADER] = self.token
+        while self._outbox:
+            try:
+                async with self._session.post(
+                    self._endpoint(),
+                    data=self._outbox[0],
+                    headers=headers,
+                    timeout=aiohttp.ClientTimeout(total=self.timeout),
+                ) as resp:
+                    status = resp.status
+            except (aiohttp.ClientError, TimeoutError, OSError) as e:
+                if not self._unreachable:
+                    logger.warning("Bot unreachable at %s: %s", self.url, e)
+                self._unreachable = True
+                return False
+            if status == 400:
+                logger.error("Bot rejected batch as malformed, dropping it")
+            elif status != 200:
+                logger.warning("Bot answered %d to a push, will retry", status)
+                return False
+            self._outbox.popleft()
+        if self._unreachable:
+            logger.info("Bot reachable again at %s", self.url)
+            self._unreachable = False
+        return True
+
+    def _heartbeat_in(self) -> float:
+        if self._last_push is None:
+            return 0.0
+        return self._last_push + self.heartbeat_interval - self._clock()
+
+    def _endpoint(self) -> str:
+        base = "http://localhost" if self.url.startswith("unix:") else self.url.rstrip("/")
+        return base + self.path
+
+    def _make_session(self) -> aiohttp.ClientSession:
+        if self.url.startswith("unix:"):
+            return aiohttp.ClientSession(
+                connector=aiohttp.UnixConnector(path=self.url[len("unix:"):])
+            )
+        return aiohttp.ClientSession()
+
+    async def _loop(self):
+        while not self._stopping.is_set():
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Agent cycle failed")
+            delay = max(min(self.scheduler.until_next(), self._heartbeat_in()), 0.1)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+            except TimeoutError:
+                pass
+            self._wake.clear()
+
+
+def _prefixed(task_name: str, result: HealthCheckResult) -> HealthCheckResult:
+    """Check names of several tasks share one node task: 'task: check'."""
+    details = result.details
+    if "blocked_by" in details:
+        details = {**details, "blocked_by": f"{task_name}: {details['blocked_by']}"}
+    return replace(result, name=f"{task_name}: {result.name}", details=details)
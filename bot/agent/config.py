@@ -0,0 +1,43 @@
+import socket
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class AgentSettings(BaseSettings):
+    """Agent settings, from AGENT_* environment variables."""
+
+    model_config = SettingsConfigDict(
+        env_prefix="AGENT_",
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+    node_name: str = Field(default_factory=socket.gethostname)
+
+    # Where to push: "http://host:port" or "unix:/path/to/bot.sock"
+    bot_url: str = "http://127.0.0.1:8080"
+    push_path: str = "/agent/push"
+    token: str = ""
+
+    # YAML task file (same format as the bot's) and the tasks to run from it;
+    # empty runs them all
+    tasks_config_path: str = "agent.yaml"
+    tasks: str = ""
+
+    # A batch goes out at least this often; the bot alerts after
+    # AGENT_HEARTBEAT_MISSES (bot side) intervals without one
+    heartbeat_interval: float = 30.0
+    # Unacknowledged batches kept for resending while the bot is unreachable
+    outbox_size: int = 100
+
+    check_interval: int = 60
+    check_interval_min: int = 15
+    check_interval_max: int = 300
+    subprocess_concurrency: int = 4
+    subprocess_output_limit: int = 65536
+    breaker_failure_threshold: int = 3
+    breaker_backoff: float = 30.0
+    breaker_max_backoff: float = 900.0
+    file_watch_poll_interval: float = 5.0
@@ -0,0 +1,129 @@
+import asyncio
+import hmac
+import ipaddress
+import logging
+import time
+from typing import Callable
+
+from aiohttp import web
+
+from bot.agent.protocol import TOKEN_HEADER, Batch, decode_batch
+from bot.metrics.instruments import AGENT_BATCHES_LOST, AGENT_PUSHES, AGENT_UP
+from bot.tasks.registry import TaskRegistry
+from bot.tasks.remote import RemoteNodeTask
+
+logger = logging.getLogger(__name__)
+
+
+def is_loopback(host: str) -> bool:
+    """Whether a web server bound to ``host`` is reachable from this machine only."""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class AgentHub:
+    """Receives agent pushes on the web server, one RemoteNodeTask per node.
+
+    ``on_update`` is called when a node sent new results or its heartbeat
+    changed state (the engine's wake), so remote alerts do not wait for the
+    next scheduled cycle. A watchdog notices heartbeats that stop arriving.
+    """
+
+    def __init__(
+        self,
+        registry: TaskRegistry,
+        token: str = "",
+        heartbeat_misses: int = 3,
+        on_update: Callable[[], None] | None = None,
+        forward: Callable[[bytes], None] | None = None,
+        watchdog_interval: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.registry = registry
+        self.token = token
+        self.heartbeat_misses = heartbeat_misses
+        self.on_update = on_update
+        # Receives every valid push verbatim (the monitoring worker's hub)
+        self.forward = forward
+        self.watchdog_interval = watchdog_interval
+        self._clock = clock
+        self._nodes: dict[str, RemoteNodeTask] = {}
+        self._alive: dict[str, bool] = {}
+        self._watchdog: asyncio.Task | None = None
+
+    @property
+    def nodes(self) -> dict[str, RemoteNodeTask]:
+        return dict(self._nodes)
+
+    async def start(self):
+        self._watchdog = asyncio.create_task(self._watch())
+
+    async def stop(self):
+        if self._watchdog:
+            self._watchdog.cancel()
+            await asyncio.gather(self._watchdog, return_exceptions=True)
+            self._watchdog = None
+
+    async def handle(self, request: web.Request) -> web.Response:
+        if self.token and not hmac.compare_digest(
+            request.headers.get(TOKEN_HEADER, ""), self.token
+        ):
+            return web.Response(status=401)
+        body = await request.read()
+        try:
+            batch = decode_batch(body)
+        except ValueError:
+            return web.Response(status=400)
+        if self.forward is not None:
+            self.forward(body)
+        return web.json_response({"ack": self.receive(batch)})
+
+    def receive(self, batch: Batch) -> int:
+        """Apply a batch; returns the node's last applied sequence number."""
+        task = self._nodes.get(batch.node)
+        if task is None:
+            task = self._nodes[batch.node] = RemoteNodeTask(
+                batch.node, self.heartbeat_misses, clock=self._clock
+            )
+            logger.info("Agent %s connected", batch.node)
+        # Re-register if a config reload replaced the task set without it
+        if self.registry.get(task.name) is not task:
+            self.registry.register(task)
+
+        lost = task.lost
+        if not task.receive(batch):
+            AGENT_PUSHES.labels(batch.node, "duplicate").inc()
+            return task.seq
+        AGENT_PUSHES.labels(batch.node, "accepted").inc()
+        if task.lost > lost:
+            AGENT_BATCHES_LOST.labels(batch.node).inc(task.lost - lost)
+        if batch.results or not self._alive.get(batch.node):
+            self._set_alive(task, True)
+            self._notify()
+        return task.seq
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.watchdog_interval)
+            changed = False
+            for task in list(self._nodes.values()):
+                alive = task.alive
+                if alive != self._alive.get(task.node):
+                    if not alive:
+                        logger.warning("Agent %s missed its heartbeat", task.node)
+                    self._set_alive(task, alive)
+                    changed = True
+            if changed:
+                self._notify()
+
+    def _set_alive(self, task: RemoteNodeTask, alive: bool):
+        self._alive[task.node] = alive
+        AGENT_UP.labels(task.node).set(1 if alive else 0)
+
+    def _notify(self):
+        if self.on_update is not None:
+            self.on_update()
@@ -0,0 +1,95 @@
+"""Wire format of agent pushes.
+
+A batch is one compact JSON object::
+
+    {"v": 1, "node": "gpu-2", "boot": "5f3a9c", "seq": 42, "hb": 30,
+     "checks": [["GPU", "ok", "45C, 12% util", 812.5], ...]}
+
+``checks`` holds only the results produced since the previous batch (with
+an optional fifth element for details); an empty list is a heartbeat.
+``hb`` is the agent's heartbeat interval in seconds. ``boot`` changes when
+the agent restarts, which resets ``seq``.
+"""
+import json
+from dataclasses import dataclass
+
+from bot.checks.base import CheckStatus, HealthCheckResult
+
+VERSION = 1
+TOKEN_HEADER = "X-Agent-Token"
+
+_STATUSES = {status.value: status for status in CheckStatus}
+# Local bookkeeping that means nothing on the receiving side
+_LOCAL_DETAILS = ("reused", "cached")
+
+
+@dataclass
+class Batch:
+    node: str
+    boot: str
+    seq: int
+    heartbeat_interval: float
+    results: list[HealthCheckResult]
+
+
+def encode_results(results: list[HealthCheckResult], keep: tuple[str, ...] = ()) -> list:
+    """Results as compact lists; local-only details are dropped unless in ``keep``."""
+    entries = []
+    for r in results:
+        entry = [r.name, r.status.value, r.message, round(r.response_time_ms, 1)]
+        details = {
+            k: v for k, v in r.details.items() if k not in _LOCAL_DETAILS or k in keep
+        }
+        if details:
+            entry.append(details)
+        entries.append(entry)
+    return entries
+
+
+def decode_results(entries: list) -> list[HealthCheckResult]:
+    results = []
+    for entry in entries:
+        name, status, message, response_time_ms = entry[:4]
+        results.append(
+            HealthCheckResult(
+                name=str(name),
+                status=_STATUSES[status],
+                message=str(message),
+                response_time_ms=float(response_time_ms),
+                details=dict(entry[4]) if len(entry) > 4 else {},
+            )
+        )
+    return results
+
+
+def encode_batch(batch: Batch) -> bytes:
+    payload = {
+        "v": VERSION,
+        "node": batch.node,
+        "boot": batch.boot,
+        "seq": batch.seq,
+        "hb": batch.heartbeat_interval,
+        "checks": encode_results(batch.results),
+    }
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False, default=str).encode()
+
+
+def decode_batch(data: bytes) -> Batch:
+    """Parse a pushed batch; raises ValueError when it is malformed."""
+    try:
+        payload = json.loads(data)
+        if payload["v"] != VERSION:
+            raise ValueError(f"unsupported batch version {payload['v']!r}")
+        results = decode_results(payload["checks"])
+        node = str(payload["node"])
+        if not node:
+            raise ValueError("empty node name")
+        return Batch(
+            node=node,
+            boot=str(payload["boot"]),
+            seq=int(payload["seq"]),
+            heartbeat_interval=float(payload["hb"]),
+            results=results,
+        )
+    except (KeyError, TypeError, IndexError) as e:
+        raise ValueError(f"malformed batch: {e!r}") from None
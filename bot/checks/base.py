@@ -1,6 +1,9 @@
+import sys
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
+from types import MappingProxyType
+from typing import Any, Callable, Mapping
 
 
 class CheckStatus(Enum):
@@ -10,16 +13,27 @@ class CheckStatus(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+# Shared by every result without details; a dict is only allocated by checks
+# that report some (results are rebuilt with replace(), never mutated)
+NO_DETAILS: Mapping[str, Any] = MappingProxyType({})
+
+
+@dataclass(slots=True)
 class HealthCheckResult:
     name: str
     status: CheckStatus
     message: str
     response_time_ms: float = 0.0
-    details: dict = field(default_factory=dict)
+    details: Mapping[str, Any] = field(default_factory=lambda: NO_DETAILS)
+
+    def __post_init__(self):
+        # The same few check names repeat in every cycle, history and snapshot
+        self.name = sys.intern(self.name)
 
 
 class BaseHealthCheck(ABC):
+    # Names of checks in the same task that must pass first (see CheckGraph)
+    depends_on: tuple[str, ...] = ()
 
     @property
     @abstractmethod
@@ -27,3 +41,11 @@ class BaseHealthCheck(ABC):
 
     @abstractmethod
     async def execute(self) -> HealthCheckResult: ...
+
+    async def watch(  # noqa: B027
+        self, on_change: Callable[[], None], poll_interval: float = 5.0
+    ):
+        """Event-driven checks call on_change when their state changes."""
+
+    async def unwatch(self):  # noqa: B027
+        pass
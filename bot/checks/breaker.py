@@ -0,0 +1,106 @@
+import logging
+import time
+from dataclasses import replace
+from typing import Callable
+
+from bot.checks.base import BaseHealthCheck, CheckStatus, HealthCheckResult
+from bot.metrics.instruments import CHECK_BREAKER_OPEN
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitBreakerCheck(BaseHealthCheck):
+    """Wraps a check that fails slowly when its dependency is down.
+
+    After ``failure_threshold`` consecutive CRITICAL results the breaker opens
+    and calls return the last failure immediately. Once the backoff expires a
+    single half-open probe runs the real check: success closes the breaker,
+    failure reopens it with the backoff doubled (up to ``max_backoff``).
+    """
+
+    def __init__(
+        self,
+        check: BaseHealthCheck,
+        failure_threshold: int = 3,
+        backoff: float = 30.0,
+        max_backoff: float = 900.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.check = check
+        self.failure_threshold = failure_threshold
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.retry_at = 0.0
+        self._last_failure: HealthCheckResult | None = None
+
+    @property
+    def name(self) -> str:
+        return self.check.name
+
+    @property
+    def depends_on(self) -> tuple[str, ...]:
+        return self.check.depends_on
+
+    async def watch(self, on_change: Callable[[], None], poll_interval: float = 5.0):
+        await self.check.watch(on_change, poll_interval)
+
+    async def unwatch(self):
+        await self.check.unwatch()
+
+    async def execute(self) -> HealthCheckResult:
+        if self.state != CLOSED:
+            now = self._clock()
+            # Only one probe at a time; concurrent callers get the cached failure
+            if self.state == HALF_OPEN or now < self.retry_at:
+                return self._short_circuit(now)
+            self.state = HALF_OPEN
+
+        try:
+            result = await self.check.execute()
+        except BaseException:
+            if self.state == HALF_OPEN:
+                self.state = OPEN
+            raise
+
+        if result.status == CheckStatus.CRITICAL:
+            self._record_failure(result)
+        else:
+            if self.state != CLOSED:
+                logger.info("Circuit for %s closed", self.name)
+            self.state = CLOSED
+            self.failures = 0
+            self.trips = 0
+            CHECK_BREAKER_OPEN.labels(self.name).set(0)
+        return replace(result, details={**result.details, "breaker": self.state})
+
+    def _record_failure(self, result: HealthCheckResult):
+        self._last_failure = result
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            delay = min(self.backoff * 2**self.trips, self.max_backoff)
+            self.trips += 1
+            self.state = OPEN
+            self.retry_at = self._clock() + delay
+            CHECK_BREAKER_OPEN.labels(self.name).set(1)
+            logger.warning(
+                "Circuit for %s open after %d failure(s), next probe in %.0fs",
+                self.name, self.failures, delay,
+            )
+
+    def _short_circuit(self, now: float) -> HealthCheckResult:
+        last = self._last_failure
+        wait = max(self.retry_at - now, 0)
+        return HealthCheckResult(
+            name=self.name,
+            status=last.status,
+            message=f"{last.message} [circuit open, next probe in {wait:.0f}s]",
+            details={**last.details, "breaker": self.state, "retry_in": wait},
+        )
@@ -1,7 +1,9 @@
 import time
 from pathlib import Path
+from typing import Callable
 
 from bot.checks.base import BaseHealthCheck, CheckStatus, HealthCheckResult
+from bot.checks.watch import FileState, FileWatcher, stat_file
 
 
 class FileCheck(BaseHealthCheck):
@@ -11,17 +13,48 @@ class FileCheck(BaseHealthCheck):
         name: str,
         path: str,
         max_age_seconds: int | None = None,
+        depends_on: list[str] | None = None,
     ):
+        if not path:
+            # Path("") is the working directory, which always "exists"
+            raise ValueError("path is empty")
         self._name = name
+        self.depends_on = tuple(depends_on or ())
         self.path = Path(path)
         self.max_age_seconds = max_age_seconds
+        self._watcher: FileWatcher | None = None
+        self._callbacks: list[Callable[[], None]] = []
 
     @property
     def name(self) -> str:
         return self._name
 
+    async def watch(self, on_change: Callable[[], None], poll_interval: float = 5.0):
+        """Keep the file state in memory and call on_change when the file
+        appears or disappears. execute() then answers without touching disk.
+        Every watch() adds a callback; unwatch() removes them all."""
+        if on_change not in self._callbacks:
+            self._callbacks.append(on_change)
+        if self._watcher is None:
+            self._watcher = FileWatcher(self.path, self._changed, poll_interval=poll_interval)
+            await self._watcher.start()
+
+    async def unwatch(self):
+        self._callbacks.clear()
+        if self._watcher is not None:
+            await self._watcher.stop()
+            self._watcher = None
+
+    def _changed(self, state: FileState):
+        for on_change in list(self._callbacks):
+            on_change()
+
     async def execute(self) -> HealthCheckResult:
-        if not self.path.exists():
+        state = self._watcher.state if self._watcher else stat_file(self.path)
+        return self._result(state)
+
+    def _result(self, state: FileState) -> HealthCheckResult:
+        if not state.exists:
             return HealthCheckResult(
                 name=self.name,
                 status=CheckStatus.OK,
@@ -29,8 +62,7 @@ class FileCheck(BaseHealthCheck):
                 details={"exists": False},
             )
 
-        stat = self.path.stat()
-        age_seconds = time.time() - stat.st_mtime
+        age_seconds = time.time() - state.mtime
 
         if self.max_age_seconds and age_seconds > self.max_age_seconds:
             hours = age_seconds / 3600
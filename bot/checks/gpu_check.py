@@ -1,5 +1,4 @@
-import asyncio
-
+from bot.checks import process
 from bot.checks.base import BaseHealthCheck, CheckStatus, HealthCheckResult
 
 
@@ -13,8 +12,15 @@ def _parse_int(val: str) -> int | None:
 
 class GPUCheck(BaseHealthCheck):
 
-    def __init__(self, name: str = "GPU Status", warning_util: int = 90, warning_temp: int = 80):
+    def __init__(
+        self,
+        name: str = "GPU Status",
+        warning_util: int = 90,
+        warning_temp: int = 80,
+        depends_on: list[str] | None = None,
+    ):
         self._name = name
+        self.depends_on = tuple(depends_on or ())
         self.warning_util = warning_util
         self.warning_temp = warning_temp
 
@@ -24,33 +30,33 @@ class GPUCheck(BaseHealthCheck):
 
     async def execute(self) -> HealthCheckResult:
         try:
-            proc = await asyncio.create_subprocess_exec(
-                "nvidia-smi",
-                "--query-gpu=index,name,utilization.gpu,memory.used,memory.total,temperature.gpu",
-                "--format=csv,noheader,nounits",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+            result = await process.run(
+                [
+                    "nvidia-smi",
+                    "--query-gpu=index,name,utilization.gpu,memory.used,memory.total,temperature.gpu",
+                    "--format=csv,noheader,nounits",
+                ],
+                timeout=10,
             )
-            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=10)
         except FileNotFoundError:
             return HealthCheckResult(
                 name=self.name,
                 status=CheckStatus.UNKNOWN,
                 message="nvidia-smi not found",
             )
-        except TimeoutError:
+        if result.timed_out:
             return HealthCheckResult(
                 name=self.name,
                 status=CheckStatus.CRITICAL,
                 message="nvidia-smi timeout",
             )
 
-        if proc.returncode != 0:
+        if result.returncode != 0:
             # Fallback: try plain nvidia-smi (DGX Spark unified memory may differ)
-            return await self._fallback_check(stderr.decode().strip())
+            return await self._fallback_check(result.stderr.decode(errors="replace").strip())
 
         gpus = []
-        for line in stdout.decode().strip().split("\n"):
+        for line in result.stdout.decode(errors="replace").strip().split("\n"):
             parts = [x.strip() for x in line.split(",")]
             if len(parts) < 6:
                 continue
@@ -110,14 +116,9 @@ class GPUCheck(BaseHealthCheck):
     async def _fallback_check(self, error_msg: str) -> HealthCheckResult:
         """Fallback: run plain nvidia-smi and parse output."""
         try:
-            proc = await asyncio.create_subprocess_exec(
-                "nvidia-smi",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=10)
-            if proc.returncode == 0:
-                output = stdout.decode().strip()
+            result = await process.run(["nvidia-smi"], timeout=10)
+            if result.returncode == 0:
+                output = result.stdout.decode(errors="replace").strip()
                 # Extract basic info from nvidia-smi text output
                 return HealthCheckResult(
                     name=self.name,
@@ -0,0 +1,90 @@
+import asyncio
+from typing import Awaitable, Callable
+
+from bot.checks.base import BaseHealthCheck, CheckStatus, HealthCheckResult
+
+
+def is_blocking(result: HealthCheckResult) -> bool:
+    """A failed or itself blocked check blocks its dependents."""
+    return result.status == CheckStatus.CRITICAL or "blocked_by" in result.details
+
+
+def root_cause(name: str, result: HealthCheckResult) -> str:
+    return result.details.get("blocked_by", name)
+
+
+class CheckGraph:
+    """Checks of one task run as a DAG over ``BaseHealthCheck.depends_on``.
+
+    Every check starts as soon as its dependencies have finished, so
+    independent checks run concurrently. A check whose dependency failed is
+    not executed; it gets an UNKNOWN "Blocked by <root>" result naming the
+    first check that actually failed, so alerts point at the root cause.
+    """
+
+    def __init__(self, checks: list[BaseHealthCheck]):
+        self.checks = checks
+        by_name = {c.name: c for c in checks}
+        for check in checks:
+            for dep in check.depends_on:
+                if dep not in by_name:
+                    raise ValueError(f"Check {check.name!r} depends on unknown check {dep!r}")
+        self._order = self._sort(by_name)
+
+    @staticmethod
+    def _sort(by_name: dict[str, BaseHealthCheck]) -> list[BaseHealthCheck]:
+        order: list[BaseHealthCheck] = []
+        state: dict[str, bool] = {}  # False while visiting, True when done
+
+        def visit(check: BaseHealthCheck, path: tuple[str, ...]):
+            done = state.get(check.name)
+            if done:
+                return
+            if done is False:
+                raise ValueError("Check dependency cycle: " + " -> ".join(path + (check.name,)))
+            state[check.name] = False
+            for dep in check.depends_on:
+                visit(by_name[dep], path + (check.name,))
+            state[check.name] = True
+            order.append(check)
+
+        for check in by_name.values():
+            visit(check, ())
+        return order
+
+    async def run(
+        self,
+        execute: Callable[[BaseHealthCheck], Awaitable[HealthCheckResult]],
+        only: set[str] | None = None,
+        previous: dict[str, HealthCheckResult] | None = None,
+    ) -> dict[str, HealthCheckResult]:
+        """Run the checks (or just those in ``only``), keyed by name.
+
+        Dependencies outside ``only`` are judged by their ``previous`` result.
+        """
+        previous = previous or {}
+        futures: dict[str, asyncio.Future] = {}
+
+        async def run_one(check: BaseHealthCheck) -> HealthCheckResult:
+            for dep in check.depends_on:
+                dep_result = await futures[dep] if dep in futures else previous.get(dep)
+                if dep_result is not None and is_blocking(dep_result):
+                    root = root_cause(dep, dep_result)
+                    return HealthCheckResult(
+                        name=check.name,
+                        status=CheckStatus.UNKNOWN,
+                        message=f"Blocked by {root}",
+                        details={"blocked_by": root},
+                    )
+            return await execute(check)
+
+        # Dependencies come first in _order, so their futures already exist
+        for check in self._order:
+            if only is None or check.name in only:
+                futures[check.name] = asyncio.ensure_future(run_one(check))
+        try:
+            await asyncio.gather(*futures.values())
+        finally:
+            for future in futures.values():
+                future.cancel()
+        return {name: future.result() for name, future in futures.items()}
@@ -13,11 +13,17 @@ class HTTPHealthCheck(BaseHealthCheck):
         url: str,
         timeout: float = 10.0,
         expected_status: int = 200,
+        method: str = "GET",
+        json: dict | None = None,
+        depends_on: list[str] | None = None,
     ):
         self._name = name
+        self.depends_on = tuple(depends_on or ())
         self.url = url
         self.timeout = timeout
         self.expected_status = expected_status
+        self.method = method
+        self.json = json
 
     @property
     def name(self) -> str:
@@ -27,8 +33,11 @@ class HTTPHealthCheck(BaseHealthCheck):
         start = time.monotonic()
         try:
             async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    self.url, timeout=aiohttp.ClientTimeout(total=self.timeout)
+                async with session.request(
+                    self.method,
+                    self.url,
+                    json=self.json,
+                    timeout=aiohttp.ClientTimeout(total=self.timeout),
                 ) as resp:
                     elapsed = (time.monotonic() - start) * 1000
                     body = await resp.text()
@@ -1,4 +1,5 @@
 import time
+from abc import abstractmethod
 from base64 import b64encode
 
 import aiohttp
@@ -6,7 +7,7 @@ import aiohttp
 from bot.checks.base import BaseHealthCheck, CheckStatus, HealthCheckResult
 
 
-class JiraAPICheck(BaseHealthCheck):
+class _JiraCheck(BaseHealthCheck):
 
     def __init__(
         self,
@@ -15,8 +16,10 @@ class JiraAPICheck(BaseHealthCheck):
         email: str,
         api_token: str,
         project: str = "DOCS",
+        depends_on: list[str] | None = None,
     ):
         self._name = name
+        self.depends_on = tuple(depends_on or ())
         self.jira_url = jira_url.rstrip("/")
         self.email = email
         self.api_token = api_token
@@ -41,44 +44,7 @@ class JiraAPICheck(BaseHealthCheck):
         start = time.monotonic()
         try:
             async with aiohttp.ClientSession(headers=self._auth_header()) as session:
-                # Check connectivity
-                async with session.get(
-                    f"{self.jira_url}/rest/api/3/myself",
-                    timeout=aiohttp.ClientTimeout(total=15),
-                ) as resp:
-                    elapsed = (time.monotonic() - start) * 1000
-                    if resp.status != 200:
-                        return HealthCheckResult(
-                            name=self.name,
-                            status=CheckStatus.CRITICAL,
-                            message=f"Auth failed: HTTP {resp.status}",
-                            response_time_ms=elapsed,
-                        )
-
-                # Count active tasks
-                jql = f"project={self.project} AND status != Done"
-                async with session.get(
-                    f"{self.jira_url}/rest/api/3/search",
-                    params={"jql": jql, "maxResults": 0},
-                    timeout=aiohttp.ClientTimeout(total=15),
-                ) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        total = data.get("total", "?")
-                        return HealthCheckResult(
-                            name=self.name,
-                            status=CheckStatus.OK,
-                            message=f"OK ({elapsed:.0f}ms) | {total} active tasks",
-                            response_time_ms=elapsed,
-                            details={"active_tasks": total},
-                        )
-                    return HealthCheckResult(
-                        name=self.name,
-                        status=CheckStatus.OK,
-                        message=f"OK ({elapsed:.0f}ms) | task count unavailable",
-                        response_time_ms=elapsed,
-                    )
-
+                return await self._request(session, start)
         except (aiohttp.ClientError, TimeoutError) as e:
             elapsed = (time.monotonic() - start) * 1000
             return HealthCheckResult(
@@ -87,3 +53,60 @@ class JiraAPICheck(BaseHealthCheck):
                 message=f"Connection error: {e}",
                 response_time_ms=elapsed,
             )
+
+    @abstractmethod
+    async def _request(self, session: aiohttp.ClientSession, start: float) -> HealthCheckResult:
+        """Query Jira and turn the response into a result."""
+
+
+class JiraAPICheck(_JiraCheck):
+    """Connectivity and credentials (``/myself``)."""
+
+    async def _request(self, session: aiohttp.ClientSession, start: float) -> HealthCheckResult:
+        async with session.get(
+            f"{self.jira_url}/rest/api/3/myself",
+            timeout=aiohttp.ClientTimeout(total=15),
+        ) as resp:
+            elapsed = (time.monotonic() - start) * 1000
+            if resp.status != 200:
+                return HealthCheckResult(
+                    name=self.name,
+                    status=CheckStatus.CRITICAL,
+                    message=f"Auth failed: HTTP {resp.status}",
+                    response_time_ms=elapsed,
+                )
+            return HealthCheckResult(
+                name=self.name,
+                status=CheckStatus.OK,
+                message=f"OK ({elapsed:.0f}ms)",
+                response_time_ms=elapsed,
+            )
+
+
+class JiraSearchCheck(_JiraCheck):
+    """Active task count for the project; only meaningful once auth passes."""
+
+    async def _request(self, session: aiohttp.ClientSession, start: float) -> HealthCheckResult:
+        jql = f"project={self.project} AND status != Done"
+        async with session.get(
+            f"{self.jira_url}/rest/api/3/search",
+            params={"jql": jql, "maxResults": 0},
+            timeout=aiohttp.ClientTimeout(total=15),
+        ) as resp:
+            elapsed = (time.monotonic() - start) * 1000
+            if resp.status == 200:
+                data = await resp.json()
+                total = data.get("total", "?")
+                return HealthCheckResult(
+                    name=self.name,
+                    status=CheckStatus.OK,
+                    message=f"{total} active tasks ({elapsed:.0f}ms)",
+                    response_time_ms=elapsed,
+                    details={"active_tasks": total},
+                )
+            return HealthCheckResult(
+                name=self.name,
+                status=CheckStatus.OK,
+                message=f"Task count unavailable: HTTP {resp.status}",
+                response_time_ms=elapsed,
+            )
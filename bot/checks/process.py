@@ -0,0 +1,194 @@
+"""Shared runner for command-based checks.
+
+Every check subprocess goes through here so that:
+
+* at most ``concurrency`` commands run at once;
+* children get their own process group, and a timeout, cancellation or
+  shutdown kills the whole tree (e.g. ``claude`` and its helpers) and reaps it;
+* stdout/stderr are buffered up to ``output_limit`` bytes each, the rest is
+  drained and dropped;
+* identical commands already running are joined instead of spawned again.
+"""
+import asyncio
+import logging
+import os
+import signal
+from dataclasses import dataclass
+from typing import Sequence
+
+from bot.metrics.instruments import (
+    SUBPROCESSES_IN_FLIGHT,
+    SUBPROCESSES_KILLED,
+    SUBPROCESSES_SPAWNED,
+)
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_LIMIT = 64 * 1024
+_READ_CHUNK = 16 * 1024
+
+_live: set[asyncio.subprocess.Process] = set()
+
+
+@dataclass
+class CommandResult:
+    returncode: int | None
+    stdout: bytes = b""
+    stderr: bytes = b""
+    timed_out: bool = False
+    truncated: bool = False
+
+
+async def spawn(*command: str) -> asyncio.subprocess.Process:
+    proc = await asyncio.create_subprocess_exec(
+        *command,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=True,
+    )
+    _live.add(proc)
+    SUBPROCESSES_SPAWNED.inc()
+    return proc
+
+
+def kill_group(proc: asyncio.subprocess.Process) -> bool:
+    if proc.returncode is not None:
+        return False
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        return False
+    SUBPROCESSES_KILLED.inc()
+    return True
+
+
+async def reap(proc: asyncio.subprocess.Process):
+    """Kill the process group if still running and wait for the child to exit."""
+    kill_group(proc)
+    try:
+        await proc.wait()
+    finally:
+        _live.discard(proc)
+
+
+def live_count() -> int:
+    return len(_live)
+
+
+async def kill_all(timeout: float = 5.0):
+    """Kill and reap every tracked child (used at shutdown)."""
+    procs = list(_live)
+    if not procs:
+        return
+    logger.warning("Killing %d leftover check process(es)", len(procs))
+    try:
+        await asyncio.wait_for(asyncio.gather(*(reap(p) for p in procs)), timeout)
+    except TimeoutError:
+        logger.error("Child processes did not exit: %s", [p.pid for p in _live])
+
+
+async def _read_capped(stream: asyncio.StreamReader, limit: int) -> tuple[bytes, bool]:
+    buf = bytearray()
+    truncated = False
+    while chunk := await stream.read(_READ_CHUNK):
+        room = limit - len(buf)
+        if len(chunk) > room:
+            truncated = True
+            chunk = chunk[:room]
+        buf += chunk
+    return bytes(buf), truncated
+
+
+class _Shared:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class ProcessRunner:
+
+    def __init__(self, concurrency: int = 4, output_limit: int = OUTPUT_LIMIT):
+        self.concurrency = concurrency
+        self.output_limit = output_limit
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._inflight: dict[tuple[str, ...], _Shared] = {}
+        self.deduplicated = 0
+
+    async def run(self, command: Sequence[str], timeout: float) -> CommandResult:
+        """Run a command, joining an identical one already in flight.
+
+        A joined run keeps the timeout of the caller that started it. It is
+        cancelled (and its process group killed) only when every caller is.
+        """
+        key = tuple(command)
+        shared = self._inflight.get(key)
+        if shared is None:
+            shared = _Shared(asyncio.ensure_future(self._run(key, timeout)))
+            self._inflight[key] = shared
+            shared.task.add_done_callback(lambda _: self._forget(key, shared))
+        else:
+            self.deduplicated += 1
+
+        shared.waiters += 1
+        try:
+            return await asyncio.shield(shared.task)
+        except asyncio.CancelledError:
+            if shared.waiters == 1:
+                shared.task.cancel()
+            raise
+        finally:
+            shared.waiters -= 1
+
+    def _forget(self, key: tuple[str, ...], shared: _Shared):
+        if self._inflight.get(key) is shared:
+            del self._inflight[key]
+        # Nobody is left to see the error, don't let asyncio log it
+        if not shared.task.cancelled():
+            shared.task.exception()
+
+    async def _run(self, command: tuple[str, ...], timeout: float) -> CommandResult:
+        async with self._semaphore:
+            proc = await spawn(*command)
+            SUBPROCESSES_IN_FLIGHT.inc()
+            try:
+                (stdout, out_cut), (stderr, err_cut), returncode = await asyncio.wait_for(
+                    asyncio.gather(
+                        _read_capped(proc.stdout, self.output_limit),
+                        _read_capped(proc.stderr, self.output_limit),
+                        proc.wait(),
+                    ),
+                    timeout,
+                )
+            except TimeoutError:
+                return CommandResult(returncode=None, timed_out=True)
+            finally:
+                SUBPROCESSES_IN_FLIGHT.dec()
+                # Runs on timeout and cancellation too: no orphaned children
+                await asyncio.shield(reap(proc))
+        return CommandResult(returncode, stdout, stderr, truncated=out_cut or err_cut)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "spawned": int(SUBPROCESSES_SPAWNED.value),
+            "killed": int(SUBPROCESSES_KILLED.value),
+            "alive": live_count(),
+            "deduplicated": self.deduplicated,
+        }
+
+
+_runner = ProcessRunner()
+
+
+def configure(concurrency: int, output_limit: int = OUTPUT_LIMIT):
+    global _runner
+    _runner = ProcessRunner(concurrency, output_limit)
+
+
+def get_runner() -> ProcessRunner:
+    return _runner
+
+
+async def run(command: Sequence[str], timeout: float) -> CommandResult:
+    return await _runner.run(command, timeout)
@@ -0,0 +1,120 @@
+"""Checks defined identically in several tasks, executed once per run.
+
+Every referencing task gets its own ``SharedCheck`` (with its own name and
+dependencies) around one shared inner check. Inside a ``shared_run()``
+scope, the first reference executes the check and the others, concurrent or
+later in the same run, receive its result.
+"""
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import replace
+from typing import Callable
+
+from bot.checks.base import BaseHealthCheck, HealthCheckResult
+
+_current_run: ContextVar[object | None] = ContextVar("shared_check_run", default=None)
+
+
+@contextmanager
+def shared_run():
+    """Mark one monitoring cycle or one /status run."""
+    token = _current_run.set(object())
+    try:
+        yield
+    finally:
+        _current_run.reset(token)
+
+
+class _SharedExecution:
+    __slots__ = ("check", "run", "future", "watchers")
+
+    def __init__(self, check: BaseHealthCheck):
+        self.check = check
+        self.run: object | None = None
+        self.future: asyncio.Future | None = None
+        # SharedChecks watching the inner check -> their on_change
+        self.watchers: dict[SharedCheck, Callable[[], None]] = {}
+
+    def changed(self):
+        for on_change in list(self.watchers.values()):
+            on_change()
+
+    async def execute(self) -> HealthCheckResult:
+        run = _current_run.get()
+        if run is None:
+            return await self.check.execute()
+        if self.run is not run or self.future is None:
+            self.run = run
+            self.future = asyncio.ensure_future(self.check.execute())
+        return await asyncio.shield(self.future)
+
+
+class SharedCheck(BaseHealthCheck):
+
+    def __init__(
+        self,
+        shared: _SharedExecution,
+        name: str,
+        depends_on: tuple[str, ...] = (),
+        key: object = None,
+    ):
+        self._shared = shared
+        self._name = name
+        # Definition identity: equal keys mean an unchanged check across reloads
+        self.key = key
+        self.depends_on = tuple(depends_on)
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def inner(self) -> BaseHealthCheck:
+        return self._shared.check
+
+    async def watch(self, on_change: Callable[[], None], poll_interval: float = 5.0):
+        # One inner watcher for all references: started by the first, stopped
+        # when the last one unwatches
+        first = not self._shared.watchers
+        self._shared.watchers[self] = on_change
+        if first:
+            await self._shared.check.watch(self._shared.changed, poll_interval)
+
+    async def unwatch(self):
+        if self._shared.watchers.pop(self, None) is not None and not self._shared.watchers:
+            await self._shared.check.unwatch()
+
+    async def execute(self) -> HealthCheckResult:
+        result = await self._shared.execute()
+        return result if result.name == self._name else replace(result, name=self._name)
+
+
+class SharedCheckPool:
+    """Hands out SharedChecks, one inner check per definition key."""
+
+    def __init__(self):
+        self._executions: dict[object, _SharedExecution] = {}
+
+    def get(
+        self,
+        key: object,
+        build: Callable[[], BaseHealthCheck],
+        name: str,
+        depends_on: tuple[str, ...] = (),
+    ) -> SharedCheck:
+        shared = self._executions.get(key)
+        if shared is None:
+            shared = self._executions[key] = _SharedExecution(build())
+        return SharedCheck(shared, name, depends_on, key)
+
+    def copy(self) -> "SharedCheckPool":
+        """A pool to build into; the original is unaffected by what it adds."""
+        pool = SharedCheckPool()
+        pool._executions = dict(self._executions)
+        return pool
+
+    def prune(self, keys: set) -> list[BaseHealthCheck]:
+        """Drop definitions not in keys; returns their inner checks."""
+        removed = [k for k in self._executions if k not in keys]
+        return [self._executions.pop(k).check for k in removed]
@@ -1,6 +1,9 @@
-import asyncio
+import os
+import shutil
 import time
+from dataclasses import replace
 
+from bot.checks import process
 from bot.checks.base import BaseHealthCheck, CheckStatus, HealthCheckResult
 
 
@@ -12,54 +15,85 @@ class SubprocessCheck(BaseHealthCheck):
         command: list[str],
         timeout: float = 30.0,
         expected_returncode: int = 0,
+        cache_max_age: float = 0.0,
+        depends_on: list[str] | None = None,
     ):
         self._name = name
+        self.depends_on = tuple(depends_on or ())
         self.command = command
         self.timeout = timeout
         self.expected_returncode = expected_returncode
+        # > 0: reuse the last OK result while the executable is unchanged
+        # (for commands like `--version` whose output depends only on it)
+        self.cache_max_age = cache_max_age
+        self._cached: tuple[tuple, float, HealthCheckResult] | None = None
 
     @property
     def name(self) -> str:
         return self._name
 
+    def _fingerprint(self) -> tuple | None:
+        path = shutil.which(self.command[0])
+        if path is None:
+            return None
+        path = os.path.realpath(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (path, st.st_ino, st.st_mtime_ns, st.st_size)
+
     async def execute(self) -> HealthCheckResult:
+        if self.cache_max_age <= 0:
+            return await self._execute()
+
+        fingerprint = self._fingerprint()
+        if self._cached is not None and fingerprint is not None:
+            cached_fingerprint, cached_at, result = self._cached
+            if (
+                cached_fingerprint == fingerprint
+                and time.monotonic() - cached_at < self.cache_max_age
+            ):
+                return replace(result, details={**result.details, "cached": True})
+
+        result = await self._execute()
+        if result.status == CheckStatus.OK and fingerprint is not None:
+            self._cached = (fingerprint, time.monotonic(), result)
+        else:
+            self._cached = None
+        return result
+
+    async def _execute(self) -> HealthCheckResult:
         start = time.monotonic()
         try:
-            proc = await asyncio.create_subprocess_exec(
-                *self.command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, stderr = await asyncio.wait_for(
-                proc.communicate(), timeout=self.timeout
-            )
-            elapsed = (time.monotonic() - start) * 1000
-
-            if proc.returncode == self.expected_returncode:
-                output = stdout.decode().strip()
-                return HealthCheckResult(
-                    name=self.name,
-                    status=CheckStatus.OK,
-                    message=output[:200] or "OK",
-                    response_time_ms=elapsed,
-                )
+            result = await process.run(self.command, self.timeout)
+        except FileNotFoundError:
             return HealthCheckResult(
                 name=self.name,
                 status=CheckStatus.CRITICAL,
-                message=f"Exit code {proc.returncode}: {stderr.decode().strip()[:200]}",
-                response_time_ms=elapsed,
+                message=f"Command not found: {self.command[0]}",
             )
-        except TimeoutError:
-            elapsed = (time.monotonic() - start) * 1000
+        elapsed = (time.monotonic() - start) * 1000
+
+        if result.timed_out:
             return HealthCheckResult(
                 name=self.name,
                 status=CheckStatus.CRITICAL,
                 message=f"Timeout after {self.timeout}s",
                 response_time_ms=elapsed,
             )
-        except FileNotFoundError:
+        if result.returncode == self.expected_returncode:
+            output = result.stdout.decode(errors="replace").strip()
             return HealthCheckResult(
                 name=self.name,
-                status=CheckStatus.CRITICAL,
-                message=f"Command not found: {self.command[0]}",
+                status=CheckStatus.OK,
+                message=output[:200] or "OK",
+                response_time_ms=elapsed,
             )
+        stderr = result.stderr.decode(errors="replace").strip()
+        return HealthCheckResult(
+            name=self.name,
+            status=CheckStatus.CRITICAL,
+            message=f"Exit code {result.returncode}: {stderr[:200]}",
+            response_time_ms=elapsed,
+        )
@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+from bot.checks.base import BaseHealthCheck, CheckStatus, HealthCheckResult
+
+
+class TCPCheck(BaseHealthCheck):
+    """Cheap reachability probe: can a TCP connection be opened?"""
+
+    def __init__(
+        self,
+        name: str,
+        host: str,
+        port: int,
+        timeout: float = 3.0,
+        depends_on: list[str] | None = None,
+    ):
+        self._name = name
+        self.depends_on = tuple(depends_on or ())
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    async def execute(self) -> HealthCheckResult:
+        start = time.monotonic()
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), self.timeout
+            )
+        except TimeoutError:
+            return HealthCheckResult(
+                name=self.name,
+                status=CheckStatus.CRITICAL,
+                message=f"{self.host}:{self.port} timeout after {self.timeout}s",
+                response_time_ms=(time.monotonic() - start) * 1000,
+            )
+        except OSError as e:
+            return HealthCheckResult(
+                name=self.name,
+                status=CheckStatus.CRITICAL,
+                message=f"{self.host}:{self.port} unreachable: {e.strerror or e}",
+                response_time_ms=(time.monotonic() - start) * 1000,
+            )
+        elapsed = (time.monotonic() - start) * 1000
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return HealthCheckResult(
+            name=self.name,
+            status=CheckStatus.OK,
+            message=f"{self.host}:{self.port} reachable ({elapsed:.0f}ms)",
+            response_time_ms=elapsed,
+        )
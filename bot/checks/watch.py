@@ -0,0 +1,182 @@
+"""In-memory file state kept current by inotify, with a polling fallback.
+
+The parent directory is watched (the file itself may not exist yet), so lock
+files created, removed or renamed into place are seen as soon as the kernel
+reports them. Where inotify is unavailable (non-Linux, watch limits, missing
+directory) the file is stat()ed every ``poll_interval`` seconds instead.
+"""
+import asyncio
+import ctypes
+import ctypes.util
+import logging
+import os
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+
+_FILE_EVENTS = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+)
+_DIR_GONE = IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED
+
+_EVENT = struct.Struct("iIII")
+
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            libc.inotify_init1.restype = ctypes.c_int
+            libc.inotify_add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        except (OSError, AttributeError):
+            libc = False
+        _libc = libc
+    return _libc
+
+
+def inotify_available() -> bool:
+    return bool(_load_libc())
+
+
+@dataclass(frozen=True)
+class FileState:
+    exists: bool
+    mtime: float | None = None
+
+
+def stat_file(path: Path) -> FileState:
+    try:
+        return FileState(True, os.stat(path).st_mtime)
+    except OSError:
+        # Unreadable (permissions, a file where a directory should be, a stale
+        # mount) counts as missing rather than killing the watcher
+        return FileState(False)
+
+
+class FileWatcher:
+
+    def __init__(
+        self,
+        path: str | Path,
+        on_change: Callable[[FileState], None] | None = None,
+        poll_interval: float = 5.0,
+        use_inotify: bool = True,
+        any_change: bool = False,
+    ):
+        self.path = Path(path)
+        self.on_change = on_change
+        # Call on_change for mtime updates too, not only appear/disappear
+        self.any_change = any_change
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.state = stat_file(self.path)
+        self.mode: str | None = None
+        self._fd: int | None = None
+        self._poller: asyncio.Task | None = None
+
+    async def start(self):
+        if self.mode is not None:
+            return
+        if self.use_inotify and self._start_inotify():
+            self.mode = "inotify"
+        else:
+            self._poller = asyncio.create_task(self._poll())
+            self.mode = "poll"
+        self._refresh()
+        logger.info("Watching %s (%s)", self.path, self.mode)
+
+    async def stop(self):
+        self._close_inotify()
+        if self._poller:
+            self._poller.cancel()
+            try:
+                await self._poller
+            except asyncio.CancelledError:
+                pass
+            self._poller = None
+        self.mode = None
+
+    def _start_inotify(self) -> bool:
+        libc = _load_libc()
+        if not libc:
+            return False
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            logger.warning("inotify_init1 failed: %s", os.strerror(ctypes.get_errno()))
+            return False
+        directory = os.fsencode(self.path.parent)
+        if libc.inotify_add_watch(fd, directory, _FILE_EVENTS | IN_DELETE_SELF | IN_MOVE_SELF) < 0:
+            logger.warning(
+                "Cannot watch %s: %s", self.path.parent, os.strerror(ctypes.get_errno())
+            )
+            os.close(fd)
+            return False
+        self._fd = fd
+        asyncio.get_running_loop().add_reader(fd, self._on_readable)
+        return True
+
+    def _close_inotify(self):
+        if self._fd is not None:
+            asyncio.get_running_loop().remove_reader(self._fd)
+            os.close(self._fd)
+            self._fd = None
+
+    def _on_readable(self):
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        name = os.fsencode(self.path.name)
+        relevant = dir_gone = False
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            _, mask, _, length = _EVENT.unpack_from(data, offset)
+            event_name = data[offset + _EVENT.size : offset + _EVENT.size + length].rstrip(b"\0")
+            offset += _EVENT.size + length
+            if mask & IN_Q_OVERFLOW or event_name == name:
+                relevant = True
+            if mask & _DIR_GONE:
+                dir_gone = True
+        if relevant or dir_gone:
+            self._refresh()
+        if dir_gone:
+            # The watch died with the directory: keep going by polling
+            logger.warning("%s disappeared, polling %s", self.path.parent, self.path)
+            self._close_inotify()
+            self._poller = asyncio.create_task(self._poll())
+            self.mode = "poll"
+
+    async def _poll(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            self._refresh()
+
+    def _refresh(self):
+        state = stat_file(self.path)
+        if state == self.state:
+            return
+        existed = self.state.exists
+        self.state = state
+        if (self.any_change or state.exists != existed) and self.on_change is not None:
+            try:
+                self.on_change(state)
+            except Exception:
+                logger.exception("File watch callback failed for %s", self.path)
@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -14,15 +15,92 @@ class Settings(BaseSettings):
     telegram_bot_token: str
     initial_admin_id: int
 
+    # Transport: long polling or webhook served by the built-in web server
+    transport: Literal["polling", "webhook"] = "polling"
+    webhook_base_url: str = ""  # public HTTPS URL Telegram posts to
+    webhook_path: str = "/telegram/webhook"
+    webhook_secret: str = ""  # required in webhook mode
+    webhook_workers: int = 4
+    webhook_queue_size: int = 1000
+
+    # Update processing: global handler concurrency, pending updates before
+    # new ones are refused (webhook: Telegram retries) or shed (polling)
+    update_concurrency: int = 8
+    update_max_pending: int = 500
+
+    # Callback throttling: identical taps within the debounce window are
+    # dropped; each user gets a token bucket of callback_burst taps refilled
+    # at callback_rate_per_minute
+    callback_debounce_seconds: float = 3.0
+    callback_rate_per_minute: int = 20
+    callback_burst: int = 5
+
+    # Web server (webhook and internal endpoints)
+    web_host: str = "127.0.0.1"
+    web_port: int = 8080
+    # Also listen on this Unix socket (e.g. for agents on the same host)
+    web_unix_socket: str = ""
+    metrics_enabled: bool = False
+    metrics_path: str = "/metrics"
+
     # Monitoring
     health_check_interval: int = 60
+    # Adaptive polling: stable checks stretch from health_check_interval up
+    # to check_interval_max, a WARNING or rising latency drops them to
+    # check_interval_min. Set both to health_check_interval for a fixed loop.
+    check_interval_min: int = 15
+    check_interval_max: int = 300
+    first_check_delay: float = 0.0
     notification_cooldown: int = 300
+    # On shutdown the running cycle gets this long to finish before its checks
+    # are cancelled and their processes killed; results are flushed either way
+    shutdown_drain_timeout: float = 20.0
+    # Command checks (claude, nvidia-smi): concurrent processes and the
+    # stdout/stderr bytes kept per stream
+    subprocess_concurrency: int = 4
+    subprocess_output_limit: int = 65536
+    # `claude --version` is rerun only when the binary changes or the result
+    # is older than this
+    claude_version_cache_seconds: float = 3600.0
+    # Circuit breaker for vLLM/Jira: after this many consecutive failures the
+    # check returns its last failure instantly and probes again after a
+    # backoff that doubles on every failed probe, up to breaker_max_backoff
+    breaker_failure_threshold: int = 3
+    breaker_backoff: float = 30.0
+    breaker_max_backoff: float = 900.0
+    # Lock files are watched with inotify; this is the stat() interval used
+    # where inotify is unavailable
+    file_watch_poll_interval: float = 5.0
+
+    # /uptime: the time between two results of a check counts as up or down
+    # by the first one, unless it is longer than uptime_max_gap (the monitor
+    # was not running). Counters are recomputed from the health logs every
+    # uptime_rebuild_interval seconds to verify them (0 disables).
+    uptime_max_gap: float = 900.0
+    uptime_rebuild_interval: float = 86400.0
+
+    # Run checks, health logging and alerts in a separate worker process so
+    # heavy cycles do not delay command handlers; commands still run their
+    # own checks in the bot process
+    monitor_worker: bool = False
+
+    # Event loop: "uvloop" needs the optional dependency (pip install '.[uvloop]').
+    # Lag above loop_lag_threshold is logged and reported to the initial admin;
+    # slow_callback_seconds > 0 enables asyncio debug mode to find the culprit.
+    event_loop: Literal["asyncio", "uvloop"] = "asyncio"
+    loop_lag_threshold: float = 0.25
+    slow_callback_seconds: float = 0.0
 
     # Database
     database_url: str = "sqlite+aiosqlite:///data/bot.db"
 
-    # vLLM
+    # vLLM; with vllm_model set, a one-token completion checks inference too
     vllm_api_url: str = "http://localhost:8001/v1"
+    vllm_model: str = ""
+
+    # "host:port" probed over TCP before the vLLM and Jira checks; when it
+    # fails they are reported as blocked instead of timing out one by one
+    network_check_target: str = ""
 
     # Jira
     jira_url: str = ""
@@ -32,6 +110,30 @@ class Settings(BaseSettings):
 
     # Paths
     cycle_runner_lock_path: str = ""
+    # YAML task/check definitions (see config.example.yaml); when empty the
+    # built-in documentation pipeline task is used
+    tasks_config_path: str = ""
+    # Reload it when the file changes (admins can always use /reload)
+    tasks_config_watch: bool = True
+
+    # Leader election: instances sharing the database elect one leader via a
+    # lease row; only it runs the monitoring loop and sends alerts, the others
+    # answer commands. A crashed leader is replaced within
+    # leader_lease_ttl + leader_renew_interval seconds.
+    leader_election: bool = False
+    leader_lease_ttl: float = 30.0
+    leader_renew_interval: float = 10.0
+    # Lease holder name; hostname:pid when empty
+    instance_name: str = ""
+
+    # Remote agents (python -m bot.agent) push their results to agent_path on
+    # the web server and show up as "node:<name>" tasks. A node is reported
+    # down after agent_heartbeat_misses heartbeat intervals without a push.
+    # agent_token may only be empty when web_host is a loopback address.
+    agents_enabled: bool = False
+    agent_path: str = "/agent/push"
+    agent_token: str = ""
+    agent_heartbeat_misses: int = 3
 
 
 @lru_cache
@@ -1,6 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
-from bot.db.models import Base
+from bot.db.models import SCHEMA_VERSION, Base
 
 
 def create_engine(database_url: str):
@@ -11,6 +11,27 @@ def create_session_factory(engine) -> async_sessionmaker[AsyncSession]:
     return async_sessionmaker(engine, expire_on_commit=False)
 
 
-async def init_db(engine):
+async def init_db(engine) -> bool:
+    """Create missing tables. Returns False if skipped because the schema is current.
+
+    SQLite stores the schema version in ``PRAGMA user_version``, so restarts
+    skip the table reflection done by ``create_all``.
+    """
+    is_sqlite = engine.dialect.name == "sqlite"
     async with engine.begin() as conn:
+        if is_sqlite:
+            version = (await conn.exec_driver_sql("PRAGMA user_version")).scalar()
+            if version == SCHEMA_VERSION:
+                return False
         await conn.run_sync(Base.metadata.create_all)
+        # create_all skips tables that exist; add indexes introduced since
+        await conn.run_sync(_create_indexes)
+        if is_sqlite:
+            await conn.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return True
+
+
+def _create_indexes(conn):
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
@@ -1,8 +1,11 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, DateTime, Float, Integer, String, Text, UniqueConstraint
+from sqlalchemy import Boolean, DateTime, Float, Index, Integer, String, Text, UniqueConstraint
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
+# Bump whenever tables or indexes change so init_db re-runs create_all
+SCHEMA_VERSION = 4
+
 
 class Base(DeclarativeBase):
     pass
@@ -44,6 +47,43 @@ class HealthLog(Base):
     response_time_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
     checked_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
 
+    # Keyset pagination of /history walks these newest first
+    __table_args__ = (
+        Index("ix_health_logs_task_time", "task_name", "checked_at", "id"),
+        Index("ix_health_logs_task_check_time", "task_name", "check_name", "checked_at", "id"),
+    )
+
+
+class UptimeBucket(Base):
+    """Hourly rollup of one check's logged results (see bot.notifications.uptime)."""
+
+    __tablename__ = "uptime_buckets"
+
+    task_name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    check_name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    # Unix time of the bucket start
+    bucket: Mapped[int] = mapped_column(Integer, primary_key=True)
+    results: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    failures: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    up_seconds: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    down_seconds: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+
+class UptimeCounter(Base):
+    """Running totals of one check's buckets in a sliding window."""
+
+    __tablename__ = "uptime_counters"
+
+    task_name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    check_name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    window: Mapped[int] = mapped_column(Integer, primary_key=True)  # seconds
+    # Oldest bucket still included in the totals
+    since: Mapped[int] = mapped_column(Integer, nullable=False)
+    results: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    failures: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    up_seconds: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    down_seconds: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
 
 class NotificationLog(Base):
     __tablename__ = "notification_log"
@@ -55,3 +95,17 @@ class NotificationLog(Base):
     status: Mapped[str] = mapped_column(String(20), nullable=False)
     message: Mapped[str | None] = mapped_column(Text, nullable=True)
     sent_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
+
+
+class Lease(Base):
+    """Leader lease shared by bot instances using the same database."""
+
+    __tablename__ = "leases"
+
+    name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    holder: Mapped[str] = mapped_column(String(255), nullable=False)
+    # Incremented whenever the lease changes hands
+    term: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    # Unix timestamps: the holder may be another process
+    renewed_at: Mapped[float] = mapped_column(Float, nullable=False)
+    expires_at: Mapped[float] = mapped_column(Float, nullable=False)
@@ -1,18 +1,31 @@
 from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator
 
-from sqlalchemy import select, update
+from sqlalchemy import Integer, case, cast, delete, func, or_, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from bot.db.models import HealthLog, NotificationLog, NotificationPreference, User
+from bot.db.models import (
+    HealthLog,
+    Lease,
+    NotificationLog,
+    NotificationPreference,
+    UptimeBucket,
+    UptimeCounter,
+    User,
+)
+from bot.metrics.timing import timed
 
 
 # ── Users ────────────────────────────────────────────────────────────────────
 
+@timed("db")
 async def get_user(session: AsyncSession, user_id: int) -> User | None:
     result = await session.execute(select(User).where(User.id == user_id, User.is_active == True))
     return result.scalar_one_or_none()
 
 
+@timed("db")
 async def create_user(
     session: AsyncSession,
     user_id: int,
@@ -33,6 +46,7 @@ async def create_user(
     return user
 
 
+@timed("db")
 async def deactivate_user(session: AsyncSession, user_id: int) -> bool:
     result = await session.execute(
         update(User).where(User.id == user_id).values(is_active=False)
@@ -41,6 +55,7 @@ async def deactivate_user(session: AsyncSession, user_id: int) -> bool:
     return result.rowcount > 0
 
 
+@timed("db")
 async def get_all_users(session: AsyncSession) -> list[User]:
     result = await session.execute(select(User).where(User.is_active == True).order_by(User.created_at))
     return list(result.scalars().all())
@@ -48,6 +63,7 @@ async def get_all_users(session: AsyncSession) -> list[User]:
 
 # ── Notification preferences ─────────────────────────────────────────────────
 
+@timed("db")
 async def get_notification_pref(
     session: AsyncSession, user_id: int, task_name: str
 ) -> NotificationPreference | None:
@@ -60,6 +76,7 @@ async def get_notification_pref(
     return result.scalar_one_or_none()
 
 
+@timed("db")
 async def get_user_prefs(session: AsyncSession, user_id: int) -> list[NotificationPreference]:
     result = await session.execute(
         select(NotificationPreference).where(NotificationPreference.user_id == user_id)
@@ -67,6 +84,7 @@ async def get_user_prefs(session: AsyncSession, user_id: int) -> list[Notificati
     return list(result.scalars().all())
 
 
+@timed("db")
 async def toggle_notification(
     session: AsyncSession, user_id: int, task_name: str
 ) -> bool:
@@ -85,6 +103,7 @@ async def toggle_notification(
     return pref.is_enabled
 
 
+@timed("db")
 async def get_task_subscribers(session: AsyncSession, task_name: str) -> list[int]:
     """Get user IDs subscribed to notifications for a task."""
     result = await session.execute(
@@ -98,6 +117,7 @@ async def get_task_subscribers(session: AsyncSession, task_name: str) -> list[in
 
 # ── Health logs ──────────────────────────────────────────────────────────────
 
+@timed("db")
 async def save_health_log(
     session: AsyncSession,
     task_name: str,
@@ -117,20 +137,342 @@ async def save_health_log(
     await session.commit()
 
 
+@timed("db")
+async def save_health_logs(session: AsyncSession, rows: list[dict]):
+    """Insert many health log rows in one transaction."""
+    session.add_all(HealthLog(**row) for row in rows)
+    await session.commit()
+
+
+def _health_log_filter(task_name: str, check_name: str | None) -> list:
+    conditions = [HealthLog.task_name == task_name]
+    if check_name is not None:
+        conditions.append(HealthLog.check_name == check_name)
+    return conditions
+
+
+@timed("db")
 async def get_recent_health_logs(
-    session: AsyncSession, task_name: str, limit: int = 20
+    session: AsyncSession,
+    task_name: str,
+    limit: int = 20,
+    check_name: str | None = None,
+    before: tuple[datetime, int] | None = None,
 ) -> list[HealthLog]:
+    """Newest first; ``before`` is the (checked_at, id) of the previous page's last row.
+
+    Keyset pagination: every page is an index range scan from the cursor,
+    so deep pages cost as much as the first.
+    """
+    conditions = _health_log_filter(task_name, check_name)
+    if before is not None:
+        conditions.append(tuple_(HealthLog.checked_at, HealthLog.id) < tuple_(*before))
     result = await session.execute(
         select(HealthLog)
-        .where(HealthLog.task_name == task_name)
-        .order_by(HealthLog.checked_at.desc())
+        .where(*conditions)
+        .order_by(HealthLog.checked_at.desc(), HealthLog.id.desc())
         .limit(limit)
     )
     return list(result.scalars().all())
 
 
+@timed("db")
+async def get_latest_health_log_time(
+    session: AsyncSession,
+    task_name: str,
+    check_name: str | None = None,
+    before: datetime | None = None,
+) -> datetime | None:
+    conditions = _health_log_filter(task_name, check_name)
+    if before is not None:
+        conditions.append(HealthLog.checked_at < before)
+    return await session.scalar(select(func.max(HealthLog.checked_at)).where(*conditions))
+
+
+def _epoch(session: AsyncSession, column):
+    if session.bind.dialect.name == "sqlite":
+        return cast(func.strftime("%s", column), Integer)
+    return cast(func.extract("epoch", column), Integer)
+
+
+@timed("db")
+async def get_health_log_buckets(
+    session: AsyncSession,
+    task_name: str,
+    start: datetime,
+    end: datetime,
+    bucket_seconds: int,
+    check_name: str | None = None,
+) -> list:
+    """Per-bucket status counts in [start, end), newest first.
+
+    Rows are (bucket start as Unix time, total, ok, warning, critical,
+    average response time in ms).
+    """
+    bucket = _epoch(session, HealthLog.checked_at) // bucket_seconds * bucket_seconds
+    result = await session.execute(
+        select(
+            bucket,
+            func.count(),
+            func.sum(case((HealthLog.status == "ok", 1), else_=0)),
+            func.sum(case((HealthLog.status == "warning", 1), else_=0)),
+            func.sum(case((HealthLog.status == "critical", 1), else_=0)),
+            func.avg(HealthLog.response_time_ms),
+        )
+        .where(
+            *_health_log_filter(task_name, check_name),
+            HealthLog.checked_at >= start,
+            HealthLog.checked_at < end,
+        )
+        .group_by(bucket)
+        .order_by(bucket.desc())
+    )
+    return list(result.all())
+
+
+@timed("db")
+async def get_last_task_health(session: AsyncSession) -> dict[str, bool]:
+    """Healthy/unhealthy per task from the latest logged result of each check.
+
+    Scans the table once; used when a new leader takes over the loop.
+    """
+    latest = select(func.max(HealthLog.id)).group_by(HealthLog.task_name, HealthLog.check_name)
+    result = await session.execute(
+        select(HealthLog.task_name, HealthLog.status).where(HealthLog.id.in_(latest))
+    )
+    health: dict[str, bool] = {}
+    for task_name, status in result.all():
+        health[task_name] = health.get(task_name, True) and status in ("ok", "unknown")
+    return health
+
+
+@timed("db")
+async def get_last_check_results(
+    session: AsyncSession,
+) -> dict[tuple[str, str], tuple[datetime, str]]:
+    """(checked_at, status) of the latest logged result per (task, check)."""
+    latest = select(func.max(HealthLog.id)).group_by(HealthLog.task_name, HealthLog.check_name)
+    result = await session.execute(
+        select(
+            HealthLog.task_name, HealthLog.check_name, HealthLog.checked_at, HealthLog.status
+        ).where(HealthLog.id.in_(latest))
+    )
+    return {(task, check): (at, status) for task, check, at, status in result.all()}
+
+
+async def stream_health_logs(
+    session: AsyncSession, since: datetime, until: datetime
+) -> AsyncIterator[tuple[str, str, datetime, str]]:
+    """(task, check, checked_at, status) in [since, until), in order per check."""
+    result = await session.stream(
+        select(HealthLog.task_name, HealthLog.check_name, HealthLog.checked_at, HealthLog.status)
+        .where(HealthLog.checked_at >= since, HealthLog.checked_at < until)
+        .order_by(HealthLog.task_name, HealthLog.check_name, HealthLog.checked_at, HealthLog.id)
+        .execution_options(yield_per=1000)
+    )
+    async for row in result:
+        yield tuple(row)
+
+
+# ── Uptime ───────────────────────────────────────────────────────────────────
+
+# (results, failures, up_seconds, down_seconds) of one check
+UptimeTotals = tuple[int, int, float, float]
+
+_TOTALS = ("results", "failures", "up_seconds", "down_seconds")
+
+
+def _totals(row) -> UptimeTotals:
+    return tuple(getattr(row, name) for name in _TOTALS)
+
+
+def _matches(row, totals: UptimeTotals, tolerance: float) -> bool:
+    return all(abs(a - b) <= tolerance for a, b in zip(_totals(row), totals, strict=True))
+
+
+@timed("db")
+async def add_uptime(
+    session: AsyncSession,
+    bucket: int,
+    deltas: dict[tuple[str, str], UptimeTotals],
+    horizons: dict[int, int],
+):
+    """Add to the checks' bucket and to their totals for every window.
+
+    ``horizons`` maps each window to its oldest included bucket, the start of
+    counters created here. Nothing is committed.
+    """
+    for (task_name, check_name), delta in deltas.items():
+        increments = {
+            name: getattr(UptimeBucket, name) + value
+            for name, value in zip(_TOTALS, delta, strict=True)
+        }
+        result = await session.execute(
+            update(UptimeBucket)
+            .where(
+                UptimeBucket.task_name == task_name,
+                UptimeBucket.check_name == check_name,
+                UptimeBucket.bucket == bucket,
+            )
+            .values(increments)
+            .execution_options(synchronize_session=False)
+        )
+        if not result.rowcount:
+            session.add(UptimeBucket(
+                task_name=task_name, check_name=check_name, bucket=bucket,
+                **dict(zip(_TOTALS, delta, strict=True)),
+            ))
+        for window, horizon in horizons.items():
+            increments = {
+                name: getattr(UptimeCounter, name) + value
+                for name, value in zip(_TOTALS, delta, strict=True)
+            }
+            result = await session.execute(
+                update(UptimeCounter)
+                .where(
+                    UptimeCounter.task_name == task_name,
+                    UptimeCounter.check_name == check_name,
+                    UptimeCounter.window == window,
+                )
+                .values(increments)
+                .execution_options(synchronize_session=False)
+            )
+            if not result.rowcount:
+                session.add(UptimeCounter(
+                    task_name=task_name, check_name=check_name, window=window, since=horizon,
+                    **dict(zip(_TOTALS, delta, strict=True)),
+                ))
+
+
+@timed("db")
+async def get_uptime_since(session: AsyncSession, window: int) -> int | None:
+    return await session.scalar(
+        select(func.min(UptimeCounter.since)).where(UptimeCounter.window == window)
+    )
+
+
+async def _sum_buckets(
+    session: AsyncSession, since: int, before: int | None = None
+) -> dict[tuple[str, str], UptimeTotals]:
+    conditions = [UptimeBucket.bucket >= since]
+    if before is not None:
+        conditions.append(UptimeBucket.bucket < before)
+    result = await session.execute(
+        select(
+            UptimeBucket.task_name,
+            UptimeBucket.check_name,
+            *(func.sum(getattr(UptimeBucket, name)) for name in _TOTALS),
+        )
+        .where(*conditions)
+        .group_by(UptimeBucket.task_name, UptimeBucket.check_name)
+    )
+    return {(task, check): tuple(totals) for task, check, *totals in result.all()}
+
+
+@timed("db")
+async def slide_uptime(session: AsyncSession, window: int, since: int, horizon: int):
+    """Subtract buckets in [since, horizon) from the window's totals."""
+    for (task_name, check_name), expired in (await _sum_buckets(session, since, horizon)).items():
+        await session.execute(
+            update(UptimeCounter)
+            .where(
+                UptimeCounter.task_name == task_name,
+                UptimeCounter.check_name == check_name,
+                UptimeCounter.window == window,
+            )
+            .values({
+                name: getattr(UptimeCounter, name) - value
+                for name, value in zip(_TOTALS, expired, strict=True)
+            })
+            .execution_options(synchronize_session=False)
+        )
+    await session.execute(
+        update(UptimeCounter)
+        .where(UptimeCounter.window == window, UptimeCounter.since < horizon)
+        .values(since=horizon)
+        .execution_options(synchronize_session=False)
+    )
+
+
+@timed("db")
+async def prune_uptime_buckets(session: AsyncSession, before: int):
+    await session.execute(delete(UptimeBucket).where(UptimeBucket.bucket < before))
+
+
+@timed("db")
+async def replace_uptime_buckets(
+    session: AsyncSession,
+    since: int,
+    before: int,
+    buckets: dict[tuple[str, str, int], UptimeTotals],
+    tolerance: float = 0.01,
+) -> int:
+    """Make the buckets in [since, before) equal ``buckets``; returns how many differed."""
+    result = await session.execute(
+        select(UptimeBucket).where(UptimeBucket.bucket >= since, UptimeBucket.bucket < before)
+    )
+    stored = {(b.task_name, b.check_name, b.bucket): b for b in result.scalars()}
+    changed = 0
+    for key in stored.keys() | buckets.keys():
+        row, totals = stored.get(key), buckets.get(key)
+        if row is not None and totals is not None and _matches(row, totals, tolerance):
+            continue
+        changed += 1
+        if totals is None:
+            await session.delete(row)
+        elif row is None:
+            task_name, check_name, bucket = key
+            session.add(UptimeBucket(
+                task_name=task_name, check_name=check_name, bucket=bucket,
+                **dict(zip(_TOTALS, totals, strict=True)),
+            ))
+        else:
+            for name, value in zip(_TOTALS, totals, strict=True):
+                setattr(row, name, value)
+    return changed
+
+
+@timed("db")
+async def reset_uptime_counters(
+    session: AsyncSession, horizons: dict[int, int], tolerance: float = 0.01
+) -> int:
+    """Recompute every window's totals from its buckets; returns how many differed."""
+    changed = 0
+    for window, horizon in horizons.items():
+        sums = await _sum_buckets(session, horizon)
+        result = await session.execute(select(UptimeCounter).where(UptimeCounter.window == window))
+        counters = {(c.task_name, c.check_name): c for c in result.scalars()}
+        for key in counters.keys() | sums.keys():
+            counter, totals = counters.get(key), sums.get(key, (0, 0, 0.0, 0.0))
+            if counter is None:
+                counter = UptimeCounter(
+                    task_name=key[0], check_name=key[1], window=window, since=horizon
+                )
+                session.add(counter)
+            elif _matches(counter, totals, tolerance):
+                counter.since = horizon
+                continue
+            changed += 1
+            counter.since = horizon
+            for name, value in zip(_TOTALS, totals, strict=True):
+                setattr(counter, name, value)
+    return changed
+
+
+@timed("db")
+async def get_uptime_counters(
+    session: AsyncSession, task_name: str | None = None
+) -> list[UptimeCounter]:
+    query = select(UptimeCounter).order_by(UptimeCounter.task_name, UptimeCounter.check_name)
+    if task_name is not None:
+        query = query.where(UptimeCounter.task_name == task_name)
+    result = await session.execute(query)
+    return list(result.scalars().all())
+
+
 # ── Notification log ─────────────────────────────────────────────────────────
 
+@timed("db")
 async def log_notification(
     session: AsyncSession,
     user_id: int,
@@ -150,6 +492,7 @@ async def log_notification(
     await session.commit()
 
 
+@timed("db")
 async def is_in_cooldown(
     session: AsyncSession, user_id: int, task_name: str, cooldown_seconds: int
 ) -> bool:
@@ -164,3 +507,51 @@ async def is_in_cooldown(
         .limit(1)
     )
     return result.scalar_one_or_none() is not None
+
+
+# ── Leader lease ─────────────────────────────────────────────────────────────
+
+@timed("db")
+async def acquire_lease(
+    session: AsyncSession, name: str, holder: str, ttl: float, now: float
+) -> int | None:
+    """Take an expired lease or renew our own; returns its term, or None
+    while another holder's lease is still valid."""
+    result = await session.execute(
+        update(Lease)
+        .where(Lease.name == name, or_(Lease.holder == holder, Lease.expires_at < now))
+        .values(
+            term=case((Lease.holder == holder, Lease.term), else_=Lease.term + 1),
+            holder=holder,
+            renewed_at=now,
+            expires_at=now + ttl,
+        )
+        .returning(Lease.term)
+        .execution_options(synchronize_session=False)
+    )
+    term = result.scalar_one_or_none()
+    if term is None:
+        session.add(Lease(name=name, holder=holder, term=1, renewed_at=now, expires_at=now + ttl))
+        try:
+            await session.commit()
+        except IntegrityError:
+            # Held by someone else
+            await session.rollback()
+            return None
+        return 1
+    await session.commit()
+    return term
+
+
+@timed("db")
+async def release_lease(session: AsyncSession, name: str, holder: str):
+    """Expire our lease now so a follower does not wait for the TTL."""
+    await session.execute(
+        update(Lease).where(Lease.name == name, Lease.holder == holder).values(expires_at=0.0)
+    )
+    await session.commit()
+
+
+@timed("db")
+async def get_lease(session: AsyncSession, name: str) -> Lease | None:
+    return await session.get(Lease, name)
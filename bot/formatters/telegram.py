@@ -1,3 +1,8 @@
+from collections import OrderedDict
+from datetime import datetime, timezone
+from html import escape
+from typing import Callable, Hashable, Iterable, Iterator, Mapping, TypeVar
+
 from bot.checks.base import CheckStatus, HealthCheckResult
 from bot.tasks.base import TaskHealthReport
 
@@ -8,49 +13,217 @@ STATUS_ICONS = {
     CheckStatus.UNKNOWN: "\u2753",
 }
 
+# Telegram rejects messages over 4096 characters; keep headroom for emoji that
+# count as two UTF-16 code units.
+MESSAGE_LIMIT = 4000
+
+RENDER_CACHE_SIZE = 128
+
+# Rendered HTML keyed by (kind, report content). Reports with identical content
+# render to identical text, so repeated /status taps skip string building.
+_render_cache: OrderedDict[tuple[str, Hashable], object] = OrderedDict()
+
+T = TypeVar("T")
+
+
+def _freeze(value) -> Hashable:
+    if isinstance(value, Mapping):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _time_str(check: HealthCheckResult) -> str:
+    return f" ({check.response_time_ms:.0f}ms)" if check.response_time_ms else ""
+
+
+# Keys hold what the text shows, so fresh reports with the same content hit the cache
+def _check_key(check: HealthCheckResult) -> tuple:
+    return (
+        check.name, check.status, check.message, _time_str(check), check.details.get("blocked_by"),
+    )
+
+
+def _report_key(report: TaskHealthReport) -> tuple:
+    return (
+        report.task_display_name,
+        report.is_healthy,
+        report.summary,
+        tuple(_check_key(c) for c in report.checks),
+    )
+
+
+def _cached(kind: str, key: Hashable, render: Callable[[], T]) -> T:
+    cache_key = (kind, key)
+    text = _render_cache.get(cache_key)
+    if text is not None:
+        _render_cache.move_to_end(cache_key)
+        return text
+    text = render()
+    _render_cache[cache_key] = text
+    if len(_render_cache) > RENDER_CACHE_SIZE:
+        _render_cache.popitem(last=False)
+    return text
+
+
+def clear_render_cache():
+    _render_cache.clear()
 
-def format_check_line(check: HealthCheckResult) -> str:
+
+def _clip(text: str, limit: int) -> str:
+    """Escape text for HTML, truncating the raw text so the result fits in limit."""
+    escaped = escape(text, quote=False)
+    if len(escaped) <= limit:
+        return escaped
+    if limit < 1:
+        return ""
+    text = text[: limit - 1]
+    while (overflow := len(escape(text, quote=False)) + 1 - limit) > 0:
+        text = text[: len(text) - overflow]
+    return escape(text, quote=False) + "\u2026"
+
+
+def format_check_line(check: HealthCheckResult, limit: int = MESSAGE_LIMIT) -> str:
     icon = STATUS_ICONS.get(check.status, "?")
-    time_str = f" ({check.response_time_ms:.0f}ms)" if check.response_time_ms else ""
-    return f"{icon} <b>{check.name}</b>{time_str}\n    {check.message}"
+    head = f"{icon} <b>{escape(check.name)}</b>{_time_str(check)}\n    "
+    return head + _clip(check.message, limit - len(head))
+
+
+def group_blocked(
+    checks: Iterable[HealthCheckResult],
+) -> Iterator[tuple[HealthCheckResult, list[str]]]:
+    """Yield checks that ran, each with the names of the checks it blocked."""
+    checks = list(checks)
+    blocked: dict[str, list[str]] = {}
+    for check in checks:
+        root = check.details.get("blocked_by")
+        if root is not None:
+            blocked.setdefault(root, []).append(check.name)
+    for check in checks:
+        if "blocked_by" not in check.details:
+            yield check, blocked.get(check.name, [])
+
+
+def _blocked_line(names: list[str]) -> str:
+    return f"\n    \u21b3 blocked: {escape(', '.join(names))}" if names else ""
+
+
+def chunk_blocks(blocks: Iterable[str], limit: int = MESSAGE_LIMIT) -> Iterator[str]:
+    """Pack self-contained HTML blocks into chunks of at most limit characters.
+
+    Blocks are never split, so tags opened in a block stay in the same chunk.
+    Leading newlines of a block are dropped when it starts a new chunk.
+    """
+    current: list[str] = []
+    size = 0
+    for block in blocks:
+        if current and size + 1 + len(block) > limit:
+            yield "\n".join(current)
+            current, size = [], 0
+        if not current:
+            block = block.lstrip("\n")
+            size = len(block)
+        else:
+            size += 1 + len(block)
+        current.append(block)
+    if current:
+        yield "\n".join(current)
+
+
+def _status_blocks(reports: dict[str, TaskHealthReport], limit: int) -> Iterator[str]:
+    yield "<b>Server Status</b>\n" + "\u2500" * 20
+    for report in reports.values():
+        icon = "\u2705" if report.is_healthy else "\u274c"
+        yield f"\n{icon} <b>{escape(report.task_display_name)}</b>"
+        for check, blocked in group_blocked(report.checks):
+            yield format_check_line(check, limit) + _blocked_line(blocked)
+
+
+def _summary_blocks(reports: dict[str, TaskHealthReport], limit: int) -> Iterator[str]:
+    total = sum(len(r.checks) for r in reports.values())
+    failed = sum(1 for r in reports.values() for c in r.checks if c.status != CheckStatus.OK)
+    yield (
+        "<b>Server Status (summary)</b>\n" + "\u2500" * 20 + "\n"
+        f"{total - failed}/{total} checks OK across {len(reports)} task(s)"
+    )
+    if not failed:
+        yield "\n\u2705 All systems operational"
+        return
+    for report in reports.values():
+        unhealthy = [c for c in report.checks if c.status != CheckStatus.OK]
+        if not unhealthy:
+            continue
+        icon = "\u2705" if report.is_healthy else "\u274c"
+        yield f"\n{icon} <b>{escape(report.task_display_name)}</b>"
+        for check, blocked in group_blocked(unhealthy):
+            yield format_check_line(check, limit) + _blocked_line(blocked)
 
 
 def format_status_report(reports: dict[str, TaskHealthReport]) -> str:
     if not reports:
         return "No tasks registered."
+    key = tuple(_report_key(r) for r in reports.values())
+    return _cached("status", key, lambda: _render_status_report(reports))
 
-    lines = ["<b>Server Status</b>", "\u2500" * 20]
 
-    for report in reports.values():
-        icon = "\u2705" if report.is_healthy else "\u274c"
-        lines.append(f"\n{icon} <b>{report.task_display_name}</b>")
-        for check in report.checks:
-            lines.append(format_check_line(check))
+def _render_status_report(reports: dict[str, TaskHealthReport]) -> str:
+    return "\n".join(_status_blocks(reports, MESSAGE_LIMIT))
 
-    return "\n".join(lines)
+
+def render_status_pages(
+    reports: dict[str, TaskHealthReport],
+    summary: bool = False,
+    limit: int = MESSAGE_LIMIT,
+) -> tuple[str, ...]:
+    """Render the status report as message-sized pages.
+
+    In summary mode only checks that are not OK are listed.
+    """
+    if not reports:
+        return ("No tasks registered.",)
+    key = (summary, limit, tuple(_report_key(r) for r in reports.values()))
+    blocks = _summary_blocks if summary else _status_blocks
+    return _cached("pages", key, lambda: tuple(chunk_blocks(blocks(reports, limit), limit)))
+
+
+_FOOTER = "\n\n<i>Checked at: {}</i>"
 
 
 def format_task_detail(report: TaskHealthReport) -> str:
+    # The footer changes every second, so it is not part of the cached text
+    body = _cached("detail", _report_key(report), lambda: _render_task_detail(report))
+    return body + _FOOTER.format(report.timestamp[:19])
+
+
+def _render_task_detail(report: TaskHealthReport) -> str:
     icon = "\u2705" if report.is_healthy else "\u274c"
-    lines = [
-        f"{icon} <b>{report.task_display_name}</b>",
-        f"<i>{report.summary}</i>",
-        "",
-    ]
-    for check in report.checks:
-        lines.append(format_check_line(check))
-
-    lines.append(f"\n<i>Checked at: {report.timestamp[:19]}</i>")
+    header = (
+        f"{icon} <b>{escape(report.task_display_name)}</b>\n"
+        f"<i>{escape(report.summary)}</i>\n"
+    )
+    # Share what is left of one message between the check lines
+    footer = len(_FOOTER.format("0" * 19))
+    budget = (MESSAGE_LIMIT - len(header) - footer) // max(len(report.checks), 1)
+    lines = [header]
+    for check, blocked in group_blocked(report.checks):
+        lines.append(format_check_line(check, budget) + _blocked_line(blocked))
     return "\n".join(lines)
 
 
 def format_gpu_report(check: HealthCheckResult) -> str:
+    key = (_check_key(check), _freeze(check.details))
+    return _cached("gpu", key, lambda: _render_gpu_report(check))
+
+
+def _render_gpu_report(check: HealthCheckResult) -> str:
     if check.status == CheckStatus.UNKNOWN:
-        return f"\u2753 <b>GPU</b>\n{check.message}"
+        return f"\u2753 <b>GPU</b>\n{_clip(check.message, MESSAGE_LIMIT - 20)}"
 
     gpus = check.details.get("gpus", [])
     if not gpus:
-        return f"<b>GPU Status</b>\n{check.message}"
+        # Fallback output is raw nvidia-smi text: keep its layout, escape it
+        return f"<b>GPU Status</b>\n<pre>{_clip(check.message, MESSAGE_LIMIT - 40)}</pre>"
 
     lines = ["<b>GPU Status</b>", "\u2550" * 20]
     for g in gpus:
@@ -75,7 +248,7 @@ def format_gpu_report(check: HealthCheckResult) -> str:
         temp_line = f"  Temperature: {temp}\u00b0C" if temp is not None else "  Temperature: N/A"
 
         lines.extend([
-            f"\n<b>GPU{g['index']}: {g['name']}</b>",
+            f"\n<b>GPU{g['index']}: {escape(str(g['name']))}</b>",
             util_line,
             mem_line,
             temp_line,
@@ -88,20 +261,24 @@ def format_alert(task_name: str, report: TaskHealthReport) -> str:
     failed = [c for c in report.checks if c.status in (CheckStatus.CRITICAL, CheckStatus.WARNING)]
     ok = [c for c in report.checks if c.status == CheckStatus.OK]
 
-    lines = [f"\u26a0\ufe0f <b>{report.task_display_name}</b>", ""]
-    for check in failed:
+    lines = [f"\u26a0\ufe0f <b>{escape(report.task_display_name)}</b>", ""]
+    dependents = [c for c in report.checks if "blocked_by" in c.details]
+    for check, blocked in group_blocked(failed + dependents):
         icon = STATUS_ICONS[check.status]
-        lines.append(f"{icon} <b>{check.name}</b> \u2014 {check.message}")
+        lines.append(
+            f"{icon} <b>{escape(check.name)}</b> \u2014 {_clip(check.message, 500)}"
+            + _blocked_line(blocked)
+        )
 
     if ok:
-        ok_names = ", ".join(c.name for c in ok)
+        ok_names = escape(", ".join(c.name for c in ok))
         lines.append(f"\nRemaining checks OK: {ok_names}")
 
     return "\n".join(lines)
 
 
 def format_recovery(task_name: str, report: TaskHealthReport) -> str:
-    return f"\u2705 <b>{report.task_display_name}</b>\n\nAll systems restored."
+    return f"\u2705 <b>{escape(report.task_display_name)}</b>\n\nAll systems restored."
 
 
 def format_user_list(users) -> str:
@@ -116,3 +293,75 @@ def format_user_list(users) -> str:
         lines.append(f"\u2022 <code>{u.id}</code> {name}{admin}{active}")
 
     return "\n".join(lines)
+
+
+def format_history_page(title: str, logs, show_check: bool = True) -> str:
+    """One /history page of health log rows, newest first."""
+    if not logs:
+        return f"<b>{escape(title)}</b>\n\nNo history recorded."
+
+    header = f"<b>{escape(title)}</b>\n"
+    # Share one message between the rows, like the task detail
+    budget = (MESSAGE_LIMIT - len(header)) // len(logs)
+    lines = [header]
+    for log in logs:
+        icon = STATUS_ICONS.get(CheckStatus(log.status), "?")
+        head = f"{icon} <code>{log.checked_at:%Y-%m-%d %H:%M:%S}</code>"
+        if show_check:
+            head += f" <b>{escape(log.check_name)}</b>"
+        if log.response_time_ms:
+            head += f" ({log.response_time_ms:.0f}ms)"
+        head += "\n    "
+        lines.append(head + _clip(log.message or "", budget - len(head) - 1))
+    return "\n".join(lines)
+
+
+def format_history_buckets(title: str, buckets, bucket_seconds: int) -> str:
+    """Condensed /history page: one line per time bucket."""
+    if not buckets:
+        return f"<b>{escape(title)}</b>\n\nNo history recorded."
+
+    stamp = "%Y-%m-%d %H:%M" if bucket_seconds < 86400 else "%Y-%m-%d"
+    lines = [f"<b>{escape(title)}</b>", ""]
+    for start, total, ok, warning, critical, avg_ms in buckets:
+        if critical:
+            icon = STATUS_ICONS[CheckStatus.CRITICAL]
+        elif warning:
+            icon = STATUS_ICONS[CheckStatus.WARNING]
+        else:
+            icon = STATUS_ICONS[CheckStatus.OK]
+        moment = datetime.fromtimestamp(start, timezone.utc)
+        line = f"{icon} <code>{moment:{stamp}}</code> {ok}/{total} OK"
+        if warning:
+            line += f", {warning} warning"
+        if critical:
+            line += f", {critical} critical"
+        if avg_ms:
+            line += f", avg {avg_ms:.0f}ms"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _percent(value: float | None) -> str:
+    if value is None:
+        return "\u2014"
+    return "100%" if value == 1 else f"{value * 100:.2f}%"
+
+
+def format_uptime(
+    windows: Iterable[str],
+    tasks: list[tuple[str, list[float | None], list[tuple[str, list[float | None]]]]],
+) -> tuple[str, ...]:
+    """/uptime pages; ``tasks`` holds (display name, availability per window,
+    [(check name, availability per window)])."""
+    header = f"<b>Uptime</b> ({' / '.join(windows)})"
+    if not tasks:
+        return (f"{header}\n\nNo results recorded yet.",)
+
+    blocks = [header]
+    for display_name, overall, checks in tasks:
+        lines = [f"\n<b>{escape(display_name)}</b>: {' / '.join(map(_percent, overall))}"]
+        for check_name, values in checks:
+            lines.append(f"  \u2022 {escape(check_name)}: {' / '.join(map(_percent, values))}")
+        blocks.append("\n".join(lines))
+    return tuple(chunk_blocks(blocks))
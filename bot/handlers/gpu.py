@@ -5,6 +5,8 @@ from aiogram.types import Message
 from bot.checks.gpu_check import GPUCheck
 from bot.db.models import User
 from bot.formatters.telegram import format_gpu_report
+from bot.metrics.instruments import record_gpus
+from bot.metrics.timing import phase_timer
 
 router = Router()
 
@@ -12,6 +14,8 @@ router = Router()
 @router.message(Command("gpu"))
 async def cmd_gpu(message: Message, db_user: User):
     check = GPUCheck()
-    result = await check.execute()
+    with phase_timer("checks", "gpu"):
+        result = await check.execute()
+    record_gpus(result)
     text = format_gpu_report(result)
     await message.answer(text, parse_mode="HTML")
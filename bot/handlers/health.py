@@ -1,56 +1,114 @@
+from collections import OrderedDict
+
 from aiogram import F, Router
+from aiogram.exceptions import TelegramBadRequest
 from aiogram.filters import Command
-from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Message
+from aiogram.types import CallbackQuery, InlineKeyboardMarkup, Message
 
 from bot.db.models import User
-from bot.formatters.telegram import format_status_report, format_task_detail
+from bot.formatters.telegram import format_task_detail, render_status_pages
+from bot.handlers.keyboards import (
+    status_keyboard,
+    status_pager_keyboard,
+    task_detail_keyboard,
+    task_picker_keyboard,
+)
 from bot.tasks.registry import TaskRegistry
 
 router = Router()
 
+# Registries with more checks than this get the compact summary by default
+SUMMARY_THRESHOLD = 40
+MAX_PAGED_MESSAGES = 256
+
+# Last rendered /status pages per message: (chat_id, message_id) -> (summary mode, pages)
+_status_pages: OrderedDict[tuple[int, int], tuple[bool, tuple[str, ...]]] = OrderedDict()
+
+
+def _remember_pages(message: Message, summary: bool, pages: tuple[str, ...]):
+    key = (message.chat.id, message.message_id)
+    _status_pages[key] = (summary, pages)
+    _status_pages.move_to_end(key)
+    if len(_status_pages) > MAX_PAGED_MESSAGES:
+        _status_pages.popitem(last=False)
+
+
+def _page_keyboard(
+    task_registry: TaskRegistry, page: int, total: int
+) -> InlineKeyboardMarkup:
+    if total == 1:
+        return status_keyboard(task_registry)
+    return status_pager_keyboard(task_registry, page, total)
+
+
+async def _render_status(
+    task_registry: TaskRegistry, summary: bool | None = None
+) -> tuple[bool, tuple[str, ...]]:
+    reports = await task_registry.run_all_checks()
+    if summary is None:
+        summary = sum(len(r.checks) for r in reports.values()) > SUMMARY_THRESHOLD
+    return summary, render_status_pages(reports, summary=summary)
+
+
+async def _edit(message: Message, text: str, keyboard: InlineKeyboardMarkup):
+    try:
+        await message.edit_text(text, parse_mode="HTML", reply_markup=keyboard)
+    except TelegramBadRequest as e:
+        # Refreshing an unchanged report is not an error
+        if "message is not modified" not in e.message:
+            raise
+
 
-def _status_keyboard(task_registry: TaskRegistry) -> InlineKeyboardMarkup:
-    rows = []
-    for task in task_registry.all():
-        rows.append([InlineKeyboardButton(
-            text=f"\U0001f50d {task.display_name}",
-            callback_data=f"check:task:{task.name}",
-        )])
-    rows.append([InlineKeyboardButton(text="\U0001f504 Refresh", callback_data="status:refresh")])
-    return InlineKeyboardMarkup(inline_keyboard=rows)
+async def _send_status(message: Message, task_registry: TaskRegistry, summary: bool | None = None):
+    summary, pages = await _render_status(task_registry, summary)
+    sent = await message.answer(
+        pages[0], parse_mode="HTML", reply_markup=_page_keyboard(task_registry, 0, len(pages))
+    )
+    _remember_pages(sent, summary, pages)
 
 
 @router.message(Command("status"))
 async def cmd_status(message: Message, db_user: User, task_registry: TaskRegistry):
-    reports = await task_registry.run_all_checks()
-    text = format_status_report(reports)
-    await message.answer(text, parse_mode="HTML", reply_markup=_status_keyboard(task_registry))
+    args = message.text.split(maxsplit=1)
+    mode = args[1].strip().lower() if len(args) > 1 else ""
+    await _send_status(message, task_registry, {"short": True, "full": False}.get(mode))
 
 
 @router.callback_query(F.data == "status:refresh")
 async def cb_status_refresh(callback: CallbackQuery, task_registry: TaskRegistry):
-    reports = await task_registry.run_all_checks()
-    text = format_status_report(reports)
-    await callback.message.edit_text(
-        text, parse_mode="HTML", reply_markup=_status_keyboard(task_registry),
-    )
+    entry = _status_pages.get((callback.message.chat.id, callback.message.message_id))
+    summary, pages = await _render_status(task_registry, entry[0] if entry else None)
+    _remember_pages(callback.message, summary, pages)
+    await _edit(callback.message, pages[0], _page_keyboard(task_registry, 0, len(pages)))
     await callback.answer("Updated")
 
 
+@router.callback_query(F.data.startswith("status:page:"))
+async def cb_status_page(callback: CallbackQuery, task_registry: TaskRegistry):
+    entry = _status_pages.get((callback.message.chat.id, callback.message.message_id))
+    page = int(callback.data.rsplit(":", 1)[1])
+    if entry is None or page >= len(entry[1]):
+        await callback.answer("Report expired, press Refresh", show_alert=True)
+        return
+
+    pages = entry[1]
+    await _edit(callback.message, pages[page], _page_keyboard(task_registry, page, len(pages)))
+    await callback.answer()
+
+
+@router.callback_query(F.data == "status:noop")
+async def cb_status_noop(callback: CallbackQuery):
+    await callback.answer()
+
+
 @router.message(Command("check"))
 async def cmd_check(message: Message, db_user: User, task_registry: TaskRegistry):
     args = message.text.split(maxsplit=1)
     if len(args) < 2:
-        rows = []
-        for task in task_registry.all():
-            rows.append([InlineKeyboardButton(
-                text=f"\U0001f50d {task.display_name}",
-                callback_data=f"check:task:{task.name}",
-            )])
         await message.answer(
             "<b>Выберите задачу для проверки:</b>",
             parse_mode="HTML",
-            reply_markup=InlineKeyboardMarkup(inline_keyboard=rows),
+            reply_markup=task_picker_keyboard(task_registry),
         )
         return
 
@@ -62,12 +120,7 @@ async def cmd_check(message: Message, db_user: User, task_registry: TaskRegistry
 
     report = await task.run_health_checks()
     text = format_task_detail(report)
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [
-            InlineKeyboardButton(text="\U0001f504 Refresh", callback_data=f"check:task:{task_name}"),
-            InlineKeyboardButton(text="\U0001f4ca Status", callback_data="menu:status"),
-        ],
-    ])
+    keyboard = task_detail_keyboard(task_registry, task_name)
     await message.answer(text, parse_mode="HTML", reply_markup=keyboard)
 
 
@@ -81,12 +134,7 @@ async def cb_check_task(callback: CallbackQuery, task_registry: TaskRegistry):
 
     report = await task.run_health_checks()
     text = format_task_detail(report)
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [
-            InlineKeyboardButton(text="\U0001f504 Refresh", callback_data=f"check:task:{task_name}"),
-            InlineKeyboardButton(text="\U0001f4ca Status", callback_data="menu:status"),
-        ],
-    ])
+    keyboard = task_detail_keyboard(task_registry, task_name)
     try:
         await callback.message.edit_text(text, parse_mode="HTML", reply_markup=keyboard)
     except Exception:
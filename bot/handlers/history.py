@@ -0,0 +1,149 @@
+import html
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from aiogram import F, Router
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.filters import Command
+from aiogram.types import CallbackQuery, InlineKeyboardMarkup, Message
+
+from bot.db.models import User
+from bot.db.queries import (
+    get_health_log_buckets,
+    get_latest_health_log_time,
+    get_recent_health_logs,
+)
+from bot.formatters.telegram import format_history_buckets, format_history_page
+from bot.handlers.keyboards import history_keyboard
+from bot.tasks.registry import TaskRegistry
+
+router = Router()
+
+PAGE_SIZE = 15
+# Condensed view: one line per hour, a day per page
+BUCKET_SECONDS = 3600
+BUCKETS_PER_PAGE = 24
+# Rendered pages kept per chat; the cursors of all visited pages are kept
+CACHED_PAGES = 8
+MAX_HISTORY_CHATS = 256
+
+
+@dataclass
+class _HistoryView:
+    task_name: str
+    check_name: str | None
+    title: str
+    condensed: bool = False
+    # Keyset cursor each page starts after; None for the newest page
+    cursors: list = field(default_factory=lambda: [None])
+    # page -> (text, has older page)
+    pages: OrderedDict[int, tuple[str, bool]] = field(default_factory=OrderedDict)
+
+    def reset(self):
+        self.cursors = [None]
+        self.pages.clear()
+
+
+# Open /history per chat: paging back and forth is served from here
+_views: OrderedDict[int, _HistoryView] = OrderedDict()
+
+
+def _remember_view(chat_id: int, view: _HistoryView):
+    _views[chat_id] = view
+    _views.move_to_end(chat_id)
+    if len(_views) > MAX_HISTORY_CHATS:
+        _views.popitem(last=False)
+
+
+def _bucket_end(moment: datetime) -> datetime:
+    """Start of the bucket after the one containing ``moment`` (naive UTC)."""
+    epoch = moment.replace(tzinfo=timezone.utc).timestamp()
+    end = (int(epoch) // BUCKET_SECONDS + 1) * BUCKET_SECONDS
+    return datetime.fromtimestamp(end, timezone.utc).replace(tzinfo=None)
+
+
+async def _detailed_page(session, view: _HistoryView, cursor) -> tuple[str, tuple | None]:
+    logs = await get_recent_health_logs(
+        session, view.task_name, PAGE_SIZE + 1, view.check_name, before=cursor
+    )
+    page, more = logs[:PAGE_SIZE], len(logs) > PAGE_SIZE
+    text = format_history_page(view.title, page, show_check=view.check_name is None)
+    return text, (page[-1].checked_at, page[-1].id) if more else None
+
+
+async def _condensed_page(session, view: _HistoryView, cursor) -> tuple[str, datetime | None]:
+    # Pages end at the newest bucket with data, so gaps (bot offline) are skipped
+    latest = await get_latest_health_log_time(session, view.task_name, view.check_name, cursor)
+    if latest is None:
+        return format_history_buckets(view.title, [], BUCKET_SECONDS), None
+    end = _bucket_end(latest)
+    start = end - timedelta(seconds=BUCKET_SECONDS * BUCKETS_PER_PAGE)
+    buckets = await get_health_log_buckets(
+        session, view.task_name, start, end, BUCKET_SECONDS, view.check_name
+    )
+    more = await get_latest_health_log_time(session, view.task_name, view.check_name, start)
+    return format_history_buckets(view.title, buckets, BUCKET_SECONDS), start if more else None
+
+
+async def _show(session, view: _HistoryView, page: int) -> tuple[str, InlineKeyboardMarkup]:
+    entry = view.pages.get(page)
+    if entry is None:
+        fetch = _condensed_page if view.condensed else _detailed_page
+        text, cursor = await fetch(session, view, view.cursors[page])
+        if cursor is not None and len(view.cursors) == page + 1:
+            view.cursors.append(cursor)
+        entry = view.pages[page] = (text, cursor is not None)
+        if len(view.pages) > CACHED_PAGES:
+            view.pages.popitem(last=False)
+    else:
+        view.pages.move_to_end(page)
+    text, has_next = entry
+    return text, history_keyboard(page, has_next, view.condensed)
+
+
+@router.message(Command("history"))
+async def cmd_history(message: Message, db_user: User, session, task_registry: TaskRegistry):
+    args = message.text.split(maxsplit=2)
+    if len(args) < 2:
+        await message.answer("Usage: /history &lt;task&gt; [check]", parse_mode="HTML")
+        return
+
+    task_name = args[1].strip()
+    task = task_registry.get(task_name)
+    if not task:
+        await message.answer(
+            f"Task <code>{html.escape(task_name)}</code> not found.", parse_mode="HTML"
+        )
+        return
+
+    check_name = args[2].strip() if len(args) > 2 else None
+    title = f"History: {task.display_name}" + (f" / {check_name}" if check_name else "")
+    view = _HistoryView(task_name, check_name, title)
+    _remember_view(message.chat.id, view)
+    text, keyboard = await _show(session, view, 0)
+    await message.answer(text, parse_mode="HTML", reply_markup=keyboard)
+
+
+@router.callback_query(F.data.startswith("history:"))
+async def cb_history(callback: CallbackQuery, session):
+    view = _views.get(callback.message.chat.id)
+    action = callback.data.split(":")
+    page = int(action[2]) if action[1] == "page" else 0
+    if view is None or page >= len(view.cursors):
+        await callback.answer("History expired, run /history again", show_alert=True)
+        return
+
+    if action[1] == "mode":
+        view.condensed = not view.condensed
+        view.reset()
+    elif action[1] == "refresh":
+        view.reset()
+    text, keyboard = await _show(session, view, page)
+    try:
+        await callback.message.edit_text(text, parse_mode="HTML", reply_markup=keyboard)
+    except TelegramBadRequest as e:
+        # Refresh with no new rows renders the same page
+        if "message is not modified" not in e.message:
+            raise
+    await callback.answer()
@@ -0,0 +1,141 @@
+"""Inline keyboards shared by handlers.
+
+Static keyboards are built once at import. Registry-dependent keyboards are
+cached per registry and rebuilt only when ``TaskRegistry.version`` changes.
+"""
+from functools import lru_cache
+from typing import Callable
+from weakref import WeakKeyDictionary
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from bot.tasks.registry import TaskRegistry
+
+QUICK_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[
+    [
+        InlineKeyboardButton(text="\U0001f4ca Status", callback_data="menu:status"),
+        InlineKeyboardButton(text="\u2699\ufe0f GPU", callback_data="menu:gpu"),
+    ],
+    [
+        InlineKeyboardButton(text="\U0001f514 Notify", callback_data="menu:notify"),
+        InlineKeyboardButton(text="\U0001f4cb Commands", callback_data="menu:help"),
+    ],
+])
+
+HELP_KEYBOARD = InlineKeyboardMarkup(inline_keyboard=[
+    [
+        InlineKeyboardButton(text="\U0001f4ca Status", callback_data="menu:status"),
+        InlineKeyboardButton(text="\u2699\ufe0f GPU", callback_data="menu:gpu"),
+    ],
+    [
+        InlineKeyboardButton(text="\U0001f514 Notify", callback_data="menu:notify"),
+    ],
+])
+
+_cache: "WeakKeyDictionary[TaskRegistry, tuple[int, dict]]" = WeakKeyDictionary()
+
+
+def _cached(
+    registry: TaskRegistry, key: tuple, build: Callable[[], InlineKeyboardMarkup]
+) -> InlineKeyboardMarkup:
+    entry = _cache.get(registry)
+    if entry is None or entry[0] != registry.version:
+        entry = (registry.version, {})
+        _cache[registry] = entry
+    keyboards = entry[1]
+    keyboard = keyboards.get(key)
+    if keyboard is None:
+        keyboard = keyboards[key] = build()
+    return keyboard
+
+
+def _task_rows(registry: TaskRegistry) -> list[list[InlineKeyboardButton]]:
+    return [
+        [InlineKeyboardButton(
+            text=f"\U0001f50d {task.display_name}",
+            callback_data=f"check:task:{task.name}",
+        )]
+        for task in registry.all()
+    ]
+
+
+def status_keyboard(registry: TaskRegistry) -> InlineKeyboardMarkup:
+    def build():
+        rows = _task_rows(registry)
+        rows.append(
+            [InlineKeyboardButton(text="\U0001f504 Refresh", callback_data="status:refresh")]
+        )
+        return InlineKeyboardMarkup(inline_keyboard=rows)
+
+    return _cached(registry, ("status",), build)
+
+
+def task_picker_keyboard(registry: TaskRegistry) -> InlineKeyboardMarkup:
+    return _cached(
+        registry, ("tasks",), lambda: InlineKeyboardMarkup(inline_keyboard=_task_rows(registry))
+    )
+
+
+def task_detail_keyboard(registry: TaskRegistry, task_name: str) -> InlineKeyboardMarkup:
+    return _cached(registry, ("detail", task_name), lambda: InlineKeyboardMarkup(inline_keyboard=[
+        [
+            InlineKeyboardButton(
+                text="\U0001f504 Refresh", callback_data=f"check:task:{task_name}"
+            ),
+            InlineKeyboardButton(text="\U0001f4ca Status", callback_data="menu:status"),
+        ],
+    ]))
+
+
+def taskinfo_picker_keyboard(registry: TaskRegistry) -> InlineKeyboardMarkup:
+    return _cached(registry, ("taskinfo",), lambda: InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text=task.display_name, callback_data=f"taskinfo:{task.name}")]
+        for task in registry.all()
+    ]))
+
+
+def taskinfo_keyboard(registry: TaskRegistry, task_name: str) -> InlineKeyboardMarkup:
+    return _cached(registry, ("taskinfo", task_name), lambda: InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="\U0001f50d Check", callback_data=f"check:task:{task_name}")],
+    ]))
+
+
+def status_pager_keyboard(registry: TaskRegistry, page: int, total: int) -> InlineKeyboardMarkup:
+    def build():
+        nav = []
+        if page > 0:
+            nav.append(InlineKeyboardButton(text="\u25c0", callback_data=f"status:page:{page - 1}"))
+        # The counter is a label: pressing it only answers the callback
+        nav.append(InlineKeyboardButton(text=f"{page + 1}/{total}", callback_data="status:noop"))
+        if page < total - 1:
+            nav.append(
+                InlineKeyboardButton(text="\u25b6", callback_data=f"status:page:{page + 1}")
+            )
+        rows = _task_rows(registry)
+        rows.append(nav)
+        rows.append(
+            [InlineKeyboardButton(text="\U0001f504 Refresh", callback_data="status:refresh")]
+        )
+        return InlineKeyboardMarkup(inline_keyboard=rows)
+
+    return _cached(registry, ("status", page, total), build)
+
+
+@lru_cache(maxsize=64)
+def history_keyboard(page: int, has_next: bool, condensed: bool) -> InlineKeyboardMarkup:
+    nav = []
+    if page > 0:
+        nav.append(
+            InlineKeyboardButton(text="\u25c0 Newer", callback_data=f"history:page:{page - 1}")
+        )
+    if has_next:
+        nav.append(
+            InlineKeyboardButton(text="Older \u25b6", callback_data=f"history:page:{page + 1}")
+        )
+    mode = "\U0001f4dc Detailed" if condensed else "\U0001f5dc Condensed"
+    rows = [nav] if nav else []
+    rows.append([
+        InlineKeyboardButton(text=mode, callback_data="history:mode"),
+        InlineKeyboardButton(text="\U0001f504 Refresh", callback_data="history:refresh"),
+    ])
+    return InlineKeyboardMarkup(inline_keyboard=rows)
@@ -3,7 +3,10 @@ from aiogram.types import CallbackQuery
 
 from bot.checks.gpu_check import GPUCheck
 from bot.db.models import User
-from bot.formatters.telegram import format_gpu_report, format_status_report
+from bot.formatters.telegram import format_gpu_report
+from bot.metrics.instruments import record_gpus
+from bot.metrics.timing import phase_timer
+from bot.handlers.keyboards import HELP_KEYBOARD
 from bot.tasks.registry import TaskRegistry
 
 router = Router()
@@ -11,18 +14,18 @@ router = Router()
 
 @router.callback_query(F.data == "menu:status")
 async def cb_menu_status(callback: CallbackQuery, db_user: User, task_registry: TaskRegistry):
-    from bot.handlers.health import _status_keyboard
+    from bot.handlers.health import _send_status
 
-    reports = await task_registry.run_all_checks()
-    text = format_status_report(reports)
-    await callback.message.answer(text, parse_mode="HTML", reply_markup=_status_keyboard(task_registry))
+    await _send_status(callback.message, task_registry)
     await callback.answer()
 
 
 @router.callback_query(F.data == "menu:gpu")
 async def cb_menu_gpu(callback: CallbackQuery, db_user: User):
     check = GPUCheck()
-    result = await check.execute()
+    with phase_timer("checks", "gpu"):
+        result = await check.execute()
+    record_gpus(result)
     text = format_gpu_report(result)
     await callback.message.answer(text, parse_mode="HTML")
     await callback.answer()
@@ -32,18 +35,7 @@ async def cb_menu_gpu(callback: CallbackQuery, db_user: User):
 async def cb_menu_help(callback: CallbackQuery, db_user: User):
     from bot.handlers.start import HELP_TEXT
 
-    from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
-
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [
-            InlineKeyboardButton(text="\U0001f4ca Status", callback_data="menu:status"),
-            InlineKeyboardButton(text="\u2699\ufe0f GPU", callback_data="menu:gpu"),
-        ],
-        [
-            InlineKeyboardButton(text="\U0001f514 Notify", callback_data="menu:notify"),
-        ],
-    ])
-    await callback.message.answer(HELP_TEXT, parse_mode="HTML", reply_markup=keyboard)
+    await callback.message.answer(HELP_TEXT, parse_mode="HTML", reply_markup=HELP_KEYBOARD)
     await callback.answer()
 
 
@@ -0,0 +1,143 @@
+from html import escape
+
+from aiogram import Router
+from aiogram.filters import Command
+from aiogram.types import Message
+
+from bot.checks import process
+from bot.db.models import User
+from bot.metrics.instruments import (
+    CHECK_DURATION,
+    CHECKS_IN_FLIGHT,
+    CYCLE_DURATION,
+    CYCLE_LAST_DURATION,
+    DB_WRITE_BACKLOG,
+    HANDLER_LATENCY,
+    HANDLER_PHASE,
+    NOTIFICATIONS_PENDING,
+    SUBPROCESSES_IN_FLIGHT,
+    UPDATES_IN_FLIGHT,
+    UPDATES_PENDING,
+)
+from bot.runtime.leader import LeaderElection
+from bot.runtime.loop import LoopLagMonitor
+from bot.runtime.proc import open_fds, rss_bytes
+
+router = Router()
+
+PHASES = ("checks", "db", "telegram", "other")
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.0f}"
+
+
+def format_latency_report() -> str:
+    totals = sorted(HANDLER_LATENCY.children(), key=lambda item: -item[1].count)
+    if not totals:
+        return "No handler timings recorded yet."
+
+    lines = ["<b>Handler latency</b> (ms)", "<pre>"]
+    lines.append(f"{'update':<22}{'n':>6}{'p50':>7}{'p95':>7}{'p99':>7}")
+    for (update_type,), hist in totals:
+        lines.append(
+            f"{escape(update_type[:22]):<22}{hist.count:>6}{_ms(hist.quantile(0.5)):>7}"
+            f"{_ms(hist.quantile(0.95)):>7}{_ms(hist.quantile(0.99)):>7}"
+        )
+
+    # Mean time per phase for each handler; "other" is recorded on every call
+    handlers: dict[str, dict] = {}
+    for (name, phase), hist in HANDLER_PHASE.children():
+        handlers.setdefault(name, {})[phase] = hist
+    calls = {name: phases["other"].count for name, phases in handlers.items() if "other" in phases}
+    if calls:
+        lines.append("")
+        lines.append(f"{'handler':<22}{'n':>6}{'avg':>7}")
+    for name in sorted(calls, key=lambda name: -calls[name]):
+        phases, count = handlers[name], calls[name]
+        total = sum(hist.sum for hist in phases.values())
+        lines.append(f"{escape(name[:22]):<22}{count:>6}{_ms(total / count):>7}")
+        split = [
+            f"{phase} {_ms(phases[phase].sum / count)}"
+            for phase in PHASES
+            if phase in phases and phases[phase].count
+        ]
+        lines.append("  avg: " + ", ".join(split))
+    lines.append("</pre>")
+    return "\n".join(lines)
+
+
+def format_perf_report(
+    loop_monitor: LoopLagMonitor | None = None,
+    leader: LeaderElection | None = None,
+) -> str:
+    """Runtime internals from in-memory stats; never runs checks."""
+    cycles = CYCLE_DURATION.labels()
+    avg_cycle = cycles.sum / cycles.count if cycles.count else 0.0
+    rss = rss_bytes()
+    fds = open_fds()
+    procs = process.get_runner().stats()
+
+    lines = ["<b>Runtime</b>", "<pre>"]
+    if leader is not None:
+        role = f"leader (term {leader.term})" if leader.is_leader else "follower"
+        lines.append(f"Role         {role}  {escape(leader.holder)}")
+    if loop_monitor is not None:
+        lines.append(
+            f"Loop lag     last {_ms(loop_monitor.last_lag)}ms  "
+            f"avg {_ms(loop_monitor.avg_lag)}ms  max {_ms(loop_monitor.max_lag)}ms"
+            f"  stalls {loop_monitor.stalls}"
+        )
+    lines.extend([
+        f"Cycle        last {CYCLE_LAST_DURATION.value:.2f}s  avg {avg_cycle:.2f}s"
+        f"  (n={cycles.count})",
+        f"In flight    checks {CHECKS_IN_FLIGHT.value:.0f}"
+        f"  subprocesses {SUBPROCESSES_IN_FLIGHT.value:.0f}",
+        f"Processes    alive {procs['alive']}  spawned {procs['spawned']}"
+        f"  killed {procs['killed']}  joined {procs['deduplicated']}",
+        f"DB backlog   {DB_WRITE_BACKLOG.value:.0f}",
+        f"Notify queue {NOTIFICATIONS_PENDING.value:.0f}",
+        f"Updates      pending {UPDATES_PENDING.value:.0f}"
+        f"  in flight {UPDATES_IN_FLIGHT.value:.0f}",
+        f"RSS          {rss / 1024 / 1024:.1f} MB" if rss is not None else "RSS          n/a",
+        f"Open FDs     {fds}" if fds is not None else "Open FDs     n/a",
+        "</pre>",
+    ])
+
+    if loop_monitor is not None and loop_monitor.slow_callbacks:
+        lines.extend(["<b>Slow callbacks</b>", "<pre>"])
+        for handle, seconds in loop_monitor.slow_callbacks:
+            lines.append(f"{_ms(seconds):>6}ms {escape(handle[:60])}")
+        lines.append("</pre>")
+
+    checks = sorted(CHECK_DURATION.children())
+    if checks:
+        lines.extend(["<b>Checks</b> (p50 / p95 ms)", "<pre>"])
+        for (task_name, check_name), hist in checks:
+            label = f"{task_name}/{check_name}"[:28]
+            lines.append(
+                f"{escape(label):<28} {_ms(hist.quantile(0.5)):>6} / {_ms(hist.quantile(0.95)):>6}"
+            )
+        lines.append("</pre>")
+    return "\n".join(lines)
+
+
+@router.message(Command("perf"))
+async def cmd_perf(
+    message: Message,
+    db_user: User,
+    loop_monitor: LoopLagMonitor | None = None,
+    leader: LeaderElection | None = None,
+):
+    if not db_user.is_admin:
+        await message.answer("Only admins can view performance stats.")
+        return
+    await message.answer(format_perf_report(loop_monitor, leader), parse_mode="HTML")
+
+
+@router.message(Command("latency"))
+async def cmd_latency(message: Message, db_user: User):
+    if not db_user.is_admin:
+        await message.answer("Only admins can view performance stats.")
+        return
+    await message.answer(format_latency_report(), parse_mode="HTML")
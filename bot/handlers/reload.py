@@ -0,0 +1,40 @@
+from html import escape
+
+from aiogram import Router
+from aiogram.filters import Command
+from aiogram.types import Message
+
+from bot.db.models import User
+from bot.tasks.loader import ConfigError
+from bot.tasks.reload import ConfigReloader
+
+router = Router()
+
+
+@router.message(Command("reload"))
+async def cmd_reload(
+    message: Message, db_user: User, config_reloader: ConfigReloader | None = None
+):
+    if not db_user.is_admin:
+        await message.answer("Only admins can reload the configuration.")
+        return
+    if config_reloader is None:
+        await message.answer("No task config file (TASKS_CONFIG_PATH) configured.")
+        return
+
+    try:
+        diff = await config_reloader.reload()
+    except ConfigError as e:
+        await message.answer(
+            "\u274c Reload failed, keeping the current config:\n"
+            f"<pre>{escape(str(e)[:1000])}</pre>",
+            parse_mode="HTML",
+        )
+        return
+
+    lines = [f"\u2705 Config reloaded: {diff.summary()}"]
+    sections = (("Added", diff.added), ("Removed", diff.removed), ("Changed", diff.changed))
+    for label, names in sections:
+        if names:
+            lines.append(f"<b>{label}:</b> {escape(', '.join(names))}")
+    await message.answer("\n".join(lines), parse_mode="HTML")
@@ -1,8 +1,9 @@
 from aiogram import Router
 from aiogram.filters import Command
-from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup, Message
+from aiogram.types import Message
 
 from bot.db.models import User
+from bot.handlers.keyboards import HELP_KEYBOARD, QUICK_KEYBOARD
 
 router = Router()
 
@@ -10,8 +11,10 @@ HELP_TEXT = """\
 <b>Server Monitor Bot</b>
 
 <b>Мониторинг:</b>
-/status — Статус всех задач
+/status [short|full] — Статус всех задач
 /check — Детальная проверка задачи
+/history &lt;task&gt; [check] — История проверок
+/uptime [task] — Доступность за 24ч / 7д / 30д
 /gpu — Состояние GPU (nvidia-smi)
 
 <b>Задачи и настройки:</b>
@@ -22,20 +25,10 @@ HELP_TEXT = """\
 <b>Админ:</b>
 /adduser &lt;telegram_id&gt; — Добавить пользователя
 /removeuser &lt;telegram_id&gt; — Удалить пользователя
-/users — Список пользователей"""
-
-
-def _quick_keyboard() -> InlineKeyboardMarkup:
-    return InlineKeyboardMarkup(inline_keyboard=[
-        [
-            InlineKeyboardButton(text="\U0001f4ca Status", callback_data="menu:status"),
-            InlineKeyboardButton(text="\u2699\ufe0f GPU", callback_data="menu:gpu"),
-        ],
-        [
-            InlineKeyboardButton(text="\U0001f514 Notify", callback_data="menu:notify"),
-            InlineKeyboardButton(text="\U0001f4cb Commands", callback_data="menu:help"),
-        ],
-    ])
+/users — Список пользователей
+/latency — Задержки обработчиков (p50/p95/p99)
+/perf — Внутренние метрики процесса
+/reload — Перечитать конфигурацию задач"""
 
 
 @router.message(Command("start"))
@@ -44,7 +37,7 @@ async def cmd_start(message: Message, db_user: User):
         f"Hello, <b>{db_user.full_name}</b>!\n\n"
         "<b>Server Monitor Bot</b> — мониторинг инфраструктуры.",
         parse_mode="HTML",
-        reply_markup=_quick_keyboard(),
+        reply_markup=QUICK_KEYBOARD,
     )
 
 
@@ -53,13 +46,5 @@ async def cmd_help(message: Message, db_user: User):
     await message.answer(
         HELP_TEXT,
         parse_mode="HTML",
-        reply_markup=InlineKeyboardMarkup(inline_keyboard=[
-            [
-                InlineKeyboardButton(text="\U0001f4ca Status", callback_data="menu:status"),
-                InlineKeyboardButton(text="\u2699\ufe0f GPU", callback_data="menu:gpu"),
-            ],
-            [
-                InlineKeyboardButton(text="\U0001f514 Notify", callback_data="menu:notify"),
-            ],
-        ]),
+        reply_markup=HELP_KEYBOARD,
     )
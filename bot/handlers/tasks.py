@@ -1,8 +1,13 @@
 from aiogram import F, Router
 from aiogram.filters import Command
-from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Message
+from aiogram.types import CallbackQuery, Message
 
 from bot.db.models import User
+from bot.handlers.keyboards import (
+    task_picker_keyboard,
+    taskinfo_keyboard,
+    taskinfo_picker_keyboard,
+)
 from bot.tasks.registry import TaskRegistry
 
 router = Router()
@@ -20,17 +25,10 @@ async def cmd_tasks(message: Message, db_user: User, task_registry: TaskRegistry
         lines.append(f"\u2022 <code>{t.name}</code> — {t.display_name}")
         lines.append(f"  <i>{t.description}</i>")
 
-    rows = []
-    for t in tasks:
-        rows.append([InlineKeyboardButton(
-            text=f"\U0001f50d {t.display_name}",
-            callback_data=f"check:task:{t.name}",
-        )])
-
     await message.answer(
         "\n".join(lines),
         parse_mode="HTML",
-        reply_markup=InlineKeyboardMarkup(inline_keyboard=rows),
+        reply_markup=task_picker_keyboard(task_registry),
     )
 
 
@@ -38,16 +36,10 @@ async def cmd_tasks(message: Message, db_user: User, task_registry: TaskRegistry
 async def cmd_taskinfo(message: Message, db_user: User, task_registry: TaskRegistry):
     args = message.text.split(maxsplit=1)
     if len(args) < 2:
-        rows = []
-        for task in task_registry.all():
-            rows.append([InlineKeyboardButton(
-                text=task.display_name,
-                callback_data=f"taskinfo:{task.name}",
-            )])
         await message.answer(
             "<b>Выберите задачу:</b>",
             parse_mode="HTML",
-            reply_markup=InlineKeyboardMarkup(inline_keyboard=rows),
+            reply_markup=taskinfo_picker_keyboard(task_registry),
         )
         return
 
@@ -78,9 +70,7 @@ async def cb_taskinfo(callback: CallbackQuery, task_registry: TaskRegistry):
         f"Name: <code>{task.name}</code>",
         f"Description: {task.description}",
     ]
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="\U0001f50d Check", callback_data=f"check:task:{task.name}")],
-    ])
+    keyboard = taskinfo_keyboard(task_registry, task.name)
     try:
         await callback.message.edit_text("\n".join(lines), parse_mode="HTML", reply_markup=keyboard)
     except Exception:
@@ -0,0 +1,51 @@
+from aiogram import Router
+from aiogram.filters import Command
+from aiogram.types import Message
+
+from bot.db.models import User
+from bot.db.queries import UptimeTotals, get_uptime_counters
+from bot.formatters.telegram import format_uptime
+from bot.notifications.uptime import WINDOWS, availability
+from bot.tasks.registry import TaskRegistry
+
+router = Router()
+
+
+def _sum(totals: list[UptimeTotals]) -> UptimeTotals:
+    if not totals:
+        return (0, 0, 0.0, 0.0)
+    return tuple(sum(values) for values in zip(*totals, strict=True))
+
+
+@router.message(Command("uptime"))
+async def cmd_uptime(message: Message, db_user: User, session, task_registry: TaskRegistry):
+    args = message.text.split(maxsplit=1)
+    task_name = args[1].strip() if len(args) > 1 else None
+
+    # One row per check and window, whatever the length of the history
+    windows = list(WINDOWS.values())
+    checks: dict[str, dict[str, dict[int, UptimeTotals]]] = {}
+    for counter in await get_uptime_counters(session, task_name):
+        if counter.window in windows:
+            checks.setdefault(counter.task_name, {}).setdefault(counter.check_name, {})[
+                counter.window
+            ] = (counter.results, counter.failures, counter.up_seconds, counter.down_seconds)
+
+    tasks = []
+    for name, by_check in checks.items():
+        task = task_registry.get(name)
+        rows = [
+            (check, [availability(totals.get(w, (0, 0, 0.0, 0.0))) for w in windows])
+            for check, totals in by_check.items()
+        ]
+        # The task as a whole: the share of all its checks' time that was up
+        overall = [
+            availability(_sum([t[w] for t in by_check.values() if w in t])) for w in windows
+        ]
+        tasks.append((task.display_name if task else name, overall, rows))
+
+    if task_name and not tasks and not task_registry.get(task_name):
+        await message.answer(f"Task <code>{task_name}</code> not found.", parse_mode="HTML")
+        return
+    for page in format_uptime(WINDOWS, tasks):
+        await message.answer(page, parse_mode="HTML")
@@ -0,0 +1,179 @@
+"""Application metrics, updated where the values are produced."""
+from bot.checks.base import CheckStatus, HealthCheckResult
+from bot.metrics.core import Counter, Gauge, Histogram
+
+STATUS_CODES = {
+    CheckStatus.OK: 0,
+    CheckStatus.WARNING: 1,
+    CheckStatus.CRITICAL: 2,
+    CheckStatus.UNKNOWN: 3,
+}
+
+# ── Checks ───────────────────────────────────────────────────────────────────
+
+CHECK_STATUS = Gauge(
+    "monitor_check_status",
+    "Last check status (0=ok, 1=warning, 2=critical, 3=unknown)",
+    ("task", "check"),
+)
+CHECK_RESPONSE_TIME = Gauge(
+    "monitor_check_response_time_seconds",
+    "Response time reported by the last check run",
+    ("task", "check"),
+)
+CHECK_DURATION = Histogram(
+    "monitor_check_duration_seconds",
+    "Wall time of check execution",
+    ("task", "check"),
+)
+CHECKS_IN_FLIGHT = Gauge("monitor_checks_in_flight", "Checks currently executing")
+SUBPROCESSES_IN_FLIGHT = Gauge(
+    "monitor_subprocesses_in_flight", "Check subprocesses currently running"
+)
+SUBPROCESSES_SPAWNED = Counter("monitor_subprocesses_spawned_total", "Check subprocesses started")
+SUBPROCESSES_KILLED = Counter(
+    "monitor_subprocesses_killed_total", "Check process groups killed on timeout or cancel"
+)
+CHECK_INTERVAL = Gauge(
+    "monitor_check_interval_seconds", "Current adaptive polling interval", ("task", "check")
+)
+CHECK_BREAKER_OPEN = Gauge(
+    "monitor_check_breaker_open", "1 while the check's circuit breaker is open", ("check",)
+)
+CHECK_RUNS = Counter(
+    "monitor_check_runs_total",
+    "Check executions by resulting status",
+    ("task", "check", "status"),
+)
+
+# ── GPU ──────────────────────────────────────────────────────────────────────
+
+GPU_UTILIZATION = Gauge("monitor_gpu_utilization_percent", "GPU utilization", ("gpu", "name"))
+GPU_MEMORY_USED = Gauge("monitor_gpu_memory_used_bytes", "GPU memory used", ("gpu", "name"))
+GPU_MEMORY_TOTAL = Gauge("monitor_gpu_memory_total_bytes", "GPU memory total", ("gpu", "name"))
+GPU_TEMPERATURE = Gauge("monitor_gpu_temperature_celsius", "GPU temperature", ("gpu", "name"))
+
+# ── Remote agents ────────────────────────────────────────────────────────────
+
+AGENT_PUSHES = Counter(
+    "monitor_agent_pushes_total",
+    "Batches pushed by agents (accepted or duplicate)",
+    ("node", "outcome"),
+)
+AGENT_BATCHES_LOST = Counter(
+    "monitor_agent_batches_lost_total", "Sequence numbers skipped by agent pushes", ("node",)
+)
+AGENT_UP = Gauge("monitor_agent_up", "1 while the node's agent heartbeat is current", ("node",))
+
+# ── Monitoring loop and notifications ────────────────────────────────────────
+
+CYCLE_DURATION = Histogram(
+    "monitor_cycle_duration_seconds",
+    "Duration of a full monitoring cycle (checks, logs, notifications)",
+)
+CYCLE_LAST_DURATION = Gauge(
+    "monitor_cycle_last_duration_seconds", "Duration of the most recent monitoring cycle"
+)
+DB_WRITE_BACKLOG = Gauge(
+    "monitor_db_write_backlog", "Task reports waiting to be written to the health log"
+)
+NOTIFICATIONS_PENDING = Gauge(
+    "monitor_notifications_pending", "Notifications queued and not yet sent"
+)
+NOTIFICATIONS_SENT = Counter(
+    "monitor_notifications_sent_total", "Notifications delivered", ("task", "kind")
+)
+NOTIFICATIONS_FAILED = Counter(
+    "monitor_notifications_failed_total", "Notifications that failed to send", ("task", "kind")
+)
+UPTIME_DRIFT = Counter(
+    "monitor_uptime_drift_total", "Uptime buckets and counters corrected by the rebuild"
+)
+DB_WRITE_LATENCY = Histogram(
+    "monitor_db_write_seconds",
+    "Latency of database writes",
+    ("operation",),
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+# ── Update handling ──────────────────────────────────────────────────────────
+
+HANDLER_LATENCY = Histogram(
+    "monitor_handler_seconds",
+    "End-to-end handler latency including middlewares",
+    ("update_type",),
+)
+HANDLER_PHASE = Histogram(
+    "monitor_handler_phase_seconds",
+    "Handler time by handler and phase (checks, db, telegram, other)",
+    ("handler", "phase"),
+)
+UPDATE_WAIT = Histogram(
+    "monitor_update_wait_seconds",
+    "Time an update waited in the processor queue",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0),
+)
+UPDATES_PENDING = Gauge("monitor_updates_pending", "Updates queued in the processor")
+UPDATES_IN_FLIGHT = Gauge("monitor_updates_in_flight", "Updates being handled")
+
+# ── Runtime ──────────────────────────────────────────────────────────────────
+
+STARTUP_PHASE = Gauge(
+    "monitor_startup_seconds",
+    "Seconds from process start until a startup phase was reached",
+    ("phase",),
+)
+LOOP_LAG_LAST = Gauge(
+    "monitor_event_loop_lag_last_seconds", "Last measured event-loop scheduling delay"
+)
+LOOP_LAG = Histogram(
+    "monitor_event_loop_lag_seconds",
+    "Event-loop scheduling delay",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+LOOP_STALLS = Counter("monitor_event_loop_stalls_total", "Lag samples above the stall threshold")
+SLOW_CALLBACKS = Counter(
+    "monitor_event_loop_slow_callbacks_total", "Callbacks slower than slow_callback_duration"
+)
+PROCESS_RSS = Gauge("process_resident_memory_bytes", "Resident memory size")
+IS_LEADER = Gauge("monitor_leader", "1 while this instance holds the monitoring lease")
+LEADER_CHANGES = Counter(
+    "monitor_leader_changes_total", "Times this instance gained or lost the lease"
+)
+PROCESS_OPEN_FDS = Gauge("process_open_fds", "Number of open file descriptors")
+
+
+def record_check(task_name: str, result: HealthCheckResult, duration: float):
+    CHECK_STATUS.labels(task_name, result.name).set(STATUS_CODES[result.status])
+    CHECK_RESPONSE_TIME.labels(task_name, result.name).set(result.response_time_ms / 1000)
+    CHECK_DURATION.labels(task_name, result.name).observe(duration)
+    CHECK_RUNS.labels(task_name, result.name, result.status.value).inc()
+    if "gpus" in result.details:
+        record_gpus(result)
+
+
+def forget_checks(removed: list[str], kept: list[str]):
+    """Drop the series of checks a reload removed; keys are "task/check"."""
+    names = {key.partition("/")[2] for key in kept}
+    for key in removed:
+        task_name, _, check_name = key.partition("/")
+        for metric in (CHECK_STATUS, CHECK_RESPONSE_TIME, CHECK_DURATION, CHECK_INTERVAL):
+            metric.remove(task_name, check_name)
+        for status in CheckStatus:
+            CHECK_RUNS.remove(task_name, check_name, status.value)
+        # Breakers are labelled by check name alone, which other tasks may share
+        if check_name not in names:
+            CHECK_BREAKER_OPEN.remove(check_name)
+
+
+def record_gpus(result: HealthCheckResult):
+    for g in result.details.get("gpus", []):
+        labels = (g["index"], g["name"])
+        if g.get("utilization") is not None:
+            GPU_UTILIZATION.labels(*labels).set(g["utilization"])
+        if g.get("memory_used") is not None:
+            GPU_MEMORY_USED.labels(*labels).set(g["memory_used"] * 1024 * 1024)
+        if g.get("memory_total") is not None:
+            GPU_MEMORY_TOTAL.labels(*labels).set(g["memory_total"] * 1024 * 1024)
+        if g.get("temperature") is not None:
+            GPU_TEMPERATURE.labels(*labels).set(g["temperature"])
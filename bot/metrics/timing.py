@@ -0,0 +1,78 @@
+"""Phase timing: attributes time spent in checks, DB and Telegram API calls.
+
+``timed``/``phase_timer`` observe every call into PHASE_CALLS and, while a
+handler is being instrumented (``collect_phases``), add the elapsed time to
+that handler's per-phase totals. Child tasks share the collector through the
+copied context.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Iterator
+
+from bot.metrics.core import Histogram
+
+PHASE_CALLS = Histogram(
+    "monitor_phase_call_seconds",
+    "Latency of individual check, DB and Telegram API calls",
+    ("phase", "operation"),
+)
+
+_phases: ContextVar[dict[str, float] | None] = ContextVar("handler_phases", default=None)
+# Innermost running phase, so nested calls of the same phase are counted once
+_running: ContextVar[str | None] = ContextVar("running_phase", default=None)
+
+
+def _add(phase: str, outer: str | None, elapsed: float):
+    totals = _phases.get()
+    if totals is not None and outer != phase:
+        totals[phase] = totals.get(phase, 0.0) + elapsed
+
+
+@contextmanager
+def collect_phases() -> Iterator[dict[str, float]]:
+    totals: dict[str, float] = {}
+    token = _phases.set(totals)
+    try:
+        yield totals
+    finally:
+        _phases.reset(token)
+
+
+@contextmanager
+def phase_timer(phase: str, operation: str):
+    outer = _running.get()
+    token = _running.set(phase)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        _running.reset(token)
+        PHASE_CALLS.labels(phase, operation).observe(elapsed)
+        _add(phase, outer, elapsed)
+
+
+def timed(phase: str):
+    """Decorator for coroutine functions; the operation label is the function name."""
+
+    def decorator(func):
+        histogram = PHASE_CALLS.labels(phase, func.__name__)
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            outer = _running.get()
+            token = _running.set(phase)
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                _running.reset(token)
+                histogram.observe(elapsed)
+                _add(phase, outer, elapsed)
+
+        return wrapper
+
+    return decorator
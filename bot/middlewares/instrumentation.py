@@ -0,0 +1,45 @@
+import time
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware
+from aiogram.types import TelegramObject
+
+from bot.metrics.instruments import HANDLER_PHASE
+from bot.metrics.timing import collect_phases, phase_timer
+
+
+class InstrumentationMiddleware(BaseMiddleware):
+    """Records per-handler time split into checks/db/telegram/other phases
+    (the total per update type is HANDLER_LATENCY, recorded by the processor).
+
+    Register as an inner middleware (``dp.message.middleware(...)``) so the
+    resolved handler is available in ``data["handler"]``.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        handler_object = data.get("handler")
+        name = getattr(getattr(handler_object, "callback", None), "__name__", "unknown")
+
+        start = time.perf_counter()
+        with collect_phases() as phases:
+            try:
+                return await handler(event, data)
+            finally:
+                total = time.perf_counter() - start
+                for phase, elapsed in phases.items():
+                    HANDLER_PHASE.labels(name, phase).observe(elapsed)
+                HANDLER_PHASE.labels(name, "other").observe(max(total - sum(phases.values()), 0.0))
+
+
+class TelegramTimingMiddleware(BaseRequestMiddleware):
+    """Times outgoing Bot API calls (``bot.session.middleware(...)``)."""
+
+    async def __call__(self, make_request, bot, method):
+        with phase_timer("telegram", method.__api_method__):
+            return await make_request(bot, method)
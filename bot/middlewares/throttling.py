@@ -0,0 +1,104 @@
+import logging
+import time
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import CallbackQuery, TelegramObject
+
+from bot.config import Settings
+
+logger = logging.getLogger(__name__)
+
+# Forget per-user state after this many idle seconds
+_STATE_TTL = 600
+
+# Callbacks that run health checks; only these are debounced (paging or
+# toggling twice in a row is legitimate)
+DEBOUNCED_PREFIXES = ("status:refresh", "check:task:", "menu:status", "menu:gpu")
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """Debounces repeated check-running taps and enforces a per-user budget.
+
+    Register on ``dp.callback_query``. A tap is answered with a lightweight
+    ``callback.answer`` and dropped when the same user+data is already running
+    or finished less than ``debounce`` seconds ago (for DEBOUNCED_PREFIXES),
+    or when the user's token bucket (``rate_per_minute``, ``burst``) is empty.
+    """
+
+    def __init__(self, settings: Settings, clock: Callable[[], float] = time.monotonic):
+        self.debounce = settings.callback_debounce_seconds
+        self.rate = settings.callback_rate_per_minute / 60
+        self.burst = settings.callback_burst
+        self.clock = clock
+        self._in_flight: set[tuple[int, str]] = set()
+        self._finished: dict[tuple[int, str], float] = {}
+        self._buckets: dict[int, _Bucket] = {}
+        self._last_prune = clock()
+
+        self.debounced = 0
+        self.throttled = 0
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        if not isinstance(event, CallbackQuery):
+            return await handler(event, data)
+
+        now = self.clock()
+        self._prune(now)
+        key = (event.from_user.id, event.data or "")
+
+        debounced = key[1].startswith(DEBOUNCED_PREFIXES)
+        finished = self._finished.get(key)
+        if debounced and (
+            key in self._in_flight or (finished is not None and now - finished < self.debounce)
+        ):
+            self.debounced += 1
+            await event.answer()
+            return None
+
+        if not self._take_token(event.from_user.id, now):
+            self.throttled += 1
+            logger.info("Throttled callback %r from user %d", event.data, event.from_user.id)
+            await event.answer("Too many requests, try again shortly")
+            return None
+
+        if not debounced:
+            return await handler(event, data)
+
+        self._in_flight.add(key)
+        try:
+            return await handler(event, data)
+        finally:
+            self._in_flight.discard(key)
+            self._finished[key] = self.clock()
+
+    def _take_token(self, user_id: int, now: float) -> bool:
+        bucket = self._buckets.get(user_id)
+        if bucket is None:
+            bucket = self._buckets[user_id] = _Bucket(self.burst, now)
+        bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * self.rate)
+        bucket.updated = now
+        if bucket.tokens < 1:
+            return False
+        bucket.tokens -= 1
+        return True
+
+    def _prune(self, now: float):
+        if now - self._last_prune < _STATE_TTL:
+            return
+        self._last_prune = now
+        self._finished = {k: t for k, t in self._finished.items() if now - t < self.debounce}
+        self._buckets = {u: b for u, b in self._buckets.items() if now - b.updated < _STATE_TTL}
@@ -1,14 +1,36 @@
 import asyncio
 import logging
-from datetime import datetime
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
 
 from aiogram import Bot
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 
+from bot.checks import process
 from bot.checks.base import CheckStatus
+from bot.checks.shared import shared_run
 from bot.config import Settings
-from bot.db.queries import get_task_subscribers, is_in_cooldown, log_notification, save_health_log
+from bot.db.queries import (
+    get_last_task_health,
+    get_task_subscribers,
+    is_in_cooldown,
+    log_notification,
+    save_health_logs,
+)
 from bot.formatters.telegram import format_alert, format_recovery
+from bot.metrics.instruments import (
+    CYCLE_DURATION,
+    CYCLE_LAST_DURATION,
+    DB_WRITE_BACKLOG,
+    DB_WRITE_LATENCY,
+    NOTIFICATIONS_FAILED,
+    NOTIFICATIONS_PENDING,
+    NOTIFICATIONS_SENT,
+    forget_checks,
+)
+from bot.notifications.schedule import AdaptiveScheduler
+from bot.notifications.uptime import UptimeTracker
 from bot.tasks.base import TaskHealthReport
 from bot.tasks.registry import TaskRegistry
 
@@ -23,63 +45,218 @@ class NotificationEngine:
         registry: TaskRegistry,
         session_factory: async_sessionmaker[AsyncSession],
         config: Settings,
+        uptime: UptimeTracker | None = None,
     ):
         self.bot = bot
         self.registry = registry
         self.session_factory = session_factory
         self.config = config
+        # Updated with every batch of health logs (see bot.notifications.uptime)
+        self.uptime = uptime
         self._task: asyncio.Task | None = None
+        self._db_ready: Awaitable | None = None
+        self._stopping = asyncio.Event()
+        self._wake = asyncio.Event()
+        self._expedite = False
+        self._resume = False
         # Track previous state for edge-triggered notifications
         self._previous_healthy: dict[str, bool] = {}
+        # Reports not yet written and transitions not yet notified. Entries
+        # are removed only once handled, so a cancelled cycle loses nothing.
+        self._pending_reports: list[tuple[str, TaskHealthReport]] = []
+        self._pending_transitions: list[tuple[str, TaskHealthReport]] = []
+        # Observers of every report produced and of every cycle's duration
+        # (the worker process streams both to the bot process)
+        self.on_report: list[Callable[[TaskHealthReport], None]] = []
+        self.on_cycle: list[Callable[[float], None]] = []
+        self.scheduler = AdaptiveScheduler(
+            base=config.health_check_interval,
+            min_interval=config.check_interval_min,
+            max_interval=config.check_interval_max,
+        )
 
-    async def start(self):
+    async def start(self, db_ready: Awaitable | None = None, resume: bool = False):
+        """Start the loop. Checks begin immediately; DB writes wait for ``db_ready``.
+
+        With ``resume`` (a new leader taking over) transitions are detected
+        against the last logged state instead of starting from scratch.
+        """
+        self._db_ready = db_ready
+        self._stopping.clear()
+        if resume:
+            self._previous_healthy = {}
+            self._resume = True
+        for task in self.registry.all():
+            await task.start_watching(self.check_changed)
+        if self.uptime:
+            await self.uptime.start(db_ready)
         self._task = asyncio.create_task(self._loop())
-        logger.info("Notification engine started (interval=%ds)", self.config.health_check_interval)
+        logger.info(
+            "Notification engine started (interval=%ds, adaptive %d-%ds)",
+            self.config.health_check_interval,
+            self.config.check_interval_min,
+            self.config.check_interval_max,
+        )
+
+    async def stop(self, timeout: float | None = None, flush: bool = True):
+        """Drain: stop scheduling checks, let the running cycle finish within
+        ``timeout`` (else cancel it and kill its processes), then flush.
 
-    async def stop(self):
+        With ``flush=False`` (another instance took over) the cycle is
+        cancelled at once and pending results and alerts are dropped.
+        """
+        if not flush:
+            timeout = 0
+        elif timeout is None:
+            timeout = self.config.shutdown_drain_timeout
+        self._stopping.set()
         if self._task:
-            self._task.cancel()
+            done, _ = await asyncio.wait({self._task}, timeout=timeout)
+            if not done:
+                logger.warning("Health cycle still running after %.1fs, cancelling", timeout)
+                self._task.cancel()
+                try:
+                    await self._task
+                except asyncio.CancelledError:
+                    pass
+            self._task = None
+        for task in self.registry.all():
+            await task.stop_watching()
+        await process.kill_all()
+        if flush:
             try:
-                await self._task
-            except asyncio.CancelledError:
-                pass
+                await self._flush()
+            except Exception:
+                logger.exception("Failed to flush pending results on shutdown")
+        else:
+            # The new leader resumes from the logged state and alerts itself
+            self._pending_reports.clear()
+            self._pending_transitions.clear()
+            DB_WRITE_BACKLOG.set(0)
+        if self.uptime:
+            await self.uptime.stop()
         logger.info("Notification engine stopped")
 
     async def _loop(self):
-        # Wait a bit before first check to let bot initialize
-        await asyncio.sleep(5)
+        delay = self.config.first_check_delay
+        if delay and await self._wait_stopping(delay):
+            return
 
-        while True:
+        while not self._stopping.is_set():
+            start = time.perf_counter()
             try:
                 await self._run_checks_and_notify()
             except Exception:
                 logger.exception("Monitoring loop error")
-            await asyncio.sleep(self.config.health_check_interval)
+            elapsed = time.perf_counter() - start
+            CYCLE_DURATION.observe(elapsed)
+            CYCLE_LAST_DURATION.set(elapsed)
+            for listener in self.on_cycle:
+                listener(elapsed)
+            # At least a second apart, so a task that keeps raising before it
+            # records a result cannot spin the loop
+            if await self._wait_stopping(max(self.scheduler.until_next(), 1.0)):
+                return
+
+    def wake(self, expedite: bool = True):
+        """Wake the loop; with expedite every check runs now, otherwise only
+        those already due."""
+        self._expedite = self._expedite or expedite
+        self._wake.set()
+
+    def check_changed(self, key: str):
+        """A watched check saw a change (e.g. its lock file appeared): run it now."""
+        self.scheduler.discard(key)
+        self.wake(expedite=False)
+
+    def config_reloaded(self, diff):
+        """Forget schedules and series of removed checks; new and changed ones run next."""
+        for key in diff.removed + diff.changed + diff.added:
+            self.scheduler.discard(key)
+        forget_checks(diff.removed, diff.added + diff.changed + diff.unchanged)
+        self.wake(expedite=False)
+
+    async def _wait_stopping(self, seconds: float) -> bool:
+        """Sleep until the next cycle is due or wake() is called; True when stopping."""
+        waiters = [
+            asyncio.ensure_future(self._stopping.wait()),
+            asyncio.ensure_future(self._wake.wait()),
+        ]
+        try:
+            await asyncio.wait(waiters, timeout=seconds, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+        if self._wake.is_set():
+            self._wake.clear()
+            if self._expedite:
+                self._expedite = False
+                self.scheduler.expedite()
+        return self._stopping.is_set()
 
     async def _run_checks_and_notify(self):
-        reports = await self.registry.run_all_checks()
+        with shared_run():
+            for task in self.registry.all():
+                if self._stopping.is_set():
+                    break
+                report = await task.run_scheduled_checks(self.scheduler)
+                if report is not None:
+                    self._pending_reports.append((task.name, report))
+                    DB_WRITE_BACKLOG.set(len(self._pending_reports))
+                    for listener in self.on_report:
+                        listener(report)
+        await self._flush()
+
+    async def _flush(self):
+        """Write buffered health logs in one transaction, then send pending notifications."""
+        if not self._pending_reports and not self._pending_transitions:
+            return
+        if self._db_ready is not None:
+            await self._db_ready
 
         async with self.session_factory() as session:
-            for task_name, report in reports.items():
-                # Save health logs
-                for check in report.checks:
-                    await save_health_log(
-                        session,
-                        task_name=task_name,
-                        check_name=check.name,
-                        status=check.status.value,
-                        message=check.message,
-                        response_time_ms=check.response_time_ms,
-                    )
-
-                # Detect state transition
-                prev_healthy = self._previous_healthy.get(task_name)
-                now_healthy = report.is_healthy
-
-                if prev_healthy is not None and prev_healthy != now_healthy:
-                    await self._send_notifications(session, task_name, report, now_healthy)
-
-                self._previous_healthy[task_name] = now_healthy
+            if self._resume:
+                for task_name, healthy in (await get_last_task_health(session)).items():
+                    self._previous_healthy.setdefault(task_name, healthy)
+                self._resume = False
+            batch = list(self._pending_reports)
+            if batch:
+                # One timestamp for the batch, shared by the logs and uptime counters
+                now = time.time()
+                checked_at = datetime.fromtimestamp(now, timezone.utc)
+                rows = [
+                    {
+                        "task_name": task_name,
+                        "check_name": check.name,
+                        "status": check.status.value,
+                        "message": check.message,
+                        "response_time_ms": check.response_time_ms,
+                        "checked_at": checked_at,
+                    }
+                    for task_name, report in batch
+                    for check in report.checks
+                    if not check.details.get("reused")
+                ]
+                with DB_WRITE_LATENCY.labels("health_log").time():
+                    if self.uptime and rows:
+                        await self.uptime.record(session, rows, now)
+                    await save_health_logs(session, rows)
+                del self._pending_reports[: len(batch)]
+                DB_WRITE_BACKLOG.set(len(self._pending_reports))
+
+                # Detect state transitions
+                for task_name, report in batch:
+                    prev_healthy = self._previous_healthy.get(task_name)
+                    if prev_healthy is not None and prev_healthy != report.is_healthy:
+                        self._pending_transitions.append((task_name, report))
+                    self._previous_healthy[task_name] = report.is_healthy
+
+            while self._pending_transitions:
+                task_name, report = self._pending_transitions[0]
+                # A retry after cancellation skips users already notified:
+                # their notification_log row puts them in cooldown
+                await self._send_notifications(session, task_name, report, report.is_healthy)
+                self._pending_transitions.pop(0)
 
     async def _send_notifications(
         self,
@@ -99,12 +276,27 @@ class NotificationEngine:
             text = format_alert(task_name, report)
             status = "alert"
 
-        for user_id in subscribers:
-            if await is_in_cooldown(session, user_id, task_name, self.config.notification_cooldown):
-                continue
+        unsent = len(subscribers)
+        NOTIFICATIONS_PENDING.inc(unsent)
+        try:
+            for user_id in subscribers:
+                await self._notify_user(session, user_id, task_name, status, text)
+                unsent -= 1
+                NOTIFICATIONS_PENDING.dec()
+        finally:
+            # Cancelled mid-cycle: the retry counts the rest again
+            NOTIFICATIONS_PENDING.dec(unsent)
 
-            try:
-                await self.bot.send_message(user_id, text, parse_mode="HTML")
+    async def _notify_user(
+        self, session: AsyncSession, user_id: int, task_name: str, status: str, text: str
+    ):
+        if await is_in_cooldown(session, user_id, task_name, self.config.notification_cooldown):
+            return
+
+        try:
+            await self.bot.send_message(user_id, text, parse_mode="HTML")
+            NOTIFICATIONS_SENT.labels(task_name, status).inc()
+            with DB_WRITE_LATENCY.labels("notification_log").time():
                 await log_notification(
                     session,
                     user_id=user_id,
@@ -112,6 +304,7 @@ class NotificationEngine:
                     status=status,
                     message=text[:500],
                 )
-                logger.info("Sent %s to user %d for task %s", status, user_id, task_name)
-            except Exception:
-                logger.exception("Failed to send notification to user %d", user_id)
+            logger.info("Sent %s to user %d for task %s", status, user_id, task_name)
+        except Exception:
+            NOTIFICATIONS_FAILED.labels(task_name, status).inc()
+            logger.exception("Failed to send notification to user %d", user_id)
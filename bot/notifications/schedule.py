@@ -0,0 +1,104 @@
+import time
+from typing import Callable
+
+from bot.checks.base import CheckStatus
+from bot.metrics.instruments import CHECK_INTERVAL
+
+# Statuses that count as stable; UNKNOWN covers "not configured"/"not found"
+_STABLE = (CheckStatus.OK, CheckStatus.UNKNOWN)
+
+
+class _State:
+    __slots__ = ("interval", "next_due", "stable_runs", "latency")
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.next_due = 0.0
+        self.stable_runs = 0
+        self.latency: float | None = None
+
+
+class AdaptiveScheduler:
+    """Per-check polling intervals driven by recent results.
+
+    Every check starts at ``base``. After ``stable_runs`` OK results in a row
+    its interval grows by ``growth`` up to ``max_interval``. A WARNING or
+    worse drops it straight to ``min_interval``; a response time well above
+    the check's moving average halves it. With min == max == base this is
+    the old fixed-interval loop.
+    """
+
+    def __init__(
+        self,
+        base: float,
+        min_interval: float,
+        max_interval: float,
+        growth: float = 1.5,
+        stable_runs: int = 5,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.base = min(max(base, min_interval), max_interval)
+        self.growth = growth
+        self.stable_runs = stable_runs
+        self._clock = clock
+        self._states: dict[str, _State] = {}
+
+    def due(self, key: str) -> bool:
+        state = self._states.get(key)
+        return state is None or self._clock() >= state.next_due
+
+    def interval(self, key: str) -> float:
+        state = self._states.get(key)
+        return state.interval if state else self.base
+
+    def record(self, key: str, status: CheckStatus, response_time_ms: float = 0.0) -> float:
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = _State(self.base)
+
+        rising = (
+            state.latency is not None
+            and response_time_ms > 50
+            and response_time_ms > 2 * state.latency
+        )
+        if response_time_ms:
+            state.latency = (
+                response_time_ms if state.latency is None
+                else 0.7 * state.latency + 0.3 * response_time_ms
+            )
+
+        if status not in _STABLE:
+            state.stable_runs = 0
+            state.interval = self.min_interval
+        elif rising:
+            state.stable_runs = 0
+            state.interval = max(state.interval / 2, self.min_interval)
+        else:
+            state.stable_runs += 1
+            if state.stable_runs >= self.stable_runs:
+                state.interval = min(state.interval * self.growth, self.max_interval)
+
+        state.next_due = self._clock() + state.interval
+        task_name, _, check_name = key.partition("/")
+        CHECK_INTERVAL.labels(task_name, check_name).set(state.interval)
+        return state.interval
+
+    def until_next(self) -> float:
+        """Seconds until the earliest check is due."""
+        if not self._states:
+            return self.base
+        now = self._clock()
+        return max(min(s.next_due for s in self._states.values()) - now, 0.0)
+
+    def discard(self, key: str):
+        """Forget a check; it is due again immediately."""
+        self._states.pop(key, None)
+        task_name, _, check_name = key.partition("/")
+        CHECK_INTERVAL.remove(task_name, check_name)
+
+    def expedite(self):
+        """Make every check due now."""
+        for state in self._states.values():
+            state.next_due = 0.0
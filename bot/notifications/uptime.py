@@ -0,0 +1,203 @@
+"""Availability per check from counters kept current as results are logged.
+
+Every logged result adds to its check's hourly bucket (UptimeBucket) and to
+the check's running totals for each window (UptimeCounter). The time since
+the check's previous result counts as up or down by that previous result,
+unless the gap exceeds ``max_gap`` (the monitor was not running). Warnings
+count as up; unknown results (blocked checks) are left out. When the hour
+changes, buckets that left a window are subtracted from its totals, so
+reading availability is one row per check and window whatever the history.
+
+A periodic rebuild recomputes the completed buckets from health_logs and
+rewrites the counters from them, logging any drift it corrects.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from bot.db.queries import (
+    UptimeTotals,
+    add_uptime,
+    get_last_check_results,
+    get_uptime_since,
+    prune_uptime_buckets,
+    replace_uptime_buckets,
+    reset_uptime_counters,
+    slide_uptime,
+    stream_health_logs,
+)
+from bot.metrics.instruments import UPTIME_DRIFT
+
+logger = logging.getLogger(__name__)
+
+BUCKET = 3600
+WINDOWS = {"24h": 86400, "7d": 7 * 86400, "30d": 30 * 86400}
+
+
+def bucket_of(moment: float) -> int:
+    return int(moment) // BUCKET * BUCKET
+
+
+def horizon(bucket: int, window: int) -> int:
+    """Oldest bucket a window ending with ``bucket`` includes."""
+    return bucket + BUCKET - window
+
+
+def _epoch(moment: datetime) -> float:
+    # health_logs.checked_at is naive UTC
+    return moment.replace(tzinfo=timezone.utc).timestamp()
+
+
+def availability(totals: UptimeTotals) -> float | None:
+    """Share of time up, or of results when no interval was measured yet."""
+    results, failures, up_seconds, down_seconds = totals
+    if up_seconds + down_seconds > 0:
+        return up_seconds / (up_seconds + down_seconds)
+    if results:
+        return (results - failures) / results
+    return None
+
+
+@dataclass(slots=True)
+class _Tally:
+    results: int = 0
+    failures: int = 0
+    up_seconds: float = 0.0
+    down_seconds: float = 0.0
+
+    def add(
+        self, previous: tuple[float, str] | None, at: float, status: str, max_gap: float
+    ) -> tuple[float, str]:
+        """Count a result; returns the check's new previous result."""
+        if previous is not None and previous[1] != "unknown" and 0 <= at - previous[0] <= max_gap:
+            if previous[1] == "critical":
+                self.down_seconds += at - previous[0]
+            else:
+                self.up_seconds += at - previous[0]
+        if status != "unknown":
+            self.results += 1
+            self.failures += status == "critical"
+        return at, status
+
+    def totals(self) -> UptimeTotals:
+        return self.results, self.failures, self.up_seconds, self.down_seconds
+
+
+class UptimeTracker:
+    """Maintains the uptime counters; owned by the monitoring loop that logs results."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        max_gap: float = 900.0,
+        rebuild_interval: float = 86400.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.session_factory = session_factory
+        self.max_gap = max_gap
+        self.rebuild_interval = rebuild_interval
+        self._clock = clock
+        # Previous (time, status) per (task, check); loaded on first use
+        self._previous: dict[tuple[str, str], tuple[float, str]] | None = None
+        # Oldest bucket included per window, as last slid
+        self._since: dict[int, int] = {}
+        # Rebuilt buckets and the range they cover, applied by the next record()
+        self._repair: tuple[int, int, dict] | None = None
+        self._rebuilder: asyncio.Task | None = None
+
+    async def start(self, db_ready: Awaitable | None = None):
+        # Another instance may have logged results since we last did
+        self._previous = None
+        self._since = {}
+        if self.rebuild_interval > 0:
+            self._rebuilder = asyncio.create_task(self._rebuild_loop(db_ready))
+
+    async def stop(self):
+        if self._rebuilder:
+            self._rebuilder.cancel()
+            await asyncio.gather(self._rebuilder, return_exceptions=True)
+            self._rebuilder = None
+
+    async def record(self, session: AsyncSession, rows: list[dict], now: float):
+        """Stage counter updates for health log rows checked at ``now``.
+
+        Runs in the caller's transaction, before the rows are inserted; the
+        caller's commit writes both.
+        """
+        if self._previous is None:
+            self._previous = {
+                key: (_epoch(at), status)
+                for key, (at, status) in (await get_last_check_results(session)).items()
+            }
+        tallies: dict[tuple[str, str], _Tally] = {}
+        for row in rows:
+            key = (row["task_name"], row["check_name"])
+            tally = tallies.setdefault(key, _Tally())
+            previous = self._previous.get(key)
+            self._previous[key] = tally.add(previous, now, row["status"], self.max_gap)
+
+        bucket = bucket_of(now)
+        horizons = {window: horizon(bucket, window) for window in WINDOWS.values()}
+        await add_uptime(session, bucket, {k: t.totals() for k, t in tallies.items()}, horizons)
+        for window, oldest in horizons.items():
+            since = self._since.get(window)
+            if since is None:
+                since = await get_uptime_since(session, window) or oldest
+            if since < oldest:
+                await slide_uptime(session, window, since, oldest)
+                if window == max(WINDOWS.values()):
+                    await prune_uptime_buckets(session, oldest)
+            self._since[window] = oldest
+
+        if self._repair is not None:
+            since, before, buckets = self._repair
+            self._repair = None
+            drift = await replace_uptime_buckets(session, since, before, buckets)
+            drift += await reset_uptime_counters(session, horizons)
+            if drift:
+                UPTIME_DRIFT.inc(drift)
+                logger.warning("Uptime rebuild corrected %d bucket(s)/counter(s)", drift)
+            else:
+                logger.info("Uptime rebuild found the counters consistent")
+
+    async def rebuild(self):
+        """Recompute completed buckets from health_logs; the next record() applies them.
+
+        The previous hour is left out as well: results being written now may
+        still belong to it. Logs are read from one max_gap earlier so the
+        first interval of the range is measured as it was when recorded.
+        """
+        now = self._clock()
+        before = bucket_of(now) - BUCKET
+        since = horizon(bucket_of(now), max(WINDOWS.values()))
+        tallies: dict[tuple[str, str, int], _Tally] = {}
+        previous: dict[tuple[str, str], tuple[float, str]] = {}
+        start = datetime.fromtimestamp(since - self.max_gap, timezone.utc).replace(tzinfo=None)
+        end = datetime.fromtimestamp(before, timezone.utc).replace(tzinfo=None)
+        async with self.session_factory() as session:
+            async for task_name, check_name, checked_at, status in stream_health_logs(
+                session, start, end
+            ):
+                at = _epoch(checked_at)
+                key = (task_name, check_name)
+                if at < since:
+                    previous[key] = (at, status)
+                    continue
+                tally = tallies.setdefault((task_name, check_name, bucket_of(at)), _Tally())
+                previous[key] = tally.add(previous.get(key), at, status, self.max_gap)
+        self._repair = (since, before, {key: t.totals() for key, t in tallies.items()})
+
+    async def _rebuild_loop(self, db_ready: Awaitable | None):
+        if db_ready is not None:
+            await db_ready
+        while True:
+            try:
+                await self.rebuild()
+            except Exception:
+                logger.exception("Uptime rebuild failed")
+            await asyncio.sleep(self.rebuild_interval)
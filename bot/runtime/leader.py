@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+from typing import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from bot.db.queries import acquire_lease, release_lease
+from bot.metrics.instruments import IS_LEADER, LEADER_CHANGES
+
+logger = logging.getLogger(__name__)
+
+
+def default_holder() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class LeaderElection:
+    """Lease-based leader election over the shared database.
+
+    Every ``renew_interval`` the leader renews the lease row and followers
+    try to take it; a lease not renewed for ``ttl`` seconds is free. After a
+    leader crashes a follower takes over within ``ttl + renew_interval``; a
+    leader that stops cleanly releases the lease, so the wait is at most
+    ``renew_interval``. A leader that cannot reach the database steps down
+    before its last renewal could expire.
+
+    ``on_demoted(flush)`` gets ``flush=True`` only when this instance hands
+    off cleanly. A leader that lost the lease must stop at once and write
+    nothing: the new leader resumes from the logged state and would send the
+    same alerts again. That stop runs beside the campaign, so renewals and
+    re-election are not held up by it.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        on_elected: Callable[[], Awaitable[None]],
+        on_demoted: Callable[[bool], Awaitable[None]],
+        holder: str = "",
+        name: str = "monitor",
+        ttl: float = 30.0,
+        renew_interval: float = 10.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        if renew_interval >= ttl:
+            raise ValueError("renew_interval must be shorter than the lease ttl")
+        self.session_factory = session_factory
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.holder = holder or default_holder()
+        self.name = name
+        self.ttl = ttl
+        self.renew_interval = renew_interval
+        self._clock = clock
+        self.is_leader = False
+        self.term = 0
+        self._valid_until = 0.0
+        self._task: asyncio.Task | None = None
+        self._demotion: asyncio.Task | None = None
+
+    async def start(self, db_ready: Awaitable | None = None):
+        self._task = asyncio.create_task(self._run(db_ready))
+
+    async def stop(self):
+        """Stop campaigning; a leader hands off its work and releases the lease."""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self._wait_demotion()
+        if self.is_leader:
+            self._resign("shutting down")
+            await self.on_demoted(True)
+            try:
+                async with self.session_factory() as session:
+                    await release_lease(session, self.name, self.holder)
+            except Exception:
+                logger.exception("Failed to release lease %s", self.name)
+
+    async def _run(self, db_ready: Awaitable | None):
+        if db_ready is not None:
+            await db_ready
+        while True:
+            try:
+                await self.campaign()
+            except Exception:
+                logger.exception("Lease %s: leadership change failed", self.name)
+            await asyncio.sleep(self.renew_interval)
+
+    async def campaign(self):
+        """One renewal or takeover attempt."""
+        now = self._clock()
+        try:
+            async with self.session_factory() as session:
+                term = await acquire_lease(session, self.name, self.holder, self.ttl, now)
+        except Exception:
+            logger.exception("Lease %s: database unavailable", self.name)
+            # The next attempt would come after our lease may have expired
+            if self.is_leader and self._clock() + self.renew_interval >= self._valid_until:
+                self._step_down("lease could not be renewed")
+            return
+
+        if term is None:
+            if self.is_leader:
+                self._step_down("lease taken by another instance")
+            return
+        self._valid_until = now + self.ttl
+        if not self.is_leader:
+            self.is_leader = True
+            self.term = term
+            IS_LEADER.set(1)
+            LEADER_CHANGES.inc()
+            logger.info("Elected leader for %s (term %d, %s)", self.name, term, self.holder)
+            # Re-elected while the previous term's work is still being stopped
+            await self._wait_demotion()
+            await self.on_elected()
+
+    def _resign(self, reason: str):
+        self.is_leader = False
+        IS_LEADER.set(0)
+        LEADER_CHANGES.inc()
+        logger.warning("No longer leader for %s: %s", self.name, reason)
+
+    def _step_down(self, reason: str):
+        """Lost the lease: stop without flushing, off the campaign path."""
+        self._resign(reason)
+        self._demotion = asyncio.create_task(self.on_demoted(False))
+
+    async def _wait_demotion(self):
+        if self._demotion is None:
+            return
+        try:
+            await self._demotion
+        except Exception:
+            logger.exception("Lease %s: stopping after demotion failed", self.name)
+        self._demotion = None
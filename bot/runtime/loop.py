@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import re
+import time
+from collections import deque
+from typing import Awaitable, Callable, Coroutine
+
+from bot.metrics.instruments import LOOP_LAG, LOOP_LAG_LAST, LOOP_STALLS, SLOW_CALLBACKS
+
+logger = logging.getLogger(__name__)
+
+# asyncio debug mode logs "Executing <Handle ...> took 0.123 seconds"
+_SLOW_CALLBACK_RE = re.compile(r"^Executing (?P<handle>.+) took (?P<seconds>[\d.]+) seconds$")
+
+
+class _SlowCallbackHandler(logging.Handler):
+    """Captures asyncio's slow-callback warnings into the monitor."""
+
+    def __init__(self, monitor: "LoopLagMonitor"):
+        super().__init__(level=logging.WARNING)
+        self.monitor = monitor
+
+    def emit(self, record: logging.LogRecord):
+        match = _SLOW_CALLBACK_RE.match(record.getMessage())
+        if match:
+            self.monitor.record_slow_callback(match["handle"], float(match["seconds"]))
+
+
+class LoopLagMonitor:
+    """Measures event-loop scheduling delay by timing a periodic sleep.
+
+    Lags above ``threshold`` are logged and passed to ``on_stall`` (at most
+    once per ``alert_cooldown`` seconds). With ``slow_callback`` > 0 the loop
+    runs in asyncio debug mode and callbacks slower than that are recorded.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.5,
+        threshold: float = 0.25,
+        slow_callback: float = 0.0,
+        on_stall: Callable[[float], Awaitable[None]] | None = None,
+        alert_cooldown: float = 600.0,
+    ):
+        self.interval = interval
+        self.threshold = threshold
+        self.slow_callback = slow_callback
+        self.on_stall = on_stall
+        self.alert_cooldown = alert_cooldown
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.samples = 0
+        self.stalls = 0
+        self.slow_callbacks: deque[tuple[str, float]] = deque(maxlen=10)
+        self._total_lag = 0.0
+        self._last_alert = float("-inf")
+        self._task: asyncio.Task | None = None
+        self._log_handler: _SlowCallbackHandler | None = None
+
+    @property
+    def avg_lag(self) -> float:
+        return self._total_lag / self.samples if self.samples else 0.0
+
+    async def start(self):
+        if self.slow_callback > 0:
+            loop = asyncio.get_running_loop()
+            loop.set_debug(True)
+            loop.slow_callback_duration = self.slow_callback
+            self._log_handler = _SlowCallbackHandler(self)
+            logging.getLogger("asyncio").addHandler(self._log_handler)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._log_handler:
+            logging.getLogger("asyncio").removeHandler(self._log_handler)
+            self._log_handler = None
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def record(self, lag: float):
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.samples += 1
+        self._total_lag += lag
+        LOOP_LAG_LAST.set(lag)
+        LOOP_LAG.observe(lag)
+
+    def record_slow_callback(self, handle: str, seconds: float):
+        self.slow_callbacks.append((handle[:120], seconds))
+        SLOW_CALLBACKS.inc()
+
+    async def _stalled(self, lag: float):
+        self.stalls += 1
+        LOOP_STALLS.inc()
+        logger.warning("Event loop stalled for %.0fms (threshold %.0fms)",
+                       lag * 1000, self.threshold * 1000)
+        now = time.monotonic()
+        if self.on_stall is not None and now - self._last_alert >= self.alert_cooldown:
+            self._last_alert = now
+            try:
+                await self.on_stall(lag)
+            except Exception:
+                logger.exception("Loop stall alert failed")
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - start - self.interval, 0.0)
+            self.record(lag)
+            if lag > self.threshold:
+                await self._stalled(lag)
+
+
+def run_event_loop(main: Callable[[], Coroutine], event_loop: str = "asyncio"):
+    """Run the bot on the configured event loop implementation."""
+    if event_loop == "uvloop":
+        try:
+            import uvloop
+        except ImportError:
+            logger.warning("uvloop not installed (pip install '.[uvloop]'), using asyncio")
+        else:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    asyncio.run(main())
@@ -0,0 +1,43 @@
+"""Startup timeline measured from process start.
+
+``mark(phase)`` records the first time a phase is reached; the values are
+exported as ``monitor_startup_seconds{phase=...}`` and logged.
+"""
+import logging
+import os
+import time
+
+from bot.metrics.instruments import STARTUP_PHASE
+
+logger = logging.getLogger(__name__)
+
+
+def _process_start() -> float:
+    """Process start on the monotonic clock, so interpreter and imports are included."""
+    try:
+        with open("/proc/self/stat") as f:
+            # Fields after the parenthesised command name; starttime is field 22
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        age = uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+        return time.monotonic() - max(age, 0.0)
+    except (OSError, ValueError, IndexError):
+        return time.monotonic()
+
+
+PROCESS_START = _process_start()
+
+_marks: dict[str, float] = {}
+
+
+def mark(phase: str) -> float:
+    if phase not in _marks:
+        _marks[phase] = time.monotonic() - PROCESS_START
+        STARTUP_PHASE.labels(phase).set(_marks[phase])
+        logger.info("Startup: %s at %.2fs", phase, _marks[phase])
+    return _marks[phase]
+
+
+def marks() -> dict[str, float]:
+    return dict(_marks)
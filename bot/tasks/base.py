@@ -1,26 +1,106 @@
+import sys
+import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Callable
 
 from bot.checks.base import CheckStatus, HealthCheckResult
 
+if TYPE_CHECKING:
+    from bot.notifications.schedule import AdaptiveScheduler
+
+def _wall_offset() -> float:
+    """time.time() - time.monotonic(), read now: the system clock may have been stepped."""
+    return time.time() - time.monotonic()
+
+
+def _wall_from_iso(timestamp: str) -> float:
+    moment = datetime.fromisoformat(timestamp)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
 
-@dataclass
 class TaskHealthReport:
-    task_name: str
-    task_display_name: str
-    is_healthy: bool
-    checks: list[HealthCheckResult]
-    timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat())
-    summary: str = ""
-
-    def __post_init__(self):
-        if not self.summary:
-            failed = [c for c in self.checks if c.status not in (CheckStatus.OK, CheckStatus.UNKNOWN)]
+    """Aggregated result of one task run.
+
+    ``checked_at`` is a time.monotonic() reading, used for ages and ordering;
+    ``wall_time`` is the Unix time of the same moment, read alongside it so a
+    later clock step does not change what the report shows. ``timestamp``
+    (naive UTC ISO, as earlier versions stored it) is derived from
+    ``wall_time``, and ``summary`` is built on first use. A ``timestamp``
+    argument is still accepted.
+    """
+
+    __slots__ = (
+        "task_name", "task_display_name", "is_healthy", "checks", "checked_at", "wall_time",
+        "_summary",
+    )
+
+    def __init__(
+        self,
+        task_name: str,
+        task_display_name: str,
+        is_healthy: bool,
+        checks: list[HealthCheckResult],
+        checked_at: float | None = None,
+        summary: str = "",
+        timestamp: str | None = None,
+        wall_time: float | None = None,
+    ):
+        self.task_name = sys.intern(task_name)
+        self.task_display_name = task_display_name
+        self.is_healthy = is_healthy
+        self.checks = checks
+        if wall_time is None and timestamp is not None:
+            wall_time = _wall_from_iso(timestamp)
+        if checked_at is None:
+            if wall_time is None:
+                checked_at, wall_time = time.monotonic(), time.time()
+            else:
+                checked_at = wall_time - _wall_offset()
+        elif wall_time is None:
+            wall_time = checked_at + _wall_offset()
+        self.checked_at = checked_at
+        self.wall_time = wall_time
+        self._summary = summary or None
+
+    @property
+    def timestamp(self) -> str:
+        moment = datetime.fromtimestamp(self.wall_time, timezone.utc)
+        return moment.replace(tzinfo=None).isoformat()
+
+    @property
+    def summary(self) -> str:
+        if self._summary is None:
+            failed = [
+                c.name for c in self.checks
+                if c.status not in (CheckStatus.OK, CheckStatus.UNKNOWN)
+            ]
             if failed:
-                self.summary = f"{len(failed)} check(s) failed: " + ", ".join(c.name for c in failed)
+                self._summary = f"{len(failed)} check(s) failed: " + ", ".join(failed)
             else:
-                self.summary = "All systems operational"
+                self._summary = "All systems operational"
+        return self._summary
+
+    def _fields(self) -> tuple:
+        return (
+            self.task_name, self.task_display_name, self.is_healthy,
+            self.checks, self.checked_at, self.wall_time, self.summary,
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, TaskHealthReport):
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (
+            f"TaskHealthReport(task_name={self.task_name!r}, is_healthy={self.is_healthy!r}, "
+            f"checks={self.checks!r}, timestamp={self.timestamp!r})"
+        )
 
 
 class BaseTask(ABC):
@@ -43,3 +123,29 @@ class BaseTask(ABC):
     @abstractmethod
     async def run_health_checks(self) -> TaskHealthReport:
         """Run all health checks and return aggregated report."""
+
+    async def run_scheduled_checks(
+        self, scheduler: "AdaptiveScheduler"
+    ) -> TaskHealthReport | None:
+        """Run the checks the scheduler says are due; None when nothing is.
+
+        The default schedules the task as a whole. Tasks that can run single
+        checks override this; results reused from earlier runs are marked
+        with ``details["reused"]`` so they are not logged twice.
+        """
+        if not scheduler.due(self.name):
+            return None
+        report = await self.run_health_checks()
+        scheduler.record(
+            self.name,
+            CheckStatus.OK if report.is_healthy else CheckStatus.WARNING,
+            sum(c.response_time_ms for c in report.checks),
+        )
+        return report
+
+    async def start_watching(self, on_change: Callable[[str], None]):  # noqa: B027
+        """Start event-driven checks; on_change(key) asks for an early re-check
+        of the check with that scheduler key."""
+
+    async def stop_watching(self):  # noqa: B027
+        """Release watchers started by start_watching."""
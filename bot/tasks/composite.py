@@ -0,0 +1,126 @@
+import logging
+import time
+from dataclasses import replace
+from typing import Callable
+
+from bot.checks.base import BaseHealthCheck, CheckStatus, HealthCheckResult
+from bot.checks.graph import CheckGraph, is_blocking
+from bot.metrics.instruments import CHECKS_IN_FLIGHT, record_check
+from bot.metrics.timing import timed
+from bot.notifications.schedule import AdaptiveScheduler
+from bot.tasks.base import BaseTask, TaskHealthReport
+
+logger = logging.getLogger(__name__)
+
+
+class CompositeTask(BaseTask):
+    """A task made of a list of checks, run as a dependency graph."""
+
+    def __init__(
+        self,
+        name: str,
+        display_name: str,
+        description: str,
+        checks: list[BaseHealthCheck],
+        file_poll_interval: float = 5.0,
+    ):
+        self._name = name
+        self._display_name = display_name
+        self._description = description
+        self._checks = checks
+        self._graph = CheckGraph(checks)
+        self._last_results: dict[str, HealthCheckResult] = {}
+        self._file_poll_interval = file_poll_interval
+        # check name -> the callback it is watched with
+        self._watching: dict[str, Callable[[], None]] = {}
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def display_name(self) -> str:
+        return self._display_name
+
+    @property
+    def description(self) -> str:
+        return self._description
+
+    @property
+    def checks(self) -> list[BaseHealthCheck]:
+        return list(self._checks)
+
+    def adopt_results(self, old: "CompositeTask", unchanged: set[str]):
+        """Carry over the latest results of checks a reload left unchanged."""
+        self._last_results.update(
+            (name, result) for name, result in old._last_results.items() if name in unchanged
+        )
+
+    async def start_watching(self, on_change: Callable[[str], None]):
+        for check in self._checks:
+            if check.name in self._watching:
+                continue
+            key = f"{self.name}/{check.name}"
+            callback = self._watching[check.name] = lambda key=key: on_change(key)
+            await check.watch(callback, poll_interval=self._file_poll_interval)
+
+    async def stop_watching(self):
+        for check in self._checks:
+            if self._watching.pop(check.name, None) is not None:
+                await check.unwatch()
+
+    @timed("checks")
+    async def run_health_checks(self) -> TaskHealthReport:
+        results = await self._graph.run(self._execute)
+        self._last_results.update(results)
+        return self._report([results[c.name] for c in self._checks])
+
+    @timed("checks")
+    async def run_scheduled_checks(self, scheduler: AdaptiveScheduler) -> TaskHealthReport | None:
+        due = {c.name for c in self._checks if scheduler.due(f"{self.name}/{c.name}")}
+        if not due:
+            return None
+        results = await self._graph.run(self._execute, only=due, previous=self._last_results)
+        for name, result in results.items():
+            # Blocked checks stay on the short interval to follow their root cause
+            status = CheckStatus.CRITICAL if is_blocking(result) else result.status
+            scheduler.record(f"{self.name}/{name}", status, result.response_time_ms)
+        self._last_results.update(results)
+
+        checks = []
+        for check in self._checks:
+            result = results.get(check.name)
+            if result is None:
+                last = self._last_results[check.name]
+                result = replace(last, details={**last.details, "reused": True})
+            checks.append(result)
+        return self._report(checks)
+
+    async def _execute(self, check: BaseHealthCheck) -> HealthCheckResult:
+        start = time.perf_counter()
+        CHECKS_IN_FLIGHT.inc()
+        try:
+            result = await check.execute()
+        except Exception as e:
+            logger.exception("Check %s failed unexpectedly", check.name)
+            result = HealthCheckResult(
+                name=check.name,
+                status=CheckStatus.UNKNOWN,
+                message=f"Error: {str(e)[:100]}",
+            )
+        finally:
+            CHECKS_IN_FLIGHT.dec()
+        record_check(self.name, result, time.perf_counter() - start)
+        return result
+
+    def _report(self, results: list[HealthCheckResult]) -> TaskHealthReport:
+        is_healthy = all(
+            r.status in (CheckStatus.OK, CheckStatus.UNKNOWN) for r in results
+        )
+
+        return TaskHealthReport(
+            task_name=self.name,
+            task_display_name=self.display_name,
+            is_healthy=is_healthy,
+            checks=results,
+        )
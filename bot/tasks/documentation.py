@@ -1,55 +1,82 @@
-import logging
-
-from bot.checks.base import CheckStatus, HealthCheckResult
+from bot.checks.base import BaseHealthCheck
+from bot.checks.breaker import CircuitBreakerCheck
 from bot.checks.file_check import FileCheck
 from bot.checks.gpu_check import GPUCheck
 from bot.checks.http_check import HTTPHealthCheck
-from bot.checks.jira_check import JiraAPICheck
+from bot.checks.jira_check import JiraAPICheck, JiraSearchCheck
 from bot.checks.subprocess_check import SubprocessCheck
+from bot.checks.tcp_check import TCPCheck
 from bot.config import Settings
-from bot.tasks.base import BaseTask, TaskHealthReport
-
-logger = logging.getLogger(__name__)
+from bot.tasks.composite import CompositeTask
 
 
-class DocumentationPipelineTask(BaseTask):
+class DocumentationPipelineTask(CompositeTask):
 
     def __init__(self, config: Settings):
-        self._checks = []
+        checks: list[BaseHealthCheck] = []
+
+        def breaker(check):
+            return CircuitBreakerCheck(
+                check,
+                failure_threshold=config.breaker_failure_threshold,
+                backoff=config.breaker_backoff,
+                max_backoff=config.breaker_max_backoff,
+            )
+
+        # 0. Network
+        network = []
+        if config.network_check_target:
+            host, _, port = config.network_check_target.rpartition(":")
+            checks.append(TCPCheck(name="Network", host=host, port=int(port)))
+            network = ["Network"]
 
         # 1. vLLM API
-        self._checks.append(
-            HTTPHealthCheck(
+        checks.append(
+            breaker(HTTPHealthCheck(
                 name="vLLM API",
                 url=f"{config.vllm_api_url}/models",
                 timeout=10.0,
-            )
+                depends_on=network,
+            ))
         )
+        if config.vllm_model:
+            checks.append(
+                breaker(HTTPHealthCheck(
+                    name="vLLM inference",
+                    url=f"{config.vllm_api_url}/completions",
+                    method="POST",
+                    json={"model": config.vllm_model, "prompt": "ping", "max_tokens": 1},
+                    timeout=30.0,
+                    depends_on=["vLLM API"],
+                ))
+            )
 
-        # 2. Jira API
+        # 2. Jira API: auth, then the task count
         if config.jira_url and config.jira_api_token:
-            self._checks.append(
-                JiraAPICheck(
-                    name="Jira API",
-                    jira_url=config.jira_url,
-                    email=config.jira_email,
-                    api_token=config.jira_api_token,
-                    project=config.jira_project,
-                )
+            jira = dict(
+                jira_url=config.jira_url,
+                email=config.jira_email,
+                api_token=config.jira_api_token,
+                project=config.jira_project,
+            )
+            checks.append(breaker(JiraAPICheck(name="Jira API", depends_on=network, **jira)))
+            checks.append(
+                breaker(JiraSearchCheck(name="Jira tasks", depends_on=["Jira API"], **jira))
             )
 
         # 3. Claude CLI
-        self._checks.append(
+        checks.append(
             SubprocessCheck(
                 name="Claude CLI",
                 command=["claude", "--version"],
                 timeout=15.0,
+                cache_max_age=config.claude_version_cache_seconds,
             )
         )
 
         # 4. Cycle Runner lock
         if config.cycle_runner_lock_path:
-            self._checks.append(
+            checks.append(
                 FileCheck(
                     name="Cycle Runner",
                     path=config.cycle_runner_lock_path,
@@ -58,41 +85,12 @@ class DocumentationPipelineTask(BaseTask):
             )
 
         # 5. GPU
-        self._checks.append(GPUCheck(name="GPU"))
-
-    @property
-    def name(self) -> str:
-        return "documentation"
-
-    @property
-    def display_name(self) -> str:
-        return "Documentation Pipeline"
-
-    @property
-    def description(self) -> str:
-        return "vLLM, Jira, Claude CLI, Cycle Runner, GPU"
-
-    async def run_health_checks(self) -> TaskHealthReport:
-        results: list[HealthCheckResult] = []
-        for check in self._checks:
-            try:
-                result = await check.execute()
-            except Exception as e:
-                logger.exception("Check %s failed unexpectedly", check.name)
-                result = HealthCheckResult(
-                    name=check.name,
-                    status=CheckStatus.UNKNOWN,
-                    message=f"Error: {str(e)[:100]}",
-                )
-            results.append(result)
-
-        is_healthy = all(
-            r.status in (CheckStatus.OK, CheckStatus.UNKNOWN) for r in results
-        )
-
-        return TaskHealthReport(
-            task_name=self.name,
-            task_display_name=self.display_name,
-            is_healthy=is_healthy,
-            checks=results,
+        checks.append(GPUCheck(name="GPU"))
+
+        super().__init__(
+            name="documentation",
+            display_name="Documentation Pipeline",
+            description="vLLM, Jira, Claude CLI, Cycle Runner, GPU",
+            checks=checks,
+            file_poll_interval=config.file_watch_poll_interval,
         )
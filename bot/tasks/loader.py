@@ -0,0 +1,185 @@
+"""Build tasks from the YAML task configuration.
+
+Each check entry names a ``type`` from CHECK_TYPES; the remaining keys are
+passed to that check class, so they match its constructor arguments::
+
+    tasks:
+      documentation:
+        display_name: Documentation Pipeline
+        checks:
+          - {name: vLLM API, type: http, url: "${VLLM_API_URL}/models", breaker: true}
+          - {name: GPU, type: gpu}
+
+``${VAR}`` and ``${VAR:-default}`` are replaced from the environment; as in
+the shell, the default also applies when VAR is set but empty.
+Checks with the same type and arguments in several tasks share one
+execution per cycle (see bot.checks.shared).
+"""
+import json
+import os
+import re
+import shlex
+from pathlib import Path
+from typing import Any, Callable, Protocol
+
+import yaml
+
+from bot.checks.base import BaseHealthCheck
+from bot.checks.breaker import CircuitBreakerCheck
+from bot.checks.file_check import FileCheck
+from bot.checks.gpu_check import GPUCheck
+from bot.checks.http_check import HTTPHealthCheck
+from bot.checks.jira_check import JiraAPICheck, JiraSearchCheck
+from bot.checks.shared import SharedCheckPool
+from bot.checks.subprocess_check import SubprocessCheck
+from bot.checks.tcp_check import TCPCheck
+from bot.tasks.composite import CompositeTask
+
+CHECK_TYPES: dict[str, Callable[..., BaseHealthCheck]] = {
+    "http": HTTPHealthCheck,
+    "jira": JiraAPICheck,
+    "jira_search": JiraSearchCheck,
+    "subprocess": SubprocessCheck,
+    "file": FileCheck,
+    "gpu": GPUCheck,
+    "tcp": TCPCheck,
+}
+
+
+class CheckDefaults(Protocol):
+    """Settings the loader reads: bot.config.Settings or the agent's settings."""
+
+    breaker_failure_threshold: int
+    breaker_backoff: float
+    breaker_max_backoff: float
+    file_watch_poll_interval: float
+
+
+class ConfigError(ValueError):
+    """The task configuration cannot be read or used; the message says where."""
+
+
+_ENV_VAR = re.compile(r"\$\{(\w+)(?::-([^}]*))?\}")
+
+
+def register_check_type(name: str, factory: Callable[..., BaseHealthCheck]):
+    CHECK_TYPES[name] = factory
+
+
+def _expand(value: Any) -> Any:
+    if isinstance(value, str):
+        return _ENV_VAR.sub(lambda m: os.environ.get(m.group(1)) or m.group(2) or "", value)
+    if isinstance(value, list):
+        return [_expand(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _expand(v) for k, v in value.items()}
+    return value
+
+
+def check_key(spec: dict) -> str:
+    """Identity of a check definition: everything except name and dependencies."""
+    params = {k: v for k, v in spec.items() if k not in ("name", "depends_on", "enabled")}
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+def _build_check(spec: dict, name: str, settings: CheckDefaults) -> BaseHealthCheck:
+    params = {
+        k: v for k, v in spec.items()
+        if k not in ("name", "type", "depends_on", "enabled", "breaker")
+    }
+    factory = CHECK_TYPES[spec["type"]]
+    if spec["type"] == "subprocess" and isinstance(params.get("command"), str):
+        params["command"] = shlex.split(params["command"])
+    check = factory(name=name, **params)
+
+    breaker = spec.get("breaker")
+    if breaker:
+        options = breaker if isinstance(breaker, dict) else {}
+        check = CircuitBreakerCheck(
+            check,
+            failure_threshold=options.get("failure_threshold", settings.breaker_failure_threshold),
+            backoff=options.get("backoff", settings.breaker_backoff),
+            max_backoff=options.get("max_backoff", settings.breaker_max_backoff),
+        )
+    return check
+
+
+def build_tasks(
+    config: dict,
+    settings: CheckDefaults,
+    pool: SharedCheckPool | None = None,
+) -> list[CompositeTask]:
+    pool = pool or SharedCheckPool()
+    tasks = []
+    for task_name, task_spec in _mapping(config.get("tasks"), "tasks").items():
+        task_spec = _mapping(task_spec, f"task {task_name!r}")
+        if not task_spec.get("enabled", True):
+            continue
+        checks = []
+        check_specs = task_spec.get("checks") or []
+        if not isinstance(check_specs, list):
+            raise ConfigError(f"task {task_name!r}: checks must be a list")
+        for spec in check_specs:
+            if not isinstance(spec, dict):
+                raise ConfigError(f"task {task_name!r}: check {spec!r} must be a mapping")
+            if not spec.get("enabled", True):
+                continue
+            where = f"task {task_name!r} check {spec.get('name')!r}"
+            if "name" not in spec:
+                raise ConfigError(f"task {task_name!r}: check without a name")
+            if not isinstance(spec.get("depends_on") or [], list):
+                raise ConfigError(f"{where}: depends_on must be a list")
+            if not isinstance(spec.get("breaker", False), (bool, dict)):
+                raise ConfigError(f"{where}: breaker must be true, false or a mapping")
+            if spec.get("type") not in CHECK_TYPES:
+                raise ConfigError(
+                    f"{where}: unknown type {spec.get('type')!r} "
+                    f"(known: {', '.join(sorted(CHECK_TYPES))})"
+                )
+            name = str(spec["name"])
+            try:
+                check = pool.get(
+                    check_key(spec),
+                    lambda spec=spec, name=name: _build_check(spec, name, settings),
+                    name,
+                    tuple(spec.get("depends_on") or ()),
+                )
+            except (TypeError, ValueError) as e:
+                raise ConfigError(f"{where}: {e}") from None
+            checks.append(check)
+        try:
+            tasks.append(
+                CompositeTask(
+                    name=task_name,
+                    display_name=task_spec.get("display_name", task_name),
+                    description=task_spec.get("description", ""),
+                    checks=checks,
+                    file_poll_interval=settings.file_watch_poll_interval,
+                )
+            )
+        except ValueError as e:
+            raise ConfigError(f"task {task_name!r}: {e}") from None
+    return tasks
+
+
+def _mapping(value: Any, what: str) -> dict:
+    if value is None:
+        return {}
+    if not isinstance(value, dict):
+        raise ConfigError(f"{what}: expected a mapping, got {type(value).__name__}")
+    return value
+
+
+def read_config(path: str | Path) -> dict:
+    try:
+        with open(path) as f:
+            config = yaml.safe_load(f) or {}
+    except (OSError, yaml.YAMLError) as e:
+        raise ConfigError(f"{path}: {e}") from e
+    if not isinstance(config, dict):
+        raise ConfigError(f"{path}: expected a mapping at the top level")
+    return _expand(config)
+
+
+def load_tasks(path: str | Path, settings: CheckDefaults) -> list[CompositeTask]:
+    return build_tasks(read_config(path), settings)
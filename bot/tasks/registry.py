@@ -1,3 +1,4 @@
+from bot.checks.shared import shared_run
 from bot.tasks.base import BaseTask, TaskHealthReport
 
 
@@ -5,9 +6,18 @@ class TaskRegistry:
 
     def __init__(self):
         self._tasks: dict[str, BaseTask] = {}
+        # Bumped on every change so derived data (keyboards) can be rebuilt lazily
+        self.version = 0
 
     def register(self, task: BaseTask):
-        self._tasks[task.name] = task
+        # Copy-on-write: a run iterating the old dict across awaits is unaffected
+        self._tasks = {**self._tasks, task.name: task}
+        self.version += 1
+
+    def replace(self, tasks: list[BaseTask]):
+        """Swap in a complete task set at once; readers see old or new, never a mix."""
+        self._tasks = {task.name: task for task in tasks}
+        self.version += 1
 
     def get(self, name: str) -> BaseTask | None:
         return self._tasks.get(name)
@@ -20,6 +30,7 @@ class TaskRegistry:
 
     async def run_all_checks(self) -> dict[str, TaskHealthReport]:
         results = {}
-        for name, task in self._tasks.items():
-            results[name] = await task.run_health_checks()
+        with shared_run():
+            for name, task in list(self._tasks.items()):
+                results[name] = await task.run_health_checks()
         return results
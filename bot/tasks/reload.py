@@ -0,0 +1,173 @@
+"""Hot reload of the YAML task configuration.
+
+A reload builds the complete new task set first and only then swaps it into
+the TaskRegistry, so a bad file leaves the running configuration untouched.
+Check definitions that did not change keep their check objects (breaker
+state, result caches, file watchers) through the shared check pool.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from bot.checks.shared import SharedCheck, SharedCheckPool
+from bot.checks.watch import FileWatcher
+from bot.config import Settings
+from bot.tasks.composite import CompositeTask
+from bot.tasks.loader import ConfigError, build_tasks, read_config
+from bot.tasks.registry import TaskRegistry
+
+logger = logging.getLogger(__name__)
+
+# Editors write in several steps; wait for the file to settle
+RELOAD_DEBOUNCE = 0.5
+
+
+@dataclass
+class ReloadDiff:
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+
+    def summary(self) -> str:
+        return (
+            f"+{len(self.added)} added, -{len(self.removed)} removed, "
+            f"~{len(self.changed)} changed, {len(self.unchanged)} unchanged"
+        )
+
+
+def _definitions(tasks) -> dict[str, tuple]:
+    """task/check -> what makes the check what it is."""
+    definitions = {}
+    for task in tasks:
+        for check in getattr(task, "checks", ()):
+            key = check.key if isinstance(check, SharedCheck) else id(check)
+            definitions[f"{task.name}/{check.name}"] = (key, check.depends_on)
+    return definitions
+
+
+def diff_tasks(old, new) -> ReloadDiff:
+    before, after = _definitions(old), _definitions(new)
+    diff = ReloadDiff()
+    for name, definition in after.items():
+        if name not in before:
+            diff.added.append(name)
+        elif before[name] != definition:
+            diff.changed.append(name)
+        else:
+            diff.unchanged.append(name)
+    diff.removed = [name for name in before if name not in after]
+    return diff
+
+
+class ConfigReloader:
+
+    def __init__(
+        self,
+        path: str | Path,
+        settings: Settings,
+        registry: TaskRegistry,
+        on_change: Callable[[str], None] | None = None,
+    ):
+        self.path = Path(path)
+        self.settings = settings
+        self.registry = registry
+        # Passed to tasks' start_watching (the engine's check_changed)
+        self.on_change = on_change
+        self.on_reload: list[Callable[[ReloadDiff], None]] = []
+        self._pool = SharedCheckPool()
+        # Tasks this reloader put in the registry; others (agent nodes) are kept
+        self._names: set[str] = set()
+        self._lock = asyncio.Lock()
+        self._watcher: FileWatcher | None = None
+        self._pending: asyncio.TimerHandle | None = None
+        self._reload_task: asyncio.Task | None = None
+
+    def load(self) -> ReloadDiff:
+        """Build the task set from the file and swap it in (initial load)."""
+        diff, _ = self._swap(read_config(self.path))
+        return diff
+
+    def _swap(self, config: dict) -> tuple[ReloadDiff, list]:
+        # Built into a copy of the pool: a file that fails halfway leaves
+        # none of its checks behind
+        pool = self._pool.copy()
+        tasks = build_tasks(config, self.settings, pool=pool)
+        old = self.registry.all()
+        diff = diff_tasks(old, tasks)
+
+        unchanged = set(diff.unchanged)
+        previous = {task.name: task for task in old}
+        for task in tasks:
+            before = previous.get(task.name)
+            if isinstance(before, CompositeTask):
+                task.adopt_results(
+                    before,
+                    {n.split("/", 1)[1] for n in unchanged if n.startswith(task.name + "/")},
+                )
+
+        names = {task.name for task in tasks}
+        kept = [t for t in old if t.name not in self._names and t.name not in names]
+        replaced = [t for t in old if t.name in self._names]
+        self.registry.replace(tasks + kept)
+        self._names = names
+        self._pool = pool
+        pool.prune({check.key for task in tasks for check in task.checks})
+        for listener in self.on_reload:
+            listener(diff)
+        return diff, replaced
+
+    async def reload(self) -> ReloadDiff:
+        """Reload now; raises ConfigError (leaving the current tasks running) on a bad file."""
+        async with self._lock:
+            try:
+                config = await asyncio.to_thread(read_config, self.path)
+                diff, replaced = self._swap(config)
+            except ConfigError:
+                logger.exception("Config reload from %s failed", self.path)
+                raise
+            if self.on_change is not None:
+                for task in self.registry.all():
+                    await task.start_watching(self.on_change)
+            # After the new tasks: watchers of unchanged checks keep running,
+            # those only the old tasks used stop
+            for task in replaced:
+                await task.stop_watching()
+        logger.info("Config reloaded from %s: %s", self.path, diff.summary())
+        return diff
+
+    async def watch(self, poll_interval: float = 5.0):
+        """Reload whenever the file changes."""
+        self._watcher = FileWatcher(
+            self.path, self._file_changed, poll_interval=poll_interval, any_change=True
+        )
+        await self._watcher.start()
+
+    async def stop(self):
+        if self._pending:
+            self._pending.cancel()
+        if self._reload_task:
+            await asyncio.gather(self._reload_task, return_exceptions=True)
+        if self._watcher:
+            await self._watcher.stop()
+            self._watcher = None
+
+    def _file_changed(self, state):
+        if not state.exists:
+            return
+        if self._pending:
+            self._pending.cancel()
+        loop = asyncio.get_running_loop()
+        self._pending = loop.call_later(RELOAD_DEBOUNCE, self._start_reload)
+
+    def _start_reload(self):
+        self._pending = None
+        self._reload_task = asyncio.create_task(self._reload_quietly())
+
+    async def _reload_quietly(self):
+        try:
+            await self.reload()
+        except ConfigError:
+            pass
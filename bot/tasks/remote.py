@@ -0,0 +1,137 @@
+import logging
+import time
+from dataclasses import replace
+from typing import TYPE_CHECKING, Callable
+
+from bot.agent.protocol import Batch
+from bot.checks.base import CheckStatus, HealthCheckResult
+from bot.tasks.base import BaseTask, TaskHealthReport
+
+if TYPE_CHECKING:
+    from bot.notifications.schedule import AdaptiveScheduler
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT = "Heartbeat"
+
+
+class RemoteNodeTask(BaseTask):
+    """Results pushed by the agent on one node (see bot.agent).
+
+    Nothing runs locally: the task reports the latest result of every check
+    the agent sent, plus a Heartbeat check that turns CRITICAL once
+    ``heartbeat_misses`` heartbeat intervals pass without a push. While the
+    heartbeat is missing the other checks are reported as blocked by it.
+    """
+
+    def __init__(
+        self,
+        node: str,
+        heartbeat_misses: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.node = node
+        self.heartbeat_misses = heartbeat_misses
+        self._clock = clock
+        self.boot: str | None = None
+        self.seq = 0
+        self.lost = 0
+        self.heartbeat_interval = 0.0
+        self.last_seen: float | None = None
+        self._results: dict[str, HealthCheckResult] = {}
+        # Names received since the last scheduled report; the rest are reused
+        self._fresh: set[str] = set()
+        self._reported_alive: bool | None = None
+
+    @property
+    def name(self) -> str:
+        return f"node:{self.node}"
+
+    @property
+    def display_name(self) -> str:
+        return f"Node {self.node}"
+
+    @property
+    def description(self) -> str:
+        return f"Checks pushed by the agent on {self.node}"
+
+    @property
+    def alive(self) -> bool:
+        if self.last_seen is None:
+            return False
+        return self._clock() - self.last_seen <= self.heartbeat_interval * self.heartbeat_misses
+
+    def receive(self, batch: Batch) -> bool:
+        """Apply a batch; False for a duplicate (already applied) one."""
+        if batch.boot == self.boot:
+            if batch.seq <= self.seq:
+                return False
+            if batch.seq > self.seq + 1:
+                self.lost += batch.seq - self.seq - 1
+                logger.warning(
+                    "Agent %s: %d batch(es) lost before seq %d",
+                    self.node, batch.seq - self.seq - 1, batch.seq,
+                )
+        elif self.boot is not None:
+            logger.info("Agent %s restarted", self.node)
+        self.boot = batch.boot
+        self.seq = batch.seq
+        self.heartbeat_interval = batch.heartbeat_interval
+        self.last_seen = self._clock()
+        for result in batch.results:
+            self._results[result.name] = result
+            self._fresh.add(result.name)
+        return True
+
+    async def run_health_checks(self) -> TaskHealthReport:
+        return self._report()
+
+    async def run_scheduled_checks(
+        self, scheduler: "AdaptiveScheduler"
+    ) -> TaskHealthReport | None:
+        # The agent schedules its own checks; report whenever it pushed
+        # something new or the heartbeat changed state
+        alive = self.alive
+        if not self._fresh and alive == self._reported_alive:
+            return None
+        report = self._report(self._fresh)
+        self._fresh = set()
+        self._reported_alive = alive
+        return report
+
+    def _heartbeat(self) -> HealthCheckResult:
+        age = self._clock() - self.last_seen if self.last_seen is not None else 0.0
+        if self.alive:
+            return HealthCheckResult(
+                name=HEARTBEAT,
+                status=CheckStatus.OK,
+                message=f"seq {self.seq}, last push {age:.0f}s ago",
+                details={"seq": self.seq, "lost": self.lost},
+            )
+        return HealthCheckResult(
+            name=HEARTBEAT,
+            status=CheckStatus.CRITICAL,
+            message=f"No heartbeat for {age:.0f}s",
+            details={"seq": self.seq, "lost": self.lost},
+        )
+
+    def _report(self, fresh: set[str] | None = None) -> TaskHealthReport:
+        heartbeat = self._heartbeat()
+        checks = [heartbeat]
+        for name, result in self._results.items():
+            if heartbeat.status == CheckStatus.CRITICAL:
+                result = HealthCheckResult(
+                    name=name,
+                    status=CheckStatus.UNKNOWN,
+                    message=f"Blocked by {HEARTBEAT}",
+                    details={"blocked_by": HEARTBEAT},
+                )
+            elif fresh is not None and name not in fresh:
+                result = replace(result, details={**result.details, "reused": True})
+            checks.append(result)
+        return TaskHealthReport(
+            task_name=self.name,
+            task_display_name=self.display_name,
+            is_healthy=all(c.status in (CheckStatus.OK, CheckStatus.UNKNOWN) for c in checks),
+            checks=checks,
+        )
@@ -0,0 +1,178 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Hashable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Update
+
+from bot.metrics.instruments import HANDLER_LATENCY, UPDATE_WAIT
+from bot.runtime import startup
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Job:
+    run: Callable[[], Awaitable[Any]]
+    dedup_key: Hashable | None = None
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class UpdateProcessor:
+    """Runs update handlers with a global concurrency limit and per-chat ordering.
+
+    Each chat has its own FIFO served by one worker task, so updates of a chat
+    never overtake each other while different chats run in parallel (up to
+    ``concurrency`` handlers at once). Jobs with a ``dedup_key`` (callback
+    queries) are collapsed into an identical queued job once the processor is
+    saturated. At ``max_pending`` every new job is shed; the webhook checks
+    ``full`` first and has Telegram retry instead.
+    """
+
+    def __init__(self, concurrency: int = 8, max_pending: int = 500, saturation: int | None = None):
+        self.concurrency = concurrency
+        self.max_pending = max_pending
+        self.saturation = saturation if saturation is not None else concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._queues: dict[Hashable, deque[_Job]] = {}
+        self._workers: dict[Hashable, asyncio.Task] = {}
+
+        self.pending = 0
+        self.in_flight = 0
+        self.processed = 0
+        self.collapsed = 0
+        self.shed = 0
+        self.last_wait = 0.0
+        self.max_wait = 0.0
+        self._total_wait = 0.0
+
+    @property
+    def avg_wait(self) -> float:
+        return self._total_wait / self.processed if self.processed else 0.0
+
+    @property
+    def full(self) -> bool:
+        return self.pending >= self.max_pending
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "pending": self.pending,
+            "in_flight": self.in_flight,
+            "chats": len(self._queues),
+            "processed": self.processed,
+            "collapsed": self.collapsed,
+            "shed": self.shed,
+            "last_wait": self.last_wait,
+            "avg_wait": self.avg_wait,
+            "max_wait": self.max_wait,
+        }
+
+    def submit(
+        self,
+        chat_key: Hashable,
+        run: Callable[[], Awaitable[Any]],
+        dedup_key: Hashable | None = None,
+    ) -> bool:
+        """Queue a job. Returns False if it was collapsed or shed."""
+        queue = self._queues.get(chat_key)
+        if self.full:
+            self.shed += 1
+            return False
+        if (
+            dedup_key is not None
+            and self.pending >= self.saturation
+            and queue
+            and any(job.dedup_key == dedup_key for job in queue)
+        ):
+            self.collapsed += 1
+            return False
+
+        if queue is None:
+            queue = self._queues[chat_key] = deque()
+            self._workers[chat_key] = asyncio.create_task(self._drain_chat(chat_key, queue))
+        queue.append(_Job(run, dedup_key))
+        self.pending += 1
+        return True
+
+    async def _drain_chat(self, chat_key: Hashable, queue: deque[_Job]):
+        try:
+            while queue:
+                async with self._semaphore:
+                    # The job stays queued until it gets a slot so duplicates can collapse into it
+                    job = queue.popleft()
+                    self.pending -= 1
+                    wait = time.monotonic() - job.enqueued_at
+                    self.last_wait = wait
+                    self.max_wait = max(self.max_wait, wait)
+                    self._total_wait += wait
+                    self.in_flight += 1
+                    try:
+                        await job.run()
+                    except Exception:
+                        logger.exception("Update handler failed (chat %s)", chat_key)
+                    finally:
+                        self.in_flight -= 1
+                        self.processed += 1
+        finally:
+            del self._queues[chat_key]
+            del self._workers[chat_key]
+
+    async def stop(self, timeout: float = 10.0):
+        workers = list(self._workers.values())
+        if not workers:
+            return
+        _, still_running = await asyncio.wait(workers, timeout=timeout)
+        for task in still_running:
+            task.cancel()
+        if still_running:
+            logger.warning("Cancelled %d chat queue(s) on shutdown", len(still_running))
+            await asyncio.gather(*still_running, return_exceptions=True)
+
+
+class UpdateProcessorMiddleware(BaseMiddleware):
+    """Outer update middleware that hands the rest of the chain to UpdateProcessor.
+
+    Must be registered before the other outer middlewares so DB sessions are
+    opened by the worker that actually runs the handler.
+    """
+
+    def __init__(self, processor: UpdateProcessor):
+        self.processor = processor
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        chat = data.get("event_chat")
+        user = data.get("event_from_user")
+        chat_key = chat.id if chat else (user.id if user else 0)
+
+        callback = event.callback_query if isinstance(event, Update) else None
+        dedup_key = (user.id if user else 0, callback.data) if callback else None
+
+        enqueued_at = time.monotonic()
+
+        async def run():
+            start = time.monotonic()
+            UPDATE_WAIT.observe(start - enqueued_at)
+            try:
+                return await handler(event, data)
+            finally:
+                update_type = event.event_type if isinstance(event, Update) else "unknown"
+                HANDLER_LATENCY.labels(update_type).observe(time.monotonic() - start)
+                startup.mark("first_response")
+
+        accepted = self.processor.submit(chat_key, run, dedup_key)
+        if accepted:
+            return None
+        if callback is not None:
+            # Stop the client spinner; the identical queued tap will do the work
+            await callback.answer()
+        else:
+            logger.warning("Update processor full, dropping update for chat %s", chat_key)
+        return None
@@ -0,0 +1,38 @@
+import logging
+from typing import Awaitable, Callable
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+RouteHandler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+
+class WebServer:
+    """aiohttp server hosting the Telegram webhook and internal endpoints."""
+
+    def __init__(self, host: str, port: int, unix_path: str = ""):
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.app = web.Application()
+        self._runner: web.AppRunner | None = None
+
+    def add_route(self, method: str, path: str, handler: RouteHandler):
+        self.app.router.add_route(method, path, handler)
+
+    async def start(self):
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        logger.info("Web server listening on %s:%d", self.host, self.port)
+        if self.unix_path:
+            await web.UnixSite(self._runner, self.unix_path).start()
+            logger.info("Web server listening on %s", self.unix_path)
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+        logger.info("Web server stopped")
@@ -0,0 +1,91 @@
+import asyncio
+import hmac
+import logging
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+from aiohttp import web
+from pydantic import ValidationError
+
+from bot.transport.processor import UpdateProcessor
+
+logger = logging.getLogger(__name__)
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+class WebhookHandler:
+    """Accepts Telegram updates over HTTP and processes them in a worker pool.
+
+    Requests are acknowledged as soon as the update is queued. The workers
+    only hand updates to the ``processor``, so it is the processor's backlog
+    that bounds memory: while it is full, and while the queue is, requests get
+    HTTP 503 and Telegram retries them later.
+    """
+
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        bot: Bot,
+        secret: str = "",
+        workers: int = 4,
+        queue_size: int = 1000,
+        processor: UpdateProcessor | None = None,
+    ):
+        self.dispatcher = dispatcher
+        self.bot = bot
+        self.secret = secret
+        self.workers = workers
+        self.processor = processor
+        self._queue: asyncio.Queue[Update] = asyncio.Queue(maxsize=queue_size)
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    async def start(self):
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        logger.info("Webhook worker pool started (workers=%d)", self.workers)
+
+    async def stop(self, timeout: float = 10.0):
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except TimeoutError:
+            logger.warning("Webhook queue not drained, %d update(s) dropped", self.queue_depth)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def handle(self, request: web.Request) -> web.Response:
+        if self.secret and not hmac.compare_digest(
+            request.headers.get(SECRET_HEADER, ""), self.secret
+        ):
+            return web.Response(status=401)
+
+        try:
+            data = await request.json()
+            update = Update.model_validate(data, context={"bot": self.bot})
+        except (ValueError, ValidationError):
+            return web.Response(status=400)
+
+        if self.processor is not None and self.processor.full:
+            logger.warning("Update processor full, rejecting update %d", update.update_id)
+            return web.Response(status=503)
+        try:
+            self._queue.put_nowait(update)
+        except asyncio.QueueFull:
+            logger.warning("Webhook queue full, rejecting update %d", update.update_id)
+            return web.Response(status=503)
+        return web.Response()
+
+    async def _worker(self):
+        while True:
+            update = await self._queue.get()
+            try:
+                await self.dispatcher.feed_update(self.bot, update)
+            except Exception:
+                logger.exception("Failed to process update %d", update.update_id)
+            finally:
+                self._queue.task_done()
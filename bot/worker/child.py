@@ -0,0 +1,135 @@
+"""Entry point of the monitoring worker process (see MonitorWorker)."""
+import asyncio
+import logging
+import signal
+import socket
+from typing import TYPE_CHECKING, Callable
+
+from aiogram import Bot
+from aiogram.client.default import DefaultBotProperties
+from aiogram.enums import ParseMode
+
+from bot.agent.hub import AgentHub
+from bot.agent.protocol import decode_batch
+from bot.checks import process
+from bot.config import Settings
+from bot.db.engine import create_engine, create_session_factory
+from bot.metrics.instruments import DB_WRITE_BACKLOG, NOTIFICATIONS_PENDING
+from bot.notifications.engine import NotificationEngine
+from bot.notifications.uptime import UptimeTracker
+from bot.runtime.loop import run_event_loop
+from bot.tasks.loader import ConfigError
+from bot.tasks.registry import TaskRegistry
+from bot.worker.ipc import encode_report, read_frame, write_frame
+
+if TYPE_CHECKING:
+    from bot.tasks.reload import ConfigReloader
+
+logger = logging.getLogger(__name__)
+
+# Fills the worker's registry; returns the config reloader, if any
+BuildRegistry = Callable[[Settings, TaskRegistry], "ConfigReloader | None"]
+
+# How often the queue gauges are sent to the bot process (when they changed)
+GAUGE_INTERVAL = 1.0
+
+
+def build_registry(settings: Settings, registry: TaskRegistry) -> "ConfigReloader | None":
+    """The same tasks the bot process registers."""
+    if settings.tasks_config_path:
+        from bot.tasks.reload import ConfigReloader
+
+        reloader = ConfigReloader(settings.tasks_config_path, settings, registry)
+        reloader.load()
+        return reloader
+
+    from bot.tasks.documentation import DocumentationPipelineTask
+
+    registry.register(DocumentationPipelineTask(settings))
+    return None
+
+
+def main(sock: socket.socket, settings: Settings, build: BuildRegistry, resume: bool):
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s (worker): %(message)s",
+    )
+    # Shutdown is driven by the bot process (a "stop" frame or a closed socket),
+    # so the drain is not cut short by a terminal's or systemd's signal
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    run_event_loop(lambda: _serve(sock, settings, build, resume), settings.event_loop)
+
+
+async def _serve(sock: socket.socket, settings: Settings, build: BuildRegistry, resume: bool):
+    reader, writer = await asyncio.open_unix_connection(sock=sock)
+    engine = create_engine(settings.database_url)
+    process.configure(settings.subprocess_concurrency, settings.subprocess_output_limit)
+    registry = TaskRegistry()
+    reloader = build(settings, registry)
+    bot = Bot(
+        token=settings.telegram_bot_token,
+        default=DefaultBotProperties(parse_mode=ParseMode.HTML),
+    )
+
+    session_factory = create_session_factory(engine)
+    uptime = UptimeTracker(
+        session_factory, settings.uptime_max_gap, settings.uptime_rebuild_interval
+    )
+    monitor = NotificationEngine(bot, registry, session_factory, settings, uptime)
+    monitor.on_report.append(lambda report: write_frame(writer, encode_report(report)))
+    monitor.on_cycle.append(lambda elapsed: write_frame(writer, ["cycle", elapsed]))
+    if reloader:
+        reloader.on_change = monitor.check_changed
+        reloader.on_reload.append(monitor.config_reloaded)
+    hub = None
+    if settings.agents_enabled:
+        # Batches arrive over HTTP in the bot process, which forwards them here
+        hub = AgentHub(
+            registry,
+            heartbeat_misses=settings.agent_heartbeat_misses,
+            on_update=lambda: monitor.wake(expedite=False),
+        )
+        await hub.start()
+
+    await monitor.start(resume=resume)
+    gauges = asyncio.create_task(_forward_gauges(writer))
+    logger.info("Monitoring worker started (%d task(s))", len(registry.all()))
+    flush = True
+    try:
+        while (message := await read_frame(reader)) is not None:
+            kind = message[0]
+            if kind == "stop":
+                flush = message[1]
+                break
+            if kind == "wake":
+                monitor.wake(message[1])
+            elif kind == "reload" and reloader:
+                try:
+                    await reloader.reload()
+                except ConfigError:
+                    pass
+            elif kind == "batch" and hub:
+                hub.receive(decode_batch(message[1].encode()))
+    finally:
+        gauges.cancel()
+        if hub:
+            await hub.stop()
+        if reloader:
+            await reloader.stop()
+        await monitor.stop(flush=flush)
+        await bot.session.close()
+        await engine.dispose()
+        writer.close()
+    logger.info("Monitoring worker stopped")
+
+
+async def _forward_gauges(writer: asyncio.StreamWriter):
+    """/perf in the bot process shows the worker's DB backlog and notification queue."""
+    sent = None
+    while True:
+        values = [DB_WRITE_BACKLOG.value, NOTIFICATIONS_PENDING.value]
+        if values != sent:
+            write_frame(writer, ["gauges", *values])
+            sent = values
+        await asyncio.sleep(GAUGE_INTERVAL)
@@ -0,0 +1,58 @@
+"""Frames exchanged between the bot process and its monitoring worker.
+
+Each message is a JSON list (``["report", ...]``, ``["wake", true]``)
+prefixed by its length as a 4-byte big-endian integer. Check results use
+the agents' compact encoding (see bot.agent.protocol).
+"""
+import asyncio
+import json
+import struct
+
+from bot.agent.protocol import decode_results, encode_results
+from bot.tasks.base import TaskHealthReport
+
+_HEADER = struct.Struct("!I")
+
+
+def write_frame(writer: asyncio.StreamWriter, message: list):
+    data = json.dumps(message, separators=(",", ":"), ensure_ascii=False, default=str).encode()
+    writer.write(_HEADER.pack(len(data)) + data)
+
+
+async def read_frame(reader: asyncio.StreamReader) -> list | None:
+    """Next message, or None once the other side has closed."""
+    try:
+        header = await reader.readexactly(_HEADER.size)
+        (size,) = _HEADER.unpack(header)
+        return json.loads(await reader.readexactly(size))
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+
+
+def encode_report(report: TaskHealthReport) -> list:
+    return [
+        "report",
+        report.task_name,
+        report.task_display_name,
+        report.is_healthy,
+        # The bot process must not count reused results as new runs
+        encode_results(report.checks, keep=("reused",)),
+        # CLOCK_MONOTONIC is system-wide, so both processes read it alike;
+        # the wall time is sent as read here rather than re-derived there
+        report.checked_at,
+        report.wall_time,
+        report.summary,
+    ]
+
+
+def decode_report(message: list) -> TaskHealthReport:
+    _, task_name, display_name, is_healthy, checks, checked_at, wall_time, summary = message
+    return TaskHealthReport(
+        task_name=task_name,
+        task_display_name=display_name,
+        is_healthy=is_healthy,
+        checks=decode_results(checks),
+        checked_at=checked_at,
+        wall_time=wall_time,
+        summary=summary,
+    )
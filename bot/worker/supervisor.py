@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import multiprocessing
+import socket
+from typing import Awaitable, Callable
+
+from bot.config import Settings
+from bot.metrics.instruments import (
+    CYCLE_DURATION,
+    CYCLE_LAST_DURATION,
+    DB_WRITE_BACKLOG,
+    NOTIFICATIONS_PENDING,
+    forget_checks,
+    record_check,
+)
+from bot.tasks.base import TaskHealthReport
+from bot.worker import child
+from bot.worker.ipc import decode_report, read_frame, write_frame
+
+logger = logging.getLogger(__name__)
+
+
+class MonitorWorker:
+    """Runs the monitoring pipeline in a child process.
+
+    The child has its own event loop, task registry, NotificationEngine,
+    database engine and Bot session: check execution, output parsing, health
+    log rows and alert formatting all happen there. Reports, cycle times and
+    the worker's queue gauges stream back over a Unix socket pair and update
+    this process's metrics and ``on_report`` listeners. The interface matches
+    NotificationEngine (start, stop, wake, config_reloaded, on_report), so the
+    two are interchangeable in bot.__main__.
+
+    A worker that dies, or fails to start, is restarted after ``restart_delay``.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        build: child.BuildRegistry = child.build_registry,
+        restart_delay: float = 1.0,
+    ):
+        self.settings = settings
+        self.build = build
+        self.restart_delay = restart_delay
+        self.on_report: list[Callable[[TaskHealthReport], None]] = []
+        self._process: multiprocessing.Process | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._supervisor: asyncio.Task | None = None
+        self._stopping = False
+        self._flush_on_stop = True
+
+    @property
+    def pid(self) -> int | None:
+        return self._process.pid if self._process else None
+
+    async def start(self, db_ready: Awaitable | None = None, resume: bool = False):
+        self._stopping = False
+        self._supervisor = asyncio.create_task(self._supervise(db_ready, resume))
+
+    async def stop(self, timeout: float | None = None, flush: bool = True):
+        """Ask the worker to drain and exit; kill it after ``timeout`` (plus a margin).
+
+        ``flush=False`` is passed on: the worker drops what it has not logged.
+        """
+        if timeout is None:
+            timeout = self.settings.shutdown_drain_timeout
+        self._stopping = True
+        self._flush_on_stop = flush
+        self._send(["stop", flush])
+        if self._supervisor:
+            done, _ = await asyncio.wait({self._supervisor}, timeout=timeout + 5)
+            if not done:
+                logger.warning("Monitoring worker did not exit, killing it")
+                if self._process:
+                    self._process.kill()
+                await self._supervisor
+            self._supervisor = None
+        logger.info("Monitoring worker stopped")
+
+    def wake(self, expedite: bool = True):
+        self._send(["wake", expedite])
+    def config_reloaded(self, diff):
+        # The worker reads the same file and reloads its own tasks
+        self._send(["reload"])
+        forget_checks(diff.removed, diff.added + diff.changed + diff.unchanged)
+
+    def forward_batch(self, body: bytes):
+        """Hand an agent push to the worker's AgentHub."""
+        self._send(["batch", body.decode()])
+
+    def _send(self, message: list):
+        if self._writer is not None and not self._writer.is_closing():
+            write_frame(self._writer, message)
+
+    async def _supervise(self, db_ready: Awaitable | None, resume: bool):
+        if db_ready is not None:
+            await db_ready
+        while True:
+            try:
+                reader = await self._spawn(resume)
+            except Exception:
+                logger.exception("Could not start the monitoring worker")
+                if self._process is not None and self._process.is_alive():
+                    self._process.kill()
+                    await asyncio.to_thread(self._process.join)
+                if self._stopping:
+                    return
+                await asyncio.sleep(self.restart_delay)
+                continue
+            if self._stopping:
+                self._send(["stop", self._flush_on_stop])
+            try:
+                while (message := await read_frame(reader)) is not None:
+                    self._handle(message)
+            finally:
+                self._writer.close()
+                self._writer = None
+                await asyncio.to_thread(self._process.join)
+                # Whatever the worker had queued went with it
+                DB_WRITE_BACKLOG.set(0)
+                NOTIFICATIONS_PENDING.set(0)
+            if self._stopping:
+                return
+            logger.error(
+                "Monitoring worker exited with code %s, restarting", self._process.exitcode
+            )
+            # The new worker picks up from the logged state, like a new leader
+            resume = True
+            await asyncio.sleep(self.restart_delay)
+
+    async def _spawn(self, resume: bool) -> asyncio.StreamReader:
+        ours, theirs = socket.socketpair()
+        context = multiprocessing.get_context("spawn")
+        self._process = context.Process(
+            target=child.main,
+            args=(theirs, self.settings, self.build, resume),
+            name="monitor-worker",
+            daemon=True,
+        )
+        await asyncio.to_thread(self._process.start)
+        theirs.close()
+        reader, self._writer = await asyncio.open_unix_connection(sock=ours)
+        logger.info("Monitoring worker started (pid %d)", self._process.pid)
+        return reader
+
+    def _handle(self, message: list):
+        kind = message[0]
+        if kind == "report":
+            report = decode_report(message)
+            for result in report.checks:
+                if not result.details.get("reused"):
+                    record_check(report.task_name, result, result.response_time_ms / 1000)
+            for listener in self.on_report:
+                listener(report)
+        elif kind == "cycle":
+            CYCLE_DURATION.observe(message[1])
+            CYCLE_LAST_DURATION.set(message[1])
+        elif kind == "gauges":
+            DB_WRITE_BACKLOG.set(message[1])
+            NOTIFICATIONS_PENDING.set(message[2])
@@ -0,0 +1,204 @@
+import asyncio
+
+import pytest
+from aiohttp.test_utils import unused_port
+
+from bot.agent.client import Agent
+from bot.agent.hub import AgentHub, is_loopback
+from bot.agent.protocol import Batch, decode_batch, encode_batch
+from bot.checks.base import BaseHealthCheck, CheckStatus, HealthCheckResult
+from bot.notifications.schedule import AdaptiveScheduler
+from bot.tasks.composite import CompositeTask
+from bot.tasks.registry import TaskRegistry
+from bot.transport.server import WebServer
+
+
+class _StaticCheck(BaseHealthCheck):
+
+    def __init__(self, name: str, status: CheckStatus = CheckStatus.OK):
+        self._name = name
+        self.status = status
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    async def execute(self) -> HealthCheckResult:
+        return HealthCheckResult(self._name, self.status, self.status.value, 1.0)
+
+
+def _agent(node: str, url: str, *checks: BaseHealthCheck, **kwargs) -> Agent:
+    task = CompositeTask("gpu", "GPU", "", list(checks))
+    return Agent(
+        node,
+        [task],
+        url,
+        token="t0ken",
+        heartbeat_interval=0.1,
+        scheduler=AdaptiveScheduler(base=0.05, min_interval=0.05, max_interval=0.05),
+        **kwargs,
+    )
+
+
+async def _eventually(condition, timeout: float = 5.0):
+    for _ in range(int(timeout / 0.02)):
+        if condition():
+            return
+        await asyncio.sleep(0.02)
+    raise AssertionError("condition not reached")
+
+
+@pytest.fixture
+async def hub_server(tmp_path):
+    registry = TaskRegistry()
+    updates = []
+    hub = AgentHub(
+        registry,
+        token="t0ken",
+        heartbeat_misses=2,
+        on_update=lambda: updates.append(1),
+        watchdog_interval=0.02,
+    )
+    port = unused_port()
+    server = WebServer("127.0.0.1", port, unix_path=str(tmp_path / "bot.sock"))
+    server.add_route("POST", "/agent/push", hub.handle)
+    await hub.start()
+    await server.start()
+    yield hub, registry, f"http://127.0.0.1:{port}", updates
+    await server.stop()
+    await hub.stop()
+
+
+def test_batch_roundtrip_is_compact():
+    result = HealthCheckResult("GPU", CheckStatus.WARNING, "91%", 12.345, {"reused": True})
+    data = encode_batch(Batch("gpu-1", "b00t", 7, 30.0, [result]))
+    assert b" " not in data and b"reused" not in data
+
+    batch = decode_batch(data)
+    assert (batch.node, batch.boot, batch.seq) == ("gpu-1", "b00t", 7)
+    assert batch.results[0].status == CheckStatus.WARNING
+    assert batch.results[0].response_time_ms == 12.3
+    with pytest.raises(ValueError):
+        decode_batch(b'{"v": 1, "node": "x"}')
+
+
+def test_only_loopback_hosts_go_without_token():
+    assert all(map(is_loopback, ["127.0.0.1", "::1", "localhost"]))
+    assert not any(map(is_loopback, ["0.0.0.0", "::", "10.0.0.5", "monitor.internal"]))
+
+
+def test_hub_applies_each_sequence_number_once():
+    registry = TaskRegistry()
+    hub = AgentHub(registry)
+    ok = HealthCheckResult("GPU", CheckStatus.OK, "ok")
+
+    assert hub.receive(Batch("n1", "a", 1, 30.0, [ok])) == 1
+    assert hub.receive(Batch("n1", "a", 1, 30.0, [])) == 1
+    assert hub.receive(Batch("n1", "a", 4, 30.0, [])) == 4
+    task = registry.get("node:n1")
+    assert task.lost == 2
+    # A restarted agent starts over with a new boot id
+    assert hub.receive(Batch("n1", "b", 1, 30.0, [])) == 1
+
+
+class _SlowCheck(_StaticCheck):
+
+    def __init__(self, name: str, started: asyncio.Event, release: asyncio.Event):
+        super().__init__(name)
+        self.started = started
+        self.release = release
+
+    async def execute(self) -> HealthCheckResult:
+        self.started.set()
+        await self.release.wait()
+        return await super().execute()
+
+
+async def test_agent_connects_during_a_running_cycle():
+    started, release = asyncio.Event(), asyncio.Event()
+    registry = TaskRegistry()
+    registry.register(CompositeTask("local", "Local", "", [_SlowCheck("slow", started, release)]))
+    hub = AgentHub(registry)
+
+    run = asyncio.create_task(registry.run_all_checks())
+    await started.wait()
+    hub.receive(Batch("n1", "a", 1, 30.0, [HealthCheckResult("GPU", CheckStatus.OK, "ok")]))
+    release.set()
+    reports = await run
+    assert list(reports) == ["local"]
+    assert registry.names() == ["local", "node:n1"]
+
+
+async def test_several_agents_on_localhost(hub_server, tmp_path):
+    hub, registry, url, updates = hub_server
+    flaky = _StaticCheck("GPU")
+    agents = [
+        _agent("n1", url, flaky),
+        _agent("n2", url, _StaticCheck("GPU"), _StaticCheck("Disk")),
+        _agent("n3", f"unix:{tmp_path / 'bot.sock'}", _StaticCheck("GPU")),
+    ]
+    for agent in agents:
+        await agent.start()
+    try:
+        await _eventually(lambda: len(hub.nodes) == 3)
+        assert sorted(registry.names()) == ["node:n1", "node:n2", "node:n3"]
+        report = await registry.get("node:n2").run_scheduled_checks(None)
+        assert report.is_healthy
+        assert [c.name for c in report.checks] == ["Heartbeat", "GPU", "Disk"]
+
+        # A status change is pushed without waiting for the heartbeat
+        flaky.status = CheckStatus.CRITICAL
+        await _eventually(lambda: hub.nodes["n1"]._results["GPU"].status == CheckStatus.CRITICAL)
+        report = await registry.get("node:n1").run_scheduled_checks(None)
+        assert not report.is_healthy
+
+        # Nothing new since the last report
+        assert await registry.get("node:n1").run_scheduled_checks(None) is None
+        assert updates
+    finally:
+        for agent in agents:
+            await agent.stop()
+
+
+async def test_missed_heartbeat_is_an_alert(hub_server):
+    hub, registry, url, updates = hub_server
+    agents = [_agent("n1", url, _StaticCheck("GPU")), _agent("n2", url, _StaticCheck("GPU"))]
+    for agent in agents:
+        await agent.start()
+    await _eventually(lambda: len(hub.nodes) == 2 and all(t.alive for t in hub.nodes.values()))
+    down = registry.get("node:n1")
+    assert (await down.run_scheduled_checks(None)).is_healthy
+
+    await agents[0].stop()
+    await _eventually(lambda: not down.alive)
+    seen = len(updates)
+    await _eventually(lambda: len(updates) > seen)
+
+    report = await down.run_scheduled_checks(None)
+    assert not report.is_healthy
+    heartbeat, gpu = report.checks
+    assert heartbeat.status == CheckStatus.CRITICAL
+    assert gpu.details["blocked_by"] == "Heartbeat"
+    assert hub.nodes["n2"].alive
+    await agents[1].stop()
+
+
+async def test_agent_resends_outbox_when_bot_comes_back(tmp_path):
+    registry = TaskRegistry()
+    hub = AgentHub(registry, token="t0ken")
+    socket_path = str(tmp_path / "late.sock")
+    agent = _agent("n1", f"unix:{socket_path}", _StaticCheck("GPU"))
+    await agent.start()
+    await _eventually(lambda: agent.outbox_depth >= 2)
+
+    server = WebServer("127.0.0.1", unused_port(), unix_path=socket_path)
+    server.add_route("POST", "/agent/push", hub.handle)
+    await server.start()
+    try:
+        await _eventually(lambda: agent.outbox_depth == 0)
+        task = registry.get("node:n1")
+        assert task.lost == 0
+        assert task._results["GPU"].status == CheckStatus.OK
+    finally:
+        await agent.stop()
+        await server.stop()
@@ -1,13 +1,33 @@
 import asyncio
+import os
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from bot.checks.base import CheckStatus
+from bot.checks import process
+from bot.checks.base import BaseHealthCheck, CheckStatus, HealthCheckResult
+from bot.checks.breaker import CircuitBreakerCheck
 from bot.checks.file_check import FileCheck
 from bot.checks.gpu_check import GPUCheck
+from bot.checks.graph import CheckGraph
 from bot.checks.http_check import HTTPHealthCheck
 from bot.checks.subprocess_check import SubprocessCheck
+from bot.checks.watch import FileWatcher, inotify_available
+from bot.notifications.schedule import AdaptiveScheduler
+from bot.tasks.composite import CompositeTask
+
+
+def _stream(data: bytes) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+def _mock_proc(stdout: bytes, returncode: int = 0) -> MagicMock:
+    proc = MagicMock(returncode=returncode, stdout=_stream(stdout), stderr=_stream(b""))
+    proc.wait = AsyncMock(return_value=returncode)
+    return proc
 
 
 @pytest.mark.asyncio
@@ -20,7 +40,7 @@ async def test_http_check_ok():
         mock_resp.__aexit__ = AsyncMock(return_value=False)
 
         mock_session = AsyncMock()
-        mock_session.get = MagicMock(return_value=mock_resp)
+        mock_session.request = MagicMock(return_value=mock_resp)
         mock_session.__aenter__ = AsyncMock(return_value=mock_session)
         mock_session.__aexit__ = AsyncMock(return_value=False)
 
@@ -34,9 +54,7 @@ async def test_http_check_ok():
 
 @pytest.mark.asyncio
 async def test_subprocess_check_ok():
-    mock_proc = AsyncMock()
-    mock_proc.communicate = AsyncMock(return_value=(b"claude-code 1.0.0\n", b""))
-    mock_proc.returncode = 0
+    mock_proc = _mock_proc(b"claude-code 1.0.0\n")
 
     with patch("asyncio.create_subprocess_exec", return_value=mock_proc):
         check = SubprocessCheck(name="Claude CLI", command=["claude", "--version"])
@@ -84,9 +102,7 @@ async def test_gpu_check_no_nvidia():
 @pytest.mark.asyncio
 async def test_gpu_check_parses_output():
     nvidia_output = b"0, NVIDIA A100, 34, 8192, 81920, 52\n"
-    mock_proc = AsyncMock()
-    mock_proc.communicate = AsyncMock(return_value=(nvidia_output, b""))
-    mock_proc.returncode = 0
+    mock_proc = _mock_proc(nvidia_output)
 
     with patch("asyncio.create_subprocess_exec", return_value=mock_proc):
         check = GPUCheck()
@@ -100,9 +116,7 @@ async def test_gpu_check_parses_output():
 async def test_gpu_check_unified_memory():
     """DGX Spark returns [N/A] for memory fields."""
     nvidia_output = b"0, NVIDIA GB10, 3, [N/A], [N/A], 47\n"
-    mock_proc = AsyncMock()
-    mock_proc.communicate = AsyncMock(return_value=(nvidia_output, b""))
-    mock_proc.returncode = 0
+    mock_proc = _mock_proc(nvidia_output)
 
     with patch("asyncio.create_subprocess_exec", return_value=mock_proc):
         check = GPUCheck()
@@ -112,3 +126,283 @@ async def test_gpu_check_unified_memory():
         assert result.details["gpus"][0]["memory_used"] is None
         assert result.details["gpus"][0]["memory_total"] is None
         assert result.details["gpus"][0]["temperature"] == 47
+
+
+async def test_runner_timeout_kills_process_group():
+    runner = process.ProcessRunner()
+    killed = process.get_runner().stats()["killed"]
+    result = await runner.run(["sh", "-c", "sleep 30 & sleep 30"], timeout=0.2)
+
+    assert result.timed_out
+    assert process.live_count() == 0
+    assert runner.stats()["killed"] == killed + 1
+
+
+async def test_runner_caps_output():
+    runner = process.ProcessRunner(output_limit=1000)
+    result = await runner.run(["sh", "-c", "head -c 100000 /dev/zero"], timeout=5)
+
+    assert result.returncode == 0
+    assert len(result.stdout) == 1000
+    assert result.truncated
+
+
+async def test_runner_joins_identical_commands():
+    runner = process.ProcessRunner()
+    spawned = runner.stats()["spawned"]
+    command = ["sh", "-c", "sleep 0.1; echo $$"]
+    results = await asyncio.gather(*(runner.run(command, 5) for _ in range(3)))
+
+    assert runner.stats()["spawned"] == spawned + 1
+    assert runner.deduplicated == 2
+    assert len({r.stdout for r in results}) == 1
+
+
+async def test_runner_limits_concurrency():
+    runner = process.ProcessRunner(concurrency=2)
+    start = asyncio.get_running_loop().time()
+    await asyncio.gather(*(runner.run(["sleep", f"0.2{i}"], 5) for i in range(4)))
+
+    # Four 0.2s commands through two slots take two rounds
+    assert asyncio.get_running_loop().time() - start >= 0.4
+
+
+def _script(path, output: str):
+    path.write_text(f"#!/bin/sh\necho {output}\n")
+    path.chmod(0o755)
+
+
+async def test_subprocess_check_reuses_result_until_binary_changes(tmp_path):
+    binary = tmp_path / "tool"
+    _script(binary, "v1")
+    check = SubprocessCheck(name="tool", command=[str(binary)], cache_max_age=3600)
+
+    first = await check.execute()
+    spawned = process.get_runner().stats()["spawned"]
+    second = await check.execute()
+    assert first.message == second.message == "v1"
+    assert second.details["cached"]
+    assert process.get_runner().stats()["spawned"] == spawned
+
+    _script(binary, "v2.0")
+    third = await check.execute()
+    assert third.message == "v2.0"
+    assert "cached" not in third.details
+
+
+async def test_subprocess_check_cache_expires(tmp_path):
+    binary = tmp_path / "tool"
+    _script(binary, "v1")
+    check = SubprocessCheck(name="tool", command=[str(binary)], cache_max_age=0.05)
+
+    await check.execute()
+    await asyncio.sleep(0.1)
+    result = await check.execute()
+    assert "cached" not in result.details
+
+
+async def _watch_events(watcher: FileWatcher, lock):
+    events = asyncio.Queue()
+    watcher.on_change = events.put_nowait
+    await watcher.start()
+    try:
+        lock.write_text("locked")
+        created = await asyncio.wait_for(events.get(), timeout=1.0)
+        lock.unlink()
+        removed = await asyncio.wait_for(events.get(), timeout=1.0)
+    finally:
+        await watcher.stop()
+    return created, removed
+
+
+@pytest.mark.skipif(not inotify_available(), reason="inotify not available")
+async def test_file_watcher_inotify_delivers_changes(tmp_path):
+    watcher = FileWatcher(tmp_path / "run.lock", poll_interval=60)
+    created, removed = await _watch_events(watcher, tmp_path / "run.lock")
+
+    assert watcher.mode is None
+    assert created.exists and created.mtime
+    assert not removed.exists
+
+
+async def test_file_watcher_polling_fallback(tmp_path):
+    watcher = FileWatcher(tmp_path / "run.lock", poll_interval=0.05, use_inotify=False)
+    created, removed = await _watch_events(watcher, tmp_path / "run.lock")
+
+    assert created.exists
+    assert not removed.exists
+
+
+async def test_unreadable_path_counts_as_missing(tmp_path):
+    # A regular file where the lock's directory should be: ENOTDIR, not ENOENT
+    (tmp_path / "run").write_text("")
+    watcher = FileWatcher(tmp_path / "run" / "run.lock", poll_interval=0.05, use_inotify=False)
+    assert not watcher.state.exists
+    await watcher.start()
+    await asyncio.sleep(0.1)
+    assert not watcher._poller.done()
+    await watcher.stop()
+
+
+async def test_watched_file_check_uses_memory_state(tmp_path):
+    lock = tmp_path / "run.lock"
+    changes = asyncio.Event()
+    check = FileCheck(name="lock", path=str(lock), max_age_seconds=3600)
+    await check.watch(changes.set)
+    try:
+        lock.write_text("locked")
+        await asyncio.wait_for(changes.wait(), timeout=1.0)
+        result = await check.execute()
+        assert result.details["exists"] and not result.details["stale"]
+
+        # Staleness comes from the remembered mtime
+        os.utime(lock, (0, 0))
+        await asyncio.sleep(0.05)
+        result = await check.execute()
+        assert result.status == CheckStatus.WARNING
+    finally:
+        await check.unwatch()
+
+
+async def test_file_change_reruns_only_that_check(tmp_path):
+    lock = tmp_path / "run.lock"
+    check = FileCheck(name="lock", path=str(lock))
+    task = CompositeTask("t", "T", "", [check, _ScriptedCheck([CheckStatus.OK])])
+    scheduler = AdaptiveScheduler(base=60, min_interval=15, max_interval=300)
+    await task.run_scheduled_checks(scheduler)
+
+    changed = asyncio.Queue()
+
+    def check_changed(key: str):
+        # What NotificationEngine.check_changed does
+        scheduler.discard(key)
+        changed.put_nowait(key)
+
+    await task.start_watching(check_changed)
+    # A second watcher of the same check is called too
+    also = asyncio.Event()
+    await check.watch(also.set)
+    try:
+        lock.write_text("locked")
+        assert await asyncio.wait_for(changed.get(), timeout=1.0) == "t/lock"
+        await asyncio.wait_for(also.wait(), timeout=1.0)
+    finally:
+        await task.stop_watching()
+    assert scheduler.due("t/lock")
+    assert not scheduler.due("t/scripted")
+
+
+class _ScriptedCheck(BaseHealthCheck):
+
+    def __init__(self, statuses: list[CheckStatus]):
+        self.statuses = statuses
+        self.calls = 0
+
+    @property
+    def name(self) -> str:
+        return "scripted"
+
+    async def execute(self) -> HealthCheckResult:
+        status = self.statuses[min(self.calls, len(self.statuses) - 1)]
+        self.calls += 1
+        return HealthCheckResult(name=self.name, status=status, message=status.value)
+
+
+async def test_breaker_opens_and_short_circuits():
+    now = [0.0]
+    inner = _ScriptedCheck([CheckStatus.CRITICAL])
+    check = CircuitBreakerCheck(inner, failure_threshold=2, backoff=10, clock=lambda: now[0])
+
+    await check.execute()
+    await check.execute()
+    result = await check.execute()
+
+    assert inner.calls == 2
+    assert result.status == CheckStatus.CRITICAL
+    assert result.details["breaker"] == "open"
+    assert "circuit open" in result.message
+
+
+async def test_breaker_probes_with_backoff_and_closes():
+    now = [0.0]
+    C, OK = CheckStatus.CRITICAL, CheckStatus.OK
+    inner = _ScriptedCheck([C, C, OK])
+    check = CircuitBreakerCheck(inner, failure_threshold=1, backoff=10, clock=lambda: now[0])
+
+    await check.execute()  # opens, probe at t=10
+    now[0] = 10
+    await check.execute()  # failed probe, backoff doubles: probe at t=30
+    now[0] = 29
+    await check.execute()
+    assert inner.calls == 2
+
+    now[0] = 30
+    result = await check.execute()
+    assert inner.calls == 3
+    assert result.status == OK
+    assert check.state == "closed"
+
+
+class _TimedCheck(BaseHealthCheck):
+
+    def __init__(self, name, status=CheckStatus.OK, delay=0.1, depends_on=()):
+        self._name = name
+        self.status = status
+        self.delay = delay
+        self.depends_on = tuple(depends_on)
+        self.runs = 0
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    async def execute(self) -> HealthCheckResult:
+        self.runs += 1
+        await asyncio.sleep(self.delay)
+        return HealthCheckResult(name=self.name, status=self.status, message=self.status.value)
+
+
+async def _execute(check):
+    return await check.execute()
+
+
+async def test_graph_runs_independent_checks_in_parallel():
+    graph = CheckGraph([_TimedCheck("a"), _TimedCheck("b"), _TimedCheck("c", depends_on=["a"])])
+    start = asyncio.get_running_loop().time()
+    results = await graph.run(_execute)
+
+    assert asyncio.get_running_loop().time() - start < 0.25
+    assert all(r.status == CheckStatus.OK for r in results.values())
+
+
+async def test_graph_blocks_dependents_of_failed_check():
+    network = _TimedCheck("network", CheckStatus.CRITICAL, delay=0)
+    api = _TimedCheck("api", depends_on=["network"])
+    inference = _TimedCheck("inference", depends_on=["api"])
+    gpu = _TimedCheck("gpu", delay=0)
+    results = await CheckGraph([network, api, inference, gpu]).run(_execute)
+
+    assert api.runs == inference.runs == 0
+    assert results["api"].message == "Blocked by network"
+    # The root cause propagates through blocked checks
+    assert results["inference"].details["blocked_by"] == "network"
+    assert results["gpu"].status == CheckStatus.OK
+
+
+async def test_graph_uses_previous_result_for_skipped_dependency():
+    auth = _TimedCheck("auth", delay=0)
+    search = _TimedCheck("search", delay=0, depends_on=["auth"])
+    failed = HealthCheckResult(name="auth", status=CheckStatus.CRITICAL, message="401")
+    results = await CheckGraph([auth, search]).run(
+        _execute, only={"search"}, previous={"auth": failed}
+    )
+
+    assert list(results) == ["search"]
+    assert results["search"].details["blocked_by"] == "auth"
+
+
+def test_graph_rejects_cycles_and_unknown_dependencies():
+    with pytest.raises(ValueError, match="cycle"):
+        CheckGraph([_TimedCheck("a", depends_on=["b"]), _TimedCheck("b", depends_on=["a"])])
+    with pytest.raises(ValueError, match="unknown"):
+        CheckGraph([_TimedCheck("a", depends_on=["missing"])])
@@ -67,3 +67,13 @@ async def test_get_task_subscribers(db_session):
 
     subs = await get_task_subscribers(db_session, "documentation")
     assert set(subs) == {10, 20}
+
+
+@pytest.mark.asyncio
+async def test_init_db_skips_current_schema(tmp_path):
+    from bot.db.engine import create_engine, init_db
+
+    engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'bot.db'}")
+    assert await init_db(engine) is True
+    assert await init_db(engine) is False
+    await engine.dispose()
@@ -0,0 +1,256 @@
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import CallbackQuery, Message
+
+from bot.checks.base import CheckStatus, HealthCheckResult
+from bot.formatters import telegram
+from bot.formatters.telegram import format_gpu_report, format_status_report, format_task_detail
+from bot.handlers import health
+from bot.handlers.keyboards import status_keyboard, task_detail_keyboard
+from bot.tasks.base import TaskHealthReport
+from bot.tasks.registry import TaskRegistry
+
+
+class _Task:
+    def __init__(self, name: str):
+        self.name = name
+        self.display_name = name.title()
+        self.description = ""
+
+
+def _report(message: str = "OK") -> TaskHealthReport:
+    return TaskHealthReport(
+        task_name="test",
+        task_display_name="Test Task",
+        is_healthy=True,
+        checks=[HealthCheckResult(name="check1", status=CheckStatus.OK, message=message)],
+        timestamp="2026-01-01T00:00:00",
+    )
+
+
+def test_status_report_cached_by_content(monkeypatch):
+    telegram.clear_render_cache()
+    calls = []
+    original = telegram._render_status_report
+    monkeypatch.setattr(
+        telegram, "_render_status_report", lambda r: calls.append(1) or original(r)
+    )
+
+    first = format_status_report({"test": _report()})
+    second = format_status_report({"test": _report()})
+    assert first is second
+    assert len(calls) == 1
+
+    changed = format_status_report({"test": _report("Down")})
+    assert "Down" in changed
+    assert len(calls) == 2
+
+
+def test_task_detail_and_gpu_cached(monkeypatch):
+    telegram.clear_render_cache()
+    calls = []
+    original = telegram._render_task_detail
+    monkeypatch.setattr(
+        telegram, "_render_task_detail", lambda r: calls.append(1) or original(r)
+    )
+    # Fresh runs with the same content, checked at different times
+    first = _report()
+    first.checks[0].response_time_ms = 12.3
+    later = _report()
+    later.checked_at += 5
+    later.wall_time += 5
+    later.checks[0].response_time_ms = 12.4  # shown as 12ms too
+    assert format_task_detail(first).endswith("Checked at: 2026-01-01T00:00:00</i>")
+    assert format_task_detail(later).endswith("Checked at: 2026-01-01T00:00:05</i>")
+    assert len(calls) == 1
+
+    gpu = HealthCheckResult(
+        name="GPU", status=CheckStatus.OK, message="",
+        details={"gpus": [{"index": 0, "name": "GB10", "utilization": 3,
+                           "memory_used": None, "memory_total": None, "temperature": 47}]},
+    )
+    text = format_gpu_report(gpu)
+    assert "GB10" in text
+    assert format_gpu_report(gpu) is text
+
+
+def test_keyboards_rebuilt_per_registry_version():
+    registry = TaskRegistry()
+    registry.register(_Task("alpha"))
+
+    kb = status_keyboard(registry)
+    assert status_keyboard(registry) is kb
+    assert task_detail_keyboard(registry, "alpha") is task_detail_keyboard(registry, "alpha")
+
+    registry.register(_Task("beta"))
+    rebuilt = status_keyboard(registry)
+    assert rebuilt is not kb
+    assert len(rebuilt.inline_keyboard) == 3
+
+
+def _big_reports(n_tasks: int = 30, n_checks: int = 6) -> dict[str, TaskHealthReport]:
+    reports = {}
+    for t in range(n_tasks):
+        checks = [
+            HealthCheckResult(
+                name=f"check{c}",
+                status=CheckStatus.CRITICAL if (t, c) == (3, 2) else CheckStatus.OK,
+                message=f"<output> line {c} " * 5,
+            )
+            for c in range(n_checks)
+        ]
+        reports[f"task{t}"] = TaskHealthReport(
+            task_name=f"task{t}", task_display_name=f"Task {t}",
+            is_healthy=(t != 3), checks=checks, timestamp="2026-01-01T00:00:00",
+        )
+    return reports
+
+
+def test_status_pages_are_bounded_and_keep_tags_intact():
+    pages = telegram.render_status_pages(_big_reports(), limit=1000)
+    assert len(pages) > 1
+    for page in pages:
+        assert len(page) <= 1000
+        assert page.count("<b>") == page.count("</b>")
+        assert "<output>" not in page
+    assert "".join(pages).count("check5") == 30
+
+
+def _message(message_id: int) -> Message:
+    message = MagicMock(spec=Message)
+    message.chat = SimpleNamespace(id=1)
+    message.message_id = message_id
+    message.edit_text = AsyncMock()
+    return message
+
+
+def _callback(data: str, message: Message) -> CallbackQuery:
+    callback = MagicMock(spec=CallbackQuery)
+    callback.data = data
+    callback.message = message
+    callback.answer = AsyncMock()
+    return callback
+
+
+async def test_status_pager_is_kept_per_message():
+    registry = TaskRegistry()
+    registry.register(_Task("alpha"))
+    registry.run_all_checks = AsyncMock(return_value=_big_reports())
+    command, sent = _message(10), _message(11)
+    command.text = "/status full"
+    command.answer = AsyncMock(return_value=sent)
+
+    await health.cmd_status(command, None, registry)
+    keyboard = command.answer.call_args.kwargs["reply_markup"]
+    buttons = [b.callback_data for row in keyboard.inline_keyboard for b in row]
+    assert buttons[0] == "check:task:alpha"
+    assert "status:noop" in buttons and "status:page:1" in buttons
+
+    await health.cb_status_page(_callback("status:page:1", sent), registry)
+    assert sent.edit_text.call_args.args[0] != command.answer.call_args.args[0]
+
+    # Another message in the same chat does not share the pages
+    other = _callback("status:page:1", _message(12))
+    await health.cb_status_page(other, registry)
+    other.answer.assert_awaited_once_with("Report expired, press Refresh", show_alert=True)
+
+    # Refreshing an unchanged report still answers the callback
+    sent.edit_text.side_effect = TelegramBadRequest(
+        MagicMock(), "Bad Request: message is not modified"
+    )
+    refresh = _callback("status:refresh", sent)
+    await health.cb_status_refresh(refresh, registry)
+    refresh.answer.assert_awaited_once_with("Updated")
+
+
+def test_oversized_check_is_clipped():
+    check = HealthCheckResult(name="GPU", status=CheckStatus.OK, message="<x>" * 5000)
+    line = telegram.format_check_line(check, limit=200)
+    assert len(line) <= 200
+    assert line.endswith("…")
+    assert "<x>" not in line
+
+
+def test_summary_lists_only_unhealthy_checks():
+    pages = telegram.render_status_pages(_big_reports(), summary=True)
+    assert len(pages) == 1
+    assert "179/180 checks OK" in pages[0]
+    assert "Task 3" in pages[0]
+    assert "Task 4" not in pages[0]
+
+
+def test_blocked_checks_grouped_under_root_cause():
+    report = TaskHealthReport(
+        task_name="test",
+        task_display_name="Test Task",
+        is_healthy=False,
+        checks=[
+            HealthCheckResult(name="Network", status=CheckStatus.CRITICAL, message="unreachable"),
+            HealthCheckResult(
+                name="vLLM API", status=CheckStatus.UNKNOWN, message="Blocked by Network",
+                details={"blocked_by": "Network"},
+            ),
+            HealthCheckResult(
+                name="Jira API", status=CheckStatus.UNKNOWN, message="Blocked by Network",
+                details={"blocked_by": "Network"},
+            ),
+            HealthCheckResult(name="GPU", status=CheckStatus.OK, message="OK"),
+        ],
+    )
+    for text in (telegram.format_task_detail(report), telegram.format_alert("test", report)):
+        assert "blocked: vLLM API, Jira API" in text
+        assert "<b>vLLM API</b>" not in text
+    assert report.summary == "1 check(s) failed: Network"
+
+
+def test_alerts_escape_names():
+    report = TaskHealthReport(
+        task_name="test",
+        task_display_name="R&D <GPU>",
+        is_healthy=False,
+        checks=[
+            HealthCheckResult(name="a<b>", status=CheckStatus.CRITICAL, message="down"),
+            HealthCheckResult(name="x&y", status=CheckStatus.OK, message="OK"),
+        ],
+    )
+    alert = telegram.format_alert("test", report)
+    assert "<b>R&amp;D &lt;GPU&gt;</b>" in alert
+    assert "Remaining checks OK: x&amp;y" in alert
+    assert "R&amp;D &lt;GPU&gt;" in telegram.format_recovery("test", report)
+
+
+def test_compact_report_model():
+    result = HealthCheckResult(name="".join(["check", "1"]), status=CheckStatus.OK, message="OK")
+    assert not hasattr(result, "__dict__")
+    assert result.name is _report().checks[0].name
+    assert result.details == {}
+    assert HealthCheckResult("a", CheckStatus.OK, "").details is result.details
+
+    report = _report()
+    assert not hasattr(report, "__dict__")
+    assert report._summary is None
+    assert report.summary == "All systems operational"
+    assert report.timestamp == "2026-01-01T00:00:00"
+    assert "Checked at: 2026-01-01T00:00:00" in telegram.format_task_detail(report)
+
+    fresh = TaskHealthReport("test", "Test Task", True, [])
+    assert fresh.checked_at <= time.monotonic()
+    assert abs(fresh.wall_time - time.time()) < 1
+
+
+def test_report_time_survives_clock_step(monkeypatch):
+    report = TaskHealthReport("test", "Test Task", True, [], timestamp="2026-01-01T00:00:00")
+    fresh = TaskHealthReport("test", "Test Task", True, [])
+    shown = fresh.timestamp
+    # The system clock is stepped an hour forward after the checks ran
+    wall = time.time
+    monkeypatch.setattr(time, "time", lambda: wall() + 3600)
+    assert report.timestamp == "2026-01-01T00:00:00"
+    assert fresh.timestamp == shown
+    # A bare monotonic stamp is placed with the clock as it is now
+    moved = TaskHealthReport("test", "Test Task", True, [], checked_at=fresh.checked_at)
+    assert moved.wall_time - fresh.wall_time == pytest.approx(3600, abs=1)
@@ -0,0 +1,146 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import CallbackQuery, Message
+
+from bot.db.models import HealthLog
+from bot.db.queries import get_health_log_buckets, get_recent_health_logs
+from bot.handlers import history
+
+T0 = datetime(2026, 1, 1)
+
+
+def _epoch(moment: datetime) -> int:
+    return int((moment - datetime(1970, 1, 1)).total_seconds())
+
+
+async def _seed(session, count: int = 100):
+    # Two checks logged in the same cycle share checked_at: ids break the tie
+    session.add_all(
+        HealthLog(
+            task_name="doc",
+            check_name=f"check{i % 2}",
+            status="critical" if i % 10 == 0 else "ok",
+            message=f"run {i}",
+            response_time_ms=10.0,
+            checked_at=T0 + timedelta(minutes=i // 2),
+        )
+        for i in range(count)
+    )
+    await session.commit()
+
+
+async def test_keyset_pages_cover_every_row_once(db_session):
+    await _seed(db_session)
+    seen, cursor = [], None
+    while page := await get_recent_health_logs(db_session, "doc", 7, before=cursor):
+        seen.extend(log.id for log in page)
+        cursor = (page[-1].checked_at, page[-1].id)
+    assert seen == list(range(100, 0, -1))
+
+    only = await get_recent_health_logs(db_session, "doc", 100, check_name="check1")
+    assert len(only) == 50 and {log.check_name for log in only} == {"check1"}
+
+
+async def test_buckets_count_statuses(db_session):
+    await _seed(db_session, 240)  # two hours of two checks per minute
+    buckets = await get_health_log_buckets(
+        db_session, "doc", T0, T0 + timedelta(hours=2), 3600
+    )
+    assert [(b[0], b[1], b[2], b[4]) for b in buckets] == [
+        (_epoch(T0) + 3600, 120, 108, 12),
+        (_epoch(T0), 120, 108, 12),
+    ]
+
+
+def _message(text: str) -> Message:
+    message = MagicMock(spec=Message)
+    message.text = text
+    message.chat = SimpleNamespace(id=1)
+    message.answer = AsyncMock()
+    return message
+
+
+def _callback(data: str, message: Message) -> CallbackQuery:
+    callback = MagicMock(spec=CallbackQuery)
+    callback.data = data
+    callback.message = message
+    message.edit_text = AsyncMock()
+    callback.answer = AsyncMock()
+    return callback
+
+
+async def test_history_pages_and_cache(db_session, monkeypatch):
+    await _seed(db_session)
+    registry = MagicMock()
+    registry.get.return_value = SimpleNamespace(display_name="Documentation")
+    fetches = []
+    original = history.get_recent_health_logs
+
+    async def counting(*args, **kwargs):
+        fetches.append(kwargs.get("before"))
+        return await original(*args, **kwargs)
+
+    monkeypatch.setattr(history, "get_recent_health_logs", counting)
+
+    message = _message("/history doc check1")
+    await history.cmd_history(message, None, db_session, registry)
+    text = message.answer.call_args.args[0]
+    assert "History: Documentation / check1" in text
+    assert "run 99" in text and "run 98" not in text
+
+    await history.cb_history(_callback("history:page:1", message), db_session)
+    older = message.edit_text.call_args.args[0]
+    assert f"run {99 - 2 * history.PAGE_SIZE}" in older
+    # Back and forth again: served from the chat's page cache
+    for page in (0, 1, 0):
+        await history.cb_history(_callback(f"history:page:{page}", message), db_session)
+    assert len(fetches) == 2
+    assert fetches[1] is not None
+
+    # Pages not reached yet cannot be requested directly
+    stale = _callback("history:page:9", message)
+    await history.cb_history(stale, db_session)
+    assert stale.answer.call_args.kwargs["show_alert"]
+
+
+async def test_history_condensed_view(db_session):
+    await _seed(db_session, 240)
+    registry = MagicMock()
+    registry.get.return_value = SimpleNamespace(display_name="Documentation")
+    message = _message("/history doc")
+    await history.cmd_history(message, None, db_session, registry)
+
+    await history.cb_history(_callback("history:mode", message), db_session)
+    text = message.edit_text.call_args.args[0]
+    assert "2026-01-01 01:00</code> 108/120 OK, 12 critical" in text
+    assert "2026-01-01 00:00</code>" in text
+    keyboard = message.edit_text.call_args.kwargs["reply_markup"]
+    assert not any(
+        b.callback_data.startswith("history:page:") for row in keyboard.inline_keyboard for b in row
+    )
+
+
+async def test_unchanged_refresh_is_answered(db_session):
+    await _seed(db_session, 10)
+    registry = MagicMock()
+    registry.get.return_value = SimpleNamespace(display_name="Documentation")
+    message = _message("/history doc")
+    await history.cmd_history(message, None, db_session, registry)
+
+    refresh = _callback("history:refresh", message)
+    message.edit_text.side_effect = TelegramBadRequest(
+        MagicMock(), "Bad Request: message is not modified"
+    )
+    await history.cb_history(refresh, db_session)
+    refresh.answer.assert_awaited_once_with()
+
+
+async def test_unknown_task_name_is_escaped(db_session):
+    registry = MagicMock()
+    registry.get.return_value = None
+    message = _message("/history <b>")
+    await history.cmd_history(message, None, db_session, registry)
+    assert "<code>&lt;b&gt;</code>" in message.answer.call_args.args[0]
@@ -0,0 +1,210 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from bot.checks.base import CheckStatus, HealthCheckResult
+from bot.db.engine import create_engine, create_session_factory, init_db
+from bot.db.models import HealthLog, NotificationPreference
+from bot.db.queries import acquire_lease, get_lease
+from bot.notifications.engine import NotificationEngine
+from bot.runtime.leader import LeaderElection
+from bot.tasks.base import BaseTask, TaskHealthReport
+from bot.tasks.registry import TaskRegistry
+
+TTL = 0.4
+RENEW = 0.05
+
+
+class _CountingTask(BaseTask):
+
+    def __init__(self):
+        self.runs = 0
+        self.gate: asyncio.Event | None = None
+
+    @property
+    def name(self) -> str:
+        return "counting"
+
+    @property
+    def display_name(self) -> str:
+        return "Counting"
+
+    @property
+    def description(self) -> str:
+        return ""
+
+    async def run_health_checks(self) -> TaskHealthReport:
+        self.runs += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        return TaskHealthReport(
+            task_name=self.name,
+            task_display_name=self.display_name,
+            is_healthy=True,
+            checks=[HealthCheckResult("count", CheckStatus.OK, str(self.runs))],
+        )
+
+
+@pytest.fixture
+async def shared_db(tmp_path):
+    """One SQLite file, one SQLAlchemy engine per instance (as separate processes would)."""
+    url = f"sqlite+aiosqlite:///{tmp_path / 'bot.db'}"
+    engines = [create_engine(url), create_engine(url)]
+    await init_db(engines[0])
+    yield [create_session_factory(engine) for engine in engines]
+    for engine in engines:
+        await engine.dispose()
+
+
+class _Instance:
+    """A bot instance: an engine that only runs while elected."""
+
+    def __init__(self, name: str, factory, **leader_options):
+        self.task = _CountingTask()
+        registry = TaskRegistry()
+        registry.register(self.task)
+        config = SimpleNamespace(
+            health_check_interval=0.05,
+            check_interval_min=0.05,
+            check_interval_max=0.05,
+            first_check_delay=0,
+            notification_cooldown=300,
+            shutdown_drain_timeout=1,
+        )
+        self.engine = NotificationEngine(AsyncMock(), registry, factory, config)
+        self.leader = LeaderElection(
+            factory,
+            on_elected=lambda: self.engine.start(resume=True),
+            on_demoted=lambda flush: self.engine.stop(flush=flush),
+            holder=name,
+            ttl=TTL,
+            renew_interval=RENEW,
+            **leader_options,
+        )
+
+    def crash(self):
+        """Die without releasing the lease or stopping cleanly."""
+        if self.leader._task is not None:
+            self.leader._task.cancel()
+        self.engine._task.cancel()
+
+
+async def _until(condition, timeout: float = 5.0) -> float:
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    while not condition():
+        if loop.time() - start > timeout:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0.01)
+    return loop.time() - start
+
+
+async def test_lease_excludes_other_holders(shared_db):
+    factory = shared_db[0]
+    async with factory() as session:
+        assert await acquire_lease(session, "monitor", "a", 10, now=100.0) == 1
+        assert await acquire_lease(session, "monitor", "b", 10, now=105.0) is None
+        assert await acquire_lease(session, "monitor", "a", 10, now=105.0) == 1
+        # Expired: b takes over with a new term
+        assert await acquire_lease(session, "monitor", "b", 10, now=116.0) == 2
+        lease = await get_lease(session, "monitor")
+        assert (lease.holder, lease.expires_at) == ("b", 126.0)
+
+
+async def test_only_one_instance_runs_the_loop(shared_db):
+    a, b = _Instance("a", shared_db[0]), _Instance("b", shared_db[1])
+    await a.leader.start()
+    await _until(lambda: a.leader.is_leader)
+    await b.leader.start()
+    await _until(lambda: a.task.runs >= 1)
+    await asyncio.sleep(5 * RENEW)
+
+    assert not b.leader.is_leader
+    assert b.task.runs == 0
+    await b.leader.stop()
+    await a.leader.stop()
+
+
+async def test_follower_takes_over_after_crash(shared_db):
+    # Campaigns are driven by hand against a fake clock, so timing cannot flake
+    now = [100.0]
+    a = _Instance("a", shared_db[0], clock=lambda: now[0])
+    b = _Instance("b", shared_db[1], clock=lambda: now[0])
+    await a.leader.campaign()
+    await b.leader.campaign()
+    assert a.leader.is_leader and not b.leader.is_leader
+
+    a.crash()
+    now[0] += TTL - 0.01
+    await b.leader.campaign()
+    assert not b.leader.is_leader
+    now[0] += 0.02
+    await b.leader.campaign()
+    assert b.leader.is_leader
+    assert b.leader.term == a.leader.term + 1
+    await _until(lambda: b.task.runs >= 1)
+    await b.leader.stop()
+
+
+async def test_clean_stop_hands_over_without_waiting_for_ttl(shared_db):
+    a, b = _Instance("a", shared_db[0]), _Instance("b", shared_db[1])
+    await a.leader.start()
+    await _until(lambda: a.leader.is_leader)
+    await b.leader.start()
+
+    await a.leader.stop()
+    assert a.engine._task is None
+    waited = await _until(lambda: b.leader.is_leader)
+    assert waited < TTL
+    await b.leader.stop()
+
+
+async def test_new_leader_resumes_from_logged_state(shared_db):
+    factory = shared_db[1]
+    async with factory() as session:
+        session.add(HealthLog(task_name="counting", check_name="count", status="critical"))
+        session.add(NotificationPreference(user_id=1, task_name="counting", is_enabled=True))
+        await session.commit()
+
+    b = _Instance("b", factory)
+    await b.leader.start()
+    await _until(lambda: b.task.runs >= 1 and not b.engine._pending_reports)
+    await b.leader.stop()
+    # The previous leader last saw it failing: this instance sends the recovery
+    b.engine.bot.send_message.assert_awaited_once()
+
+
+async def test_lost_lease_stops_without_flushing(shared_db):
+    factory = shared_db[0]
+    async with factory() as session:
+        session.add(NotificationPreference(user_id=1, task_name="counting", is_enabled=True))
+        await session.commit()
+    a = _Instance("a", factory)
+    a.task.gate = asyncio.Event()
+    await a.leader.start()
+    await _until(lambda: a.task.runs >= 1)
+    # A cycle is stuck and a transition is waiting to be sent
+    report = TaskHealthReport(
+        task_name="counting", task_display_name="Counting", is_healthy=False, checks=[]
+    )
+    a.engine._pending_reports.append(("counting", report))
+    a.engine._pending_transitions.append(("counting", report))
+
+    # Another instance took the lease (e.g. after a long pause of this one)
+    async with factory() as session:
+        lease = await get_lease(session, "monitor")
+        lease.holder, lease.expires_at = "b", lease.expires_at + 3600
+        await session.commit()
+    await _until(lambda: not a.leader.is_leader)
+    # Cancelled at once rather than drained for shutdown_drain_timeout
+    waited = await _until(lambda: a.engine._task is None)
+    assert waited < a.engine.config.shutdown_drain_timeout / 2
+    assert not a.leader._task.done()
+
+    a.engine.bot.send_message.assert_not_awaited()
+    assert not a.engine._pending_transitions
+    async with factory() as session:
+        assert (await session.execute(HealthLog.__table__.select())).first() is None
+    await a.leader.stop()
@@ -0,0 +1,96 @@
+import pytest
+
+from bot.checks import process
+from bot.checks.base import CheckStatus
+from bot.checks.breaker import CircuitBreakerCheck
+from bot.config import Settings
+from bot.tasks.loader import build_tasks, load_tasks
+from bot.tasks.registry import TaskRegistry
+
+
+def _settings() -> Settings:
+    return Settings(telegram_bot_token="test", initial_admin_id=1)
+
+
+def test_example_config_loads(monkeypatch):
+    monkeypatch.setenv("JIRA_URL", "https://jira.example")
+    tasks = load_tasks("config.example.yaml", _settings())
+
+    assert [t.name for t in tasks] == ["documentation", "inference"]
+    docs = {c.name: c for c in tasks[0].checks}
+    assert docs["Jira tasks"].depends_on == ("Jira API",)
+    assert isinstance(docs["vLLM API"].inner, CircuitBreakerCheck)
+    assert docs["Claude CLI"].inner.command == ["claude", "--version"]
+    assert docs["Jira API"].inner.check.jira_url == "https://jira.example"
+    # The same vLLM and GPU definitions back both tasks
+    inference = {c.name: c for c in tasks[1].checks}
+    assert inference["GPU"].inner is docs["GPU"].inner
+    assert inference["vLLM API"].inner is docs["vLLM API"].inner
+
+
+def test_unknown_type_and_bad_options_are_reported():
+    with pytest.raises(ValueError, match="unknown type 'ftp'"):
+        build_tasks({"tasks": {"t": {"checks": [{"name": "x", "type": "ftp"}]}}}, _settings())
+    with pytest.raises(ValueError, match="task 't' check 'x'"):
+        build_tasks(
+            {"tasks": {"t": {"checks": [{"name": "x", "type": "gpu", "bogus": 1}]}}}, _settings()
+        )
+
+
+@pytest.mark.parametrize(
+    "config, message",
+    [
+        ({"tasks": ["t"]}, "tasks: expected a mapping"),
+        ({"tasks": {"t": ["gpu"]}}, "task 't': expected a mapping"),
+        ({"tasks": {"t": {"checks": ["gpu"]}}}, "task 't': check 'gpu' must be a mapping"),
+        ({"tasks": {"t": {"checks": {"name": "x"}}}}, "task 't': checks must be a list"),
+        (
+            {"tasks": {"t": {"checks": [{"name": "x", "type": "gpu", "depends_on": "y"}]}}},
+            "task 't' check 'x': depends_on must be a list",
+        ),
+        (
+            {"tasks": {"t": {"checks": [{"name": "x", "type": "file", "path": ""}]}}},
+            "task 't' check 'x': path is empty",
+        ),
+    ],
+)
+def test_malformed_config_is_reported(config, message):
+    with pytest.raises(ValueError, match=message):
+        build_tasks(config, _settings())
+
+
+def test_env_defaults_follow_the_shell(monkeypatch):
+    monkeypatch.setenv("JIRA_PROJECT", "")
+    monkeypatch.delenv("CYCLE_RUNNER_LOCK_PATH", raising=False)
+    docs = {c.name: c for c in load_tasks("config.example.yaml", _settings())[0].checks}
+    # Set but empty: the default applies
+    assert docs["Jira API"].inner.check.project == "DOCS"
+    # No lock path: the check is left out rather than watching the working directory
+    assert "Cycle Runner" not in docs
+
+    monkeypatch.setenv("CYCLE_RUNNER_LOCK_PATH", "/tmp/cycle.lock")
+    docs = {c.name: c for c in load_tasks("config.example.yaml", _settings())[0].checks}
+    assert str(docs["Cycle Runner"].inner.path) == "/tmp/cycle.lock"
+
+
+async def test_shared_check_runs_once_per_cycle(tmp_path):
+    spec = {"type": "subprocess", "command": "echo shared"}
+    config = {
+        "tasks": {
+            "a": {"checks": [{"name": "probe", **spec}]},
+            "b": {"checks": [{"name": "same probe", **spec}]},
+        }
+    }
+    registry = TaskRegistry()
+    for task in build_tasks(config, _settings()):
+        registry.register(task)
+
+    spawned = process.get_runner().stats()["spawned"]
+    reports = await registry.run_all_checks()
+    assert process.get_runner().stats()["spawned"] == spawned + 1
+    assert reports["b"].checks[0].name == "same probe"
+    assert reports["b"].checks[0].status == CheckStatus.OK
+
+    # A new run executes it again
+    await registry.run_all_checks()
+    assert process.get_runner().stats()["spawned"] == spawned + 2
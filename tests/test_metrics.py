@@ -0,0 +1,102 @@
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from bot.checks.base import CheckStatus, HealthCheckResult
+from bot.metrics import instruments
+from bot.metrics.core import Counter, Gauge, Histogram, MetricsRegistry, make_metrics_view
+
+
+def test_render_text_format():
+    registry = MetricsRegistry()
+    runs = Counter("runs_total", "Runs", ("check",), registry=registry)
+    depth = Gauge("queue_depth", "Depth", registry=registry)
+    latency = Histogram("latency_seconds", "Latency", buckets=(0.1, 1.0), registry=registry)
+
+    runs.labels('vLLM "API"').inc()
+    runs.labels('vLLM "API"').inc(2)
+    depth.set(3)
+    for value in (0.05, 0.5, 5):
+        latency.observe(value)
+
+    text = registry.render()
+    assert "# TYPE runs_total counter" in text
+    assert 'runs_total{check="vLLM \\"API\\""} 3' in text
+    assert "queue_depth 3" in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1"} 2' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+    assert "latency_seconds_count 3" in text
+
+
+def test_gauge_function_read_at_scrape():
+    registry = MetricsRegistry()
+    depth = Gauge("pending", "Pending", registry=registry)
+    items = [1, 2]
+    depth.set_function(lambda: len(items))
+    items.append(3)
+    assert "pending 3" in registry.render()
+
+
+def test_record_check_updates_status_and_gpu():
+    result = HealthCheckResult(
+        name="GPU", status=CheckStatus.WARNING, message="", response_time_ms=120,
+        details={"gpus": [{"index": 0, "name": "GB10", "utilization": 97,
+                           "memory_used": None, "memory_total": None, "temperature": 85}]},
+    )
+    instruments.record_check("documentation", result, 0.2)
+
+    assert instruments.CHECK_STATUS.labels("documentation", "GPU").value == 1
+    assert instruments.CHECK_RESPONSE_TIME.labels("documentation", "GPU").value == 0.12
+    assert instruments.GPU_TEMPERATURE.labels(0, "GB10").value == 85
+    assert instruments.CHECK_RUNS.labels("documentation", "GPU", "warning").value >= 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint():
+    registry = MetricsRegistry()
+    Counter("scrapes_total", "Scrapes", registry=registry).inc()
+    app = web.Application()
+    app.router.add_get("/metrics", make_metrics_view(registry))
+
+    async with TestClient(TestServer(app)) as client:
+        resp = await client.get("/metrics")
+        assert resp.status == 200
+        assert resp.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        assert "scrapes_total 1" in await resp.text()
+
+
+def test_histogram_quantiles():
+    latency = Histogram("q_seconds", "Q", buckets=(0.1, 0.2, 0.5, 1.0), registry=None)
+    for _ in range(90):
+        latency.observe(0.05)
+    for _ in range(10):
+        latency.observe(0.4)
+    child = latency.labels()
+    assert child.quantile(0.5) < 0.1
+    assert 0.2 < child.quantile(0.95) <= 0.5
+    assert latency.labels().quantile(0.99) <= 0.5
+
+
+@pytest.mark.asyncio
+async def test_phase_timing_attributed_to_handler():
+    import asyncio
+
+    from bot.metrics.timing import collect_phases, phase_timer, timed
+
+    @timed("db")
+    async def inner():
+        await asyncio.sleep(0.01)
+
+    @timed("db")
+    async def outer():
+        await inner()
+
+    with collect_phases() as phases:
+        await outer()
+        with phase_timer("telegram", "sendMessage"):
+            await asyncio.sleep(0.01)
+
+    # Nested db calls are counted once
+    assert 0.01 <= phases["db"] < 0.02
+    assert phases["telegram"] >= 0.01
@@ -1,9 +1,20 @@
+import asyncio
+import os
+from types import SimpleNamespace
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
+from bot.checks import process
 from bot.checks.base import CheckStatus, HealthCheckResult
+from bot.checks.subprocess_check import SubprocessCheck
+from bot.db.models import HealthLog, NotificationPreference
+from bot.metrics.instruments import NOTIFICATIONS_PENDING
 from bot.notifications.engine import NotificationEngine
-from bot.tasks.base import TaskHealthReport
+from bot.tasks.base import BaseTask, TaskHealthReport
+from bot.tasks.registry import TaskRegistry
 
 
 def _make_report(is_healthy: bool, task_name: str = "test") -> TaskHealthReport:
@@ -53,3 +64,153 @@ async def test_edge_triggered_no_notification_same_state():
 
     # No transition
     assert prev_healthy == now_healthy
+
+
+class _CommandTask(BaseTask):
+
+    def __init__(self, name: str, command: list[str]):
+        self._name = name
+        self.check = SubprocessCheck(f"{name}-cmd", command, timeout=60)
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def display_name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> str:
+        return ""
+
+    async def run_health_checks(self) -> TaskHealthReport:
+        result = await self.check.execute()
+        return TaskHealthReport(
+            task_name=self.name,
+            task_display_name=self.name,
+            is_healthy=result.status == CheckStatus.OK,
+            checks=[result],
+        )
+
+
+def _engine(db_engine, *tasks, bot=None):
+    registry = TaskRegistry()
+    for task in tasks:
+        registry.register(task)
+    config = SimpleNamespace(
+        health_check_interval=60,
+        check_interval_min=60,
+        check_interval_max=60,
+        first_check_delay=0,
+        notification_cooldown=300,
+        shutdown_drain_timeout=5,
+    )
+    factory = async_sessionmaker(db_engine, expire_on_commit=False)
+    return NotificationEngine(bot or AsyncMock(), registry, factory, config), factory
+
+
+def _running_in_group(pgid: int) -> list[int]:
+    """Pids in the process group that are not zombies (init may reap them late)."""
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[2]) == pgid and fields[0] != "Z":
+            pids.append(int(entry))
+    return pids
+
+
+async def _logs(factory):
+    async with factory() as session:
+        result = await session.execute(select(HealthLog.task_name, HealthLog.status))
+        return sorted(result.all())
+
+
+async def test_stop_waits_for_inflight_cycle(db_engine):
+    engine, factory = _engine(db_engine, _CommandTask("short", ["sleep", "0.2"]))
+    await engine.start()
+    await asyncio.sleep(0.05)
+    await engine.stop(timeout=5)
+
+    assert await _logs(factory) == [("short", "ok")]
+
+
+async def test_stop_kills_process_group_and_flushes_results(db_engine):
+    bot = AsyncMock()
+    engine, factory = _engine(
+        db_engine,
+        _CommandTask("fast", ["true"]),
+        # The shell's background child shares its process group
+        _CommandTask("hung", ["sh", "-c", "sleep 30 & sleep 30"]),
+        bot=bot,
+    )
+    async with factory() as session:
+        session.add(NotificationPreference(user_id=1, task_name="fast", is_enabled=True))
+        await session.commit()
+    engine._previous_healthy["fast"] = False
+
+    await engine.start()
+    for _ in range(200):
+        if process.live_count():
+            break
+        await asyncio.sleep(0.01)
+    pgid = next(iter(process._live)).pid
+    assert _running_in_group(pgid)
+
+    await engine.stop(timeout=0.2)
+
+    assert process.live_count() == 0
+    assert _running_in_group(pgid) == []
+    # Completed results and the resulting recovery notice survive the cancel
+    assert await _logs(factory) == [("fast", "ok")]
+    bot.send_message.assert_awaited_once()
+
+
+async def test_wake_starts_cycle_early(db_engine):
+    engine, factory = _engine(db_engine, _CommandTask("fast", ["true"]))
+    # The in-memory database is one shared connection: reading it while the
+    # engine writes can roll back the engine's insert, so wait on cycles instead
+    cycles = asyncio.Queue()
+    engine.on_cycle.append(cycles.put_nowait)
+    await engine.start()
+    await asyncio.wait_for(cycles.get(), timeout=5)
+
+    # The interval is 60s: only the wake can start the second cycle
+    engine.wake()
+    await asyncio.wait_for(cycles.get(), timeout=5)
+    await engine.stop()
+
+    assert len(await _logs(factory)) == 2
+
+
+async def test_pending_notifications_counted_until_sent(db_engine):
+    sending = asyncio.Event()
+
+    async def stuck_send(*args, **kwargs):
+        sending.set()
+        await asyncio.Event().wait()
+
+    bot = AsyncMock()
+    bot.send_message.side_effect = stuck_send
+    engine, factory = _engine(db_engine, bot=bot)
+    async with factory() as session:
+        for user_id in (1, 2):
+            session.add(NotificationPreference(user_id=user_id, task_name="test", is_enabled=True))
+        await session.commit()
+
+        send = asyncio.create_task(
+            engine._send_notifications(session, "test", _make_report(False), False)
+        )
+        await sending.wait()
+        # The first one is in flight, neither is sent yet
+        assert NOTIFICATIONS_PENDING.value == 2
+        send.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await send
+    assert NOTIFICATIONS_PENDING.value == 0
@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from bot.transport.processor import UpdateProcessor
+
+
+async def _settle(processor: UpdateProcessor):
+    # A chat's worker exits once its queue is empty
+    while processor._workers:
+        await asyncio.gather(*processor._workers.values(), return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_per_chat_order_preserved():
+    processor = UpdateProcessor(concurrency=4)
+    seen = []
+
+    def job(i, delay):
+        async def run():
+            await asyncio.sleep(delay)
+            seen.append(i)
+        return run
+
+    for i, delay in enumerate([0.05, 0.01, 0.03, 0]):
+        processor.submit(1, job(i, delay))
+    await _settle(processor)
+    assert seen == [0, 1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_slow_chat_does_not_block_other_chats():
+    processor = UpdateProcessor(concurrency=2)
+    release = asyncio.Event()
+    done = []
+
+    async def slow():
+        await release.wait()
+        done.append("slow")
+
+    async def fast():
+        done.append("fast")
+
+    processor.submit(1, slow)
+    processor.submit(1, fast)  # same chat: waits for slow
+    processor.submit(2, fast)
+    await asyncio.sleep(0.05)
+    assert done == ["fast"]
+
+    release.set()
+    await _settle(processor)
+    assert done == ["fast", "slow", "fast"]
+
+
+@pytest.mark.asyncio
+async def test_global_concurrency_limit():
+    processor = UpdateProcessor(concurrency=2)
+    peak = 0
+
+    async def run():
+        nonlocal peak
+        peak = max(peak, processor.in_flight)
+        await asyncio.sleep(0.02)
+
+    for chat in range(6):
+        processor.submit(chat, run)
+    await _settle(processor)
+    assert peak == 2
+    assert processor.processed == 6
+    assert processor.max_wait > 0
+
+
+@pytest.mark.asyncio
+async def test_duplicate_callbacks_collapse_when_saturated():
+    processor = UpdateProcessor(concurrency=1, max_pending=3, saturation=1)
+    release = asyncio.Event()
+    runs = []
+
+    async def run():
+        runs.append(1)
+        await release.wait()
+
+    assert processor.submit(1, run, dedup_key=(1, "status:refresh"))
+    await asyncio.sleep(0)
+    assert processor.submit(1, run, dedup_key=(1, "status:refresh"))
+    # First job is running, second is queued: further identical taps collapse
+    assert not processor.submit(1, run, dedup_key=(1, "status:refresh"))
+    assert processor.submit(1, run, dedup_key=(1, "check:task:doc"))
+    assert processor.submit(2, run, dedup_key=(2, "status:refresh"))
+    # max_pending reached: new callback queries and messages are shed
+    assert processor.full
+    assert not processor.submit(3, run, dedup_key=(3, "status:refresh"))
+    assert not processor.submit(3, run)
+    assert processor.collapsed == 1
+    assert processor.shed == 2
+
+    release.set()
+    await _settle(processor)
+    assert len(runs) == 4
@@ -0,0 +1,206 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiogram.types import Message
+
+from bot.checks.base import CheckStatus, HealthCheckResult
+from bot.config import Settings
+from bot.handlers.reload import cmd_reload
+from bot.metrics.instruments import (
+    CHECK_BREAKER_OPEN,
+    CHECK_DURATION,
+    CHECK_INTERVAL,
+    CHECK_RUNS,
+    CHECK_STATUS,
+    record_check,
+)
+from bot.notifications.engine import NotificationEngine
+from bot.notifications.schedule import AdaptiveScheduler
+from bot.tasks.loader import ConfigError
+from bot.tasks.registry import TaskRegistry
+from bot.tasks.remote import RemoteNodeTask
+from bot.tasks.reload import ConfigReloader, ReloadDiff
+
+CONFIG = """
+tasks:
+  pipeline:
+    checks:
+      - {{name: cli, type: subprocess, command: "echo {version}", cache_max_age: 60}}
+      - {{name: lock, type: file, path: "{lock}"}}
+"""
+
+
+def _reloader(tmp_path, version="v1"):
+    path = tmp_path / "tasks.yaml"
+    path.write_text(CONFIG.format(version=version, lock=tmp_path / "run.lock"))
+    settings = Settings(telegram_bot_token="test", initial_admin_id=1)
+    registry = TaskRegistry()
+    reloader = ConfigReloader(path, settings, registry)
+    reloader.load()
+    return reloader, registry, path
+
+
+def _checks(registry):
+    return {c.name: c for c in registry.get("pipeline").checks}
+
+
+async def test_reload_keeps_unchanged_checks(tmp_path):
+    reloader, registry, path = _reloader(tmp_path)
+    before = _checks(registry)
+    await registry.run_all_checks()
+
+    path.write_text(CONFIG.format(version="v2", lock=tmp_path / "run.lock"))
+    diff = await reloader.reload()
+
+    after = _checks(registry)
+    assert diff.changed == ["pipeline/cli"]
+    assert diff.unchanged == ["pipeline/lock"]
+    assert after["lock"].inner is before["lock"].inner
+    assert after["cli"].inner is not before["cli"].inner
+    # The unchanged check's last result survives the swap
+    assert "lock" in registry.get("pipeline")._last_results
+
+
+async def test_bad_config_keeps_running_registry(tmp_path):
+    reloader, registry, path = _reloader(tmp_path)
+    version = registry.version
+    task = registry.get("pipeline")
+
+    path.write_text("tasks:\n  pipeline:\n    checks:\n      - {name: x, type: nope}\n")
+    with pytest.raises(ValueError):
+        await reloader.reload()
+    assert registry.version == version
+    assert registry.get("pipeline") is task
+
+
+async def test_file_change_triggers_reload(tmp_path):
+    reloader, registry, path = _reloader(tmp_path)
+    version = registry.version
+    await reloader.watch(poll_interval=0.05)
+    try:
+        path.write_text(CONFIG.format(version="v3", lock=tmp_path / "run.lock"))
+        for _ in range(100):
+            if registry.version != version:
+                break
+            await asyncio.sleep(0.02)
+    finally:
+        await reloader.stop()
+    assert registry.version == version + 1
+
+
+def test_reload_discards_schedule_of_changed_checks():
+    engine = NotificationEngine.__new__(NotificationEngine)
+    engine.scheduler = AdaptiveScheduler(base=60, min_interval=15, max_interval=300)
+    engine._wake = asyncio.Event()
+    engine._expedite = False
+    engine.scheduler.record("pipeline/cli", CheckStatus.OK)
+    engine.scheduler.record("pipeline/lock", CheckStatus.OK)
+
+    engine.config_reloaded(ReloadDiff(changed=["pipeline/cli"], unchanged=["pipeline/lock"]))
+    assert engine.scheduler.due("pipeline/cli")
+    assert not engine.scheduler.due("pipeline/lock")
+    assert engine._wake.is_set() and not engine._expedite
+
+
+def test_reload_drops_series_of_removed_checks():
+    engine = NotificationEngine.__new__(NotificationEngine)
+    engine.scheduler = AdaptiveScheduler(base=60, min_interval=15, max_interval=300)
+    engine._wake = asyncio.Event()
+    engine._expedite = False
+    for key in ("old/cli", "old/lock", "pipeline/lock"):
+        task_name, _, check_name = key.partition("/")
+        record_check(task_name, HealthCheckResult(check_name, CheckStatus.OK, ""), 0.1)
+        engine.scheduler.record(key, CheckStatus.OK)
+    CHECK_BREAKER_OPEN.labels("cli").set(1)
+    CHECK_BREAKER_OPEN.labels("lock").set(0)
+
+    engine.config_reloaded(ReloadDiff(removed=["old/cli", "old/lock"], unchanged=["pipeline/lock"]))
+    for metric in (CHECK_STATUS, CHECK_DURATION, CHECK_RUNS, CHECK_INTERVAL):
+        series = {labels[:2] for labels, _ in metric.children()}
+        assert ("pipeline", "lock") in series
+        assert not series & {("old", "cli"), ("old", "lock")}
+    # "lock" is still used by another task
+    breakers = {labels for labels, _ in CHECK_BREAKER_OPEN.children()}
+    assert ("lock",) in breakers and ("cli",) not in breakers
+
+
+async def test_reload_keeps_agent_node_tasks(tmp_path):
+    reloader, registry, path = _reloader(tmp_path)
+    node = RemoteNodeTask("gpu-2")
+    registry.register(node)
+
+    path.write_text(CONFIG.format(version="v2", lock=tmp_path / "run.lock"))
+    await reloader.reload()
+    assert registry.get("node:gpu-2") is node
+    assert registry.get("pipeline") is not None
+
+
+async def test_failed_reload_leaves_no_checks_in_pool(tmp_path):
+    reloader, registry, path = _reloader(tmp_path)
+    keys = set(reloader._pool._executions)
+
+    # The first task builds fine, the second fails
+    path.write_text(
+        CONFIG.format(version="v2", lock=tmp_path / "run.lock")
+        + "  broken:\n    checks:\n      - {name: x, type: nope}\n"
+    )
+    with pytest.raises(ValueError):
+        await reloader.reload()
+    assert set(reloader._pool._executions) == keys
+
+
+SHARED = """
+tasks:
+  a:
+    checks:
+      - {{name: lock, type: file, path: "{lock}"}}
+{b}
+"""
+SHARED_B = """  b:
+    checks:
+      - {{name: lock, type: file, path: "{lock}"}}
+"""
+
+
+async def test_shared_watcher_runs_while_any_task_uses_it(tmp_path):
+    path = tmp_path / "tasks.yaml"
+    lock = tmp_path / "run.lock"
+    path.write_text(SHARED.format(lock=lock, b=SHARED_B.format(lock=lock)))
+    settings = Settings(telegram_bot_token="test", initial_admin_id=1)
+    registry = TaskRegistry()
+    reloader = ConfigReloader(path, settings, registry, on_change=lambda *args: None)
+    reloader.load()
+    for task in registry.all():
+        await task.start_watching(reloader.on_change)
+    inner = registry.get("a").checks[0].inner
+    assert registry.get("b").checks[0].inner is inner
+
+    await registry.get("b").stop_watching()
+    assert inner._watcher is not None
+
+    # A reload removes b and rebuilds a: the watcher a still needs keeps running
+    await registry.get("b").start_watching(reloader.on_change)
+    path.write_text(SHARED.format(lock=lock, b=""))
+    await reloader.reload()
+    assert registry.get("a").checks[0].inner is inner
+    assert inner._watcher is not None
+
+    await registry.get("a").stop_watching()
+    assert inner._watcher is None
+
+
+async def test_malformed_config_is_reported_by_reload_command(tmp_path):
+    reloader, registry, path = _reloader(tmp_path)
+    task = registry.get("pipeline")
+    # Valid YAML, wrong shape
+    path.write_text("tasks:\n  pipeline:\n    checks: [gpu]\n")
+    with pytest.raises(ConfigError):
+        await reloader.reload()
+
+    message = MagicMock(spec=Message)
+    message.answer = AsyncMock()
+    await cmd_reload(message, SimpleNamespace(is_admin=True), reloader)
+    assert "Reload failed" in message.answer.call_args.args[0]
+    assert registry.get("pipeline") is task
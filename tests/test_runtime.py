@@ -0,0 +1,89 @@
+import asyncio
+import time
+
+import pytest
+
+from bot.checks.base import CheckStatus, HealthCheckResult
+from bot.handlers.perf import format_latency_report, format_perf_report
+from bot.metrics.instruments import HANDLER_LATENCY, HANDLER_PHASE, record_check
+from bot.runtime import proc
+from bot.runtime.loop import LoopLagMonitor
+
+
+def _block_loop(seconds: float):
+    """Hold the event loop the way a blocking call in a handler would."""
+    time.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_loop_lag_monitor_detects_blocking():
+    monitor = LoopLagMonitor(interval=0.01)
+    await monitor.start()
+    await asyncio.sleep(0.03)
+    _block_loop(0.1)
+    await asyncio.sleep(0.03)
+    await monitor.stop()
+    assert monitor.samples >= 2
+    assert monitor.max_lag >= 0.05
+
+
+def test_proc_stats():
+    assert proc.rss_bytes() > 0
+    assert proc.open_fds() > 0
+
+
+def test_perf_report_from_memory():
+    result = HealthCheckResult(name="vLLM <API>", status=CheckStatus.OK, message="OK")
+    record_check("perf-test", result, 0.03)
+    monitor = LoopLagMonitor()
+    monitor.record(0.004)
+
+    text = format_perf_report(monitor)
+    assert "Loop lag     last 4ms" in text
+    assert "perf-test/vLLM &lt;API&gt;" in text
+    assert "RSS" in text and "Open FDs" in text
+
+
+def test_latency_report_splits_handlers_by_phase():
+    HANDLER_LATENCY.labels("latency-test").observe(0.1)
+    HANDLER_PHASE.labels("cmd_latency_test", "checks").observe(0.06)
+    HANDLER_PHASE.labels("cmd_latency_test", "other").observe(0.02)
+
+    text = format_latency_report()
+    assert "latency-test" in text
+    assert "cmd_latency_test" in text and "avg: checks 60, other 20" in text
+
+
+@pytest.mark.asyncio
+async def test_stall_alert_rate_limited():
+    alerts = []
+
+    async def on_stall(lag):
+        alerts.append(lag)
+
+    monitor = LoopLagMonitor(interval=0.01, threshold=0.05, on_stall=on_stall)
+    await monitor.start()
+    for _ in range(2):
+        await asyncio.sleep(0.03)
+        _block_loop(0.08)
+    await asyncio.sleep(0.03)
+    await monitor.stop()
+
+    assert monitor.stalls == 2
+    assert len(alerts) == 1  # second stall within alert_cooldown
+
+
+@pytest.mark.asyncio
+async def test_slow_callbacks_captured_in_debug_mode():
+    monitor = LoopLagMonitor(interval=0.01, slow_callback=0.02)
+    await monitor.start()
+    loop = asyncio.get_running_loop()
+    loop.call_soon(time.sleep, 0.05)
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+    loop.set_debug(False)
+
+    assert monitor.slow_callbacks
+    handle, seconds = monitor.slow_callbacks[-1]
+    assert "sleep" in handle
+    assert seconds >= 0.02
@@ -0,0 +1,49 @@
+from bot.checks.base import CheckStatus
+from bot.notifications.schedule import AdaptiveScheduler
+
+
+def _scheduler(now):
+    return AdaptiveScheduler(
+        base=60, min_interval=15, max_interval=300, stable_runs=3, clock=lambda: now[0]
+    )
+
+
+def test_stable_check_stretches_to_max():
+    now = [0.0]
+    scheduler = _scheduler(now)
+    for _ in range(20):
+        scheduler.record("t/c", CheckStatus.OK, 10)
+    assert scheduler.interval("t/c") == 300
+
+
+def test_warning_tightens_to_min():
+    now = [0.0]
+    scheduler = _scheduler(now)
+    for _ in range(10):
+        scheduler.record("t/c", CheckStatus.OK, 10)
+    scheduler.record("t/c", CheckStatus.WARNING, 10)
+
+    assert scheduler.interval("t/c") == 15
+    assert not scheduler.due("t/c")
+    now[0] = 15
+    assert scheduler.due("t/c")
+
+
+def test_rising_latency_halves_interval():
+    now = [0.0]
+    scheduler = _scheduler(now)
+    scheduler.record("t/c", CheckStatus.OK, 100)
+    scheduler.record("t/c", CheckStatus.OK, 500)
+    assert scheduler.interval("t/c") == 30
+
+
+def test_fewer_runs_per_day_than_fixed_interval():
+    now = [0.0]
+    scheduler = _scheduler(now)
+    runs = 0
+    while now[0] < 86400:
+        if scheduler.due("t/c"):
+            scheduler.record("t/c", CheckStatus.OK, 10)
+            runs += 1
+        now[0] += scheduler.until_next()
+    assert runs < 86400 / 60 / 4
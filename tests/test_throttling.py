@@ -0,0 +1,85 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiogram.types import CallbackQuery
+
+from bot.middlewares.throttling import ThrottlingMiddleware
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _settings(**overrides):
+    values = {"callback_debounce_seconds": 3.0, "callback_rate_per_minute": 60, "callback_burst": 3}
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def _callback(data: str, user_id: int = 1) -> CallbackQuery:
+    callback = MagicMock(spec=CallbackQuery)
+    callback.data = data
+    callback.from_user = SimpleNamespace(id=user_id)
+    callback.answer = AsyncMock()
+    return callback
+
+
+@pytest.mark.asyncio
+async def test_repeated_refresh_is_debounced():
+    clock = _Clock()
+    middleware = ThrottlingMiddleware(_settings(), clock=clock)
+    handler = AsyncMock()
+
+    await middleware(handler, _callback("status:refresh"), {})
+    clock.now += 1
+    tap = _callback("status:refresh")
+    await middleware(handler, tap, {})
+    assert handler.await_count == 1
+    tap.answer.assert_awaited_once()
+
+    clock.now += 3
+    await middleware(handler, _callback("status:refresh"), {})
+    assert handler.await_count == 2
+    # Other users are independent
+    await middleware(handler, _callback("status:refresh", user_id=2), {})
+    assert handler.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_taps_coalesce():
+    middleware = ThrottlingMiddleware(_settings(), clock=_Clock())
+    release = asyncio.Event()
+
+    async def handler(event, data):
+        await release.wait()
+
+    first = asyncio.create_task(middleware(handler, _callback("check:task:doc"), {}))
+    await asyncio.sleep(0)
+    dup = _callback("check:task:doc")
+    await middleware(handler, dup, {})
+    dup.answer.assert_awaited_once()
+    assert middleware.debounced == 1
+    release.set()
+    await first
+
+
+@pytest.mark.asyncio
+async def test_per_user_budget():
+    clock = _Clock()
+    middleware = ThrottlingMiddleware(_settings(), clock=clock)
+    handler = AsyncMock()
+
+    for page in range(5):
+        await middleware(handler, _callback(f"status:page:{page % 2}"), {})
+    assert handler.await_count == 3
+    assert middleware.throttled == 2
+
+    clock.now += 1  # 60/min refills one token per second
+    await middleware(handler, _callback("status:page:0"), {})
+    assert handler.await_count == 4
@@ -0,0 +1,129 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiogram.types import Message
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from bot.db.models import UptimeCounter
+from bot.db.queries import save_health_logs
+from bot.handlers import uptime as uptime_handler
+from bot.metrics.instruments import UPTIME_DRIFT
+from bot.notifications.uptime import BUCKET, WINDOWS, UptimeTracker
+
+DAY = WINDOWS["24h"]
+T0 = 1767225600.0  # 2026-01-01 00:00 UTC
+
+
+class _Clock:
+    def __init__(self):
+        self.now = T0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def tracker(db_engine):
+    factory = async_sessionmaker(db_engine, expire_on_commit=False)
+    clock = _Clock()
+    return UptimeTracker(factory, max_gap=900, rebuild_interval=0, clock=clock), factory, clock
+
+
+async def _log(tracker: UptimeTracker, factory, now: float, statuses: dict[str, str]):
+    """What NotificationEngine._flush does with one batch."""
+    checked_at = datetime.fromtimestamp(now, timezone.utc)
+    rows = [
+        {"task_name": "doc", "check_name": name, "status": status, "message": "",
+         "response_time_ms": 1.0, "checked_at": checked_at}
+        for name, status in statuses.items()
+    ]
+    async with factory() as session:
+        await tracker.record(session, rows, now)
+        await save_health_logs(session, rows)
+
+
+async def _counters(factory, window: int) -> dict[str, tuple]:
+    async with factory() as session:
+        rows = (await session.execute(
+            select(UptimeCounter).where(UptimeCounter.window == window)
+        )).scalars()
+        return {
+            c.check_name: (c.results, c.failures, round(c.up_seconds), round(c.down_seconds))
+            for c in rows
+        }
+
+
+async def test_counters_follow_results_and_slide(tracker):
+    tracker, factory, clock = tracker
+    # api goes down for 10 minutes of every hour; db stays up
+    for minute in range(0, 26 * 60, 5):
+        status = "critical" if minute % 60 >= 50 else "ok"
+        await _log(tracker, factory, T0 + minute * 60, {"api": status, "db": "ok"})
+
+    week = await _counters(factory, WINDOWS["7d"])
+    assert week["db"] == (312, 0, 311 * 300, 0)
+    assert week["api"][1] == 52
+    assert week["api"][3] == 26 * 600 - 300  # the last down interval has no end yet
+
+    # The 24h window has slid past the first hours
+    day = await _counters(factory, DAY)
+    last = T0 + (26 * 60 - 5) * 60
+    first_bucket = int(last) // BUCKET * BUCKET + BUCKET - DAY
+    assert day["db"][0] == (last - first_bucket) // 300 + 1
+
+    # A rebuild from the health logs agrees with the incremental counters
+    drift = UPTIME_DRIFT.value
+    clock.now = last + 30
+    await tracker.rebuild()
+    await _log(tracker, factory, last + 60, {"api": "ok", "db": "ok"})
+    assert UPTIME_DRIFT.value == drift
+    assert (await _counters(factory, DAY))["db"] == (day["db"][0] + 1, 0, day["db"][2] + 60, 0)
+
+
+async def test_gaps_and_unknown_are_not_counted(tracker):
+    tracker, factory, _ = tracker
+    await _log(tracker, factory, T0, {"api": "ok"})
+    await _log(tracker, factory, T0 + 3600, {"api": "critical"})  # monitor was down
+    await _log(tracker, factory, T0 + 3660, {"api": "unknown"})
+    await _log(tracker, factory, T0 + 3720, {"api": "ok"})
+    assert (await _counters(factory, DAY))["api"] == (3, 1, 0, 60)
+
+
+async def test_rebuild_repairs_drift(tracker):
+    tracker, factory, clock = tracker
+    for minute in range(0, 4 * 60, 10):
+        await _log(tracker, factory, T0 + minute * 60, {"api": "ok"})
+    expected = await _counters(factory, DAY)
+    async with factory() as session:
+        await session.execute(update(UptimeCounter).values(results=0, up_seconds=0))
+        await session.commit()
+
+    clock.now = T0 + 4 * 3600
+    await tracker.rebuild()
+    drift = UPTIME_DRIFT.value
+    await _log(tracker, factory, T0 + 4 * 3600, {"api": "ok"})
+    assert UPTIME_DRIFT.value > drift
+    repaired = await _counters(factory, DAY)
+    assert repaired["api"] == (expected["api"][0] + 1, 0, expected["api"][2] + 600, 0)
+
+
+async def test_uptime_command(tracker, db_session):
+    tracker, factory, _ = tracker
+    for minute in range(0, 60, 10):
+        api = "critical" if minute == 30 else "ok"
+        await _log(tracker, factory, T0 + minute * 60, {"api": api, "db": "ok"})
+
+    registry = MagicMock()
+    registry.get.return_value = SimpleNamespace(display_name="Documentation")
+    message = MagicMock(spec=Message)
+    message.text = "/uptime"
+    message.answer = AsyncMock()
+    await uptime_handler.cmd_uptime(message, None, db_session, registry)
+    text = message.answer.call_args.args[0]
+    assert "<b>Uptime</b> (24h / 7d / 30d)" in text
+    assert "<b>Documentation</b>: 90.00% / 90.00% / 90.00%" in text
+    assert "api: 80.00% / 80.00% / 80.00%" in text
+    assert "db: 100% / 100% / 100%" in text
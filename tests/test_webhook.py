@@ -0,0 +1,89 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from bot.transport.processor import UpdateProcessor
+from bot.transport.server import WebServer
+from bot.transport.webhook import SECRET_HEADER, WebhookHandler
+
+UPDATE = {
+    "update_id": 1001,
+    "message": {
+        "message_id": 1,
+        "date": 1700000000,
+        "chat": {"id": 42, "type": "private"},
+        "from": {"id": 42, "is_bot": False, "first_name": "Test"},
+        "text": "/help",
+    },
+}
+
+
+@pytest.fixture
+async def webhook_client():
+    dispatcher = MagicMock()
+    dispatcher.feed_update = AsyncMock()
+    webhook = WebhookHandler(dispatcher, MagicMock(), secret="s3cret", workers=2, queue_size=2)
+    server = WebServer("127.0.0.1", 0)
+    server.add_route("POST", "/webhook", webhook.handle)
+
+    await webhook.start()
+    client = TestClient(TestServer(server.app))
+    await client.start_server()
+    yield client, webhook, dispatcher
+    await client.close()
+    await webhook.stop(timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_webhook_feeds_synthetic_update(webhook_client):
+    client, webhook, dispatcher = webhook_client
+    resp = await client.post("/webhook", json=UPDATE, headers={SECRET_HEADER: "s3cret"})
+    assert resp.status == 200
+
+    await asyncio.wait_for(webhook._queue.join(), timeout=1)
+    update = dispatcher.feed_update.await_args.args[1]
+    assert update.update_id == 1001
+    assert update.message.text == "/help"
+
+
+@pytest.mark.asyncio
+async def test_webhook_rejects_bad_secret_and_payload(webhook_client):
+    client, _, dispatcher = webhook_client
+    resp = await client.post("/webhook", json=UPDATE, headers={SECRET_HEADER: "wrong"})
+    assert resp.status == 401
+    resp = await client.post("/webhook", data=b"not json", headers={SECRET_HEADER: "s3cret"})
+    assert resp.status == 400
+    dispatcher.feed_update.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_webhook_sheds_load_when_queue_full(webhook_client):
+    client, webhook, dispatcher = webhook_client
+    release = asyncio.Event()
+
+    async def slow_feed(*args, **kwargs):
+        await release.wait()
+
+    dispatcher.feed_update.side_effect = slow_feed
+
+    statuses = []
+    for i in range(6):
+        resp = await client.post(
+            "/webhook", json={**UPDATE, "update_id": i}, headers={SECRET_HEADER: "s3cret"}
+        )
+        statuses.append(resp.status)
+    # 2 updates held by workers + 2 queued; the rest are pushed back to Telegram
+    assert statuses.count(200) == 4
+    assert statuses.count(503) == 2
+    release.set()
+
+
+@pytest.mark.asyncio
+async def test_webhook_pushes_back_while_processor_is_full(webhook_client):
+    client, webhook, dispatcher = webhook_client
+    webhook.processor = UpdateProcessor(concurrency=1, max_pending=0)
+    resp = await client.post("/webhook", json=UPDATE, headers={SECRET_HEADER: "s3cret"})
+    assert resp.status == 503
+    dispatcher.feed_update.assert_not_awaited()
@@ -0,0 +1,120 @@
+import asyncio
+import os
+import signal
+import socket
+
+from sqlalchemy import func, select
+
+from bot.checks.base import CheckStatus, HealthCheckResult
+from bot.checks.subprocess_check import SubprocessCheck
+from bot.config import Settings
+from bot.db.engine import create_engine, create_session_factory, init_db
+from bot.db.models import HealthLog
+from bot.metrics.instruments import DB_WRITE_BACKLOG, NOTIFICATIONS_PENDING
+from bot.tasks.base import TaskHealthReport
+from bot.tasks.composite import CompositeTask
+from bot.tasks.registry import TaskRegistry
+from bot.worker.ipc import decode_report, encode_report, read_frame, write_frame
+from bot.worker.supervisor import MonitorWorker
+
+
+def _build(settings: Settings, registry: TaskRegistry):
+    # Runs in the worker process
+    check = SubprocessCheck("echo", ["echo", "hi"], timeout=10)
+    registry.register(CompositeTask("local", "Local", "", [check]))
+    return None
+
+
+async def _until(condition, timeout: float = 30.0):
+    for _ in range(int(timeout / 0.05)):
+        if condition():
+            return
+        await asyncio.sleep(0.05)
+    raise AssertionError("condition not reached")
+
+
+async def test_report_frames_roundtrip():
+    report = TaskHealthReport(
+        task_name="local",
+        task_display_name="Local",
+        is_healthy=False,
+        checks=[
+            HealthCheckResult("a", CheckStatus.CRITICAL, "down", 5.0),
+            HealthCheckResult("b", CheckStatus.OK, "up", details={"reused": True}),
+        ],
+    )
+    left, right = socket.socketpair()
+    _, writer = await asyncio.open_unix_connection(sock=left)
+    reader, other = await asyncio.open_unix_connection(sock=right)
+    write_frame(writer, encode_report(report))
+    write_frame(writer, ["cycle", 0.5])
+    writer.close()
+
+    decoded = decode_report(await read_frame(reader))
+    assert decoded == report
+    assert await read_frame(reader) == ["cycle", 0.5]
+    assert await read_frame(reader) is None
+    other.close()
+
+
+async def test_worker_process_runs_checks_and_restarts(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'bot.db'}"
+    db = create_engine(url)
+    await init_db(db)
+    factory = create_session_factory(db)
+    settings = Settings(
+        telegram_bot_token="1:test",
+        initial_admin_id=1,
+        database_url=url,
+        health_check_interval=1,
+        check_interval_min=1,
+        check_interval_max=1,
+        shutdown_drain_timeout=5,
+    )
+
+    worker = MonitorWorker(settings, build=_build, restart_delay=0.1)
+    reports = {}
+    worker.on_report.append(lambda report: reports.__setitem__(report.task_name, report))
+    # The first start fails: the supervisor retries
+    spawn = worker._spawn
+    failures = []
+
+    async def flaky_spawn(resume):
+        if not failures:
+            failures.append(resume)
+            raise OSError("no more processes")
+        return await spawn(resume)
+
+    worker._spawn = flaky_spawn
+    await worker.start()
+    try:
+        await _until(lambda: "local" in reports)
+        assert failures
+        assert reports["local"].checks[0].status == CheckStatus.OK
+        assert worker.pid != os.getpid()
+        # Health logs are written by the worker
+        async with factory() as session:
+            for _ in range(100):
+                if await session.scalar(select(func.count()).select_from(HealthLog)):
+                    break
+                await asyncio.sleep(0.05)
+            else:
+                raise AssertionError("no health log written")
+
+        # A crashed worker is replaced
+        first = worker.pid
+        os.kill(first, signal.SIGKILL)
+        reports.clear()
+        await _until(lambda: "local" in reports)
+        assert worker.pid != first
+    finally:
+        await worker.stop(timeout=5)
+        await db.dispose()
+    assert not worker._process.is_alive()
+
+
+def test_worker_gauges_update_this_process():
+    worker = MonitorWorker(Settings(telegram_bot_token="1:test", initial_admin_id=1))
+    worker._handle(["gauges", 12, 3])
+    assert (DB_WRITE_BACKLOG.value, NOTIFICATIONS_PENDING.value) == (12, 3)
+    worker._handle(["gauges", 0, 0])